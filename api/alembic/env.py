@@ -22,6 +22,11 @@ from models.guest import Guest  # noqa: F401
 from models.pricing_rule import PricingRule  # noqa: F401
 from models.property_cost import PropertyCost  # noqa: F401
 from models.refresh_token import RefreshToken  # noqa: F401
+from models.property_daily_price import PropertyDailyPrice  # noqa: F401
+from models.booking_night import BookingNight  # noqa: F401
+from models.financial_snapshot import FinancialSnapshot  # noqa: F401
+from models.calendar_feed_version import CalendarFeedVersion  # noqa: F401
+from models.calendar_source import CalendarSource  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
@@ -0,0 +1,40 @@
+"""property_daily_prices materialized nightly prices
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "property_daily_prices",
+        sa.Column(
+            "property_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("properties.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("date", sa.Date(), primary_key=True),
+        sa.Column("floor_price", sa.Numeric(), nullable=False),
+        sa.Column("price", sa.Numeric(), nullable=False),
+        sa.Column("profitability_percent", sa.Numeric(), nullable=False),
+        sa.Column("rule_name", sa.String(), nullable=True),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("property_daily_prices")
@@ -0,0 +1,46 @@
+"""booking_nights per-night revenue and cost ledger
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "booking_nights",
+        sa.Column(
+            "booking_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("bookings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("date", sa.Date(), primary_key=True),
+        sa.Column(
+            "property_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("properties.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("price", sa.Numeric(), nullable=False),
+        sa.Column("per_day_cost", sa.Numeric(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_booking_nights_property_date", "booking_nights", ["property_id", "date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_booking_nights_property_date", table_name="booking_nights")
+    op.drop_table("booking_nights")
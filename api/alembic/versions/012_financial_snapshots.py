@@ -0,0 +1,49 @@
+"""financial_snapshots stored summaries of closed months
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "financial_snapshots",
+        sa.Column(
+            "property_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("properties.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("year", sa.Integer(), primary_key=True),
+        sa.Column("month", sa.Integer(), primary_key=True),
+        sa.Column("days_in_month", sa.Integer(), nullable=False),
+        sa.Column("occupied_days", sa.Integer(), nullable=False),
+        sa.Column("occupancy_rate", sa.Float(), nullable=False),
+        sa.Column("total_bookings", sa.Integer(), nullable=False),
+        sa.Column("total_income", sa.Numeric(14, 2), nullable=False),
+        sa.Column("fixed_monthly", sa.Numeric(14, 2), nullable=False),
+        sa.Column("fixed_daily", sa.Numeric(14, 2), nullable=False),
+        sa.Column("variable_per_reservation", sa.Numeric(14, 2), nullable=False),
+        sa.Column("commissions", sa.Numeric(14, 2), nullable=False),
+        sa.Column("total_costs", sa.Numeric(14, 2), nullable=False),
+        sa.Column("net_profit", sa.Numeric(14, 2), nullable=False),
+        sa.Column("profit_margin_percent", sa.Numeric(14, 2), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("financial_snapshots")
@@ -0,0 +1,26 @@
+"""composite indexes for keyset-paginated booking lists
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_bookings_check_in_id", "bookings", ["check_in", "id"])
+    op.create_index("ix_bookings_property_check_in_id", "bookings", ["property_id", "check_in", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_property_check_in_id", table_name="bookings")
+    op.drop_index("ix_bookings_check_in_id", table_name="bookings")
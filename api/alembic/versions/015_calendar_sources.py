@@ -0,0 +1,48 @@
+"""calendar_sources external iCal feeds synced into bookings
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bookingsource = postgresql.ENUM("AIRBNB", "BOOKING", "DOMU", "MANUAL", name="bookingsource", create_type=False)
+
+    op.create_table(
+        "calendar_sources",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "property_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("properties.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("source", bookingsource, nullable=False),
+        sa.Column("etag", sa.String(), nullable=True),
+        sa.Column("last_modified", sa.String(), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("property_id", "url", name="uq_calendar_sources_property_url"),
+    )
+    op.create_index("ix_calendar_sources_property_id", "calendar_sources", ["property_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_calendar_sources_property_id", table_name="calendar_sources")
+    op.drop_table("calendar_sources")
@@ -17,6 +17,29 @@ class Settings(BaseSettings):
     # iCalendar
     DOMAIN: str = "domu.ar"
 
+    # Pricing cache (calendar / price quote results, per process)
+    PRICING_CACHE_MAX_ENTRIES: int = 2048
+    PRICING_CACHE_TTL_SECONDS: int = 300
+
+    # iCal export feeds kept serialized per process (one entry per property and version)
+    CALENDAR_FEED_CACHE_MAX_ENTRIES: int = 1024
+
+    # External iCal feeds synced into bookings
+    ICAL_SYNC_TIMEOUT_SECONDS: float = 30.0
+    ICAL_SYNC_MAX_BYTES: int = 5_000_000
+
+    # Background polling of the external iCal feeds (enable it in a single process)
+    CALENDAR_SYNC_ENABLED: bool = False
+    CALENDAR_SYNC_INTERVAL_SECONDS: int = 240
+    CALENDAR_SYNC_JITTER: float = 0.1  # +/- fraction of the interval
+    CALENDAR_SYNC_WORKERS: int = 20
+    CALENDAR_SYNC_RETRY_SECONDS: int = 30  # First retry after a failure, doubled on each further one
+    CALENDAR_SYNC_MAX_BACKOFF_SECONDS: int = 3600
+    CALENDAR_SYNC_MAX_CONNECTIONS: int = 50
+
+    # Nightly price computation: "python" (DailyPriceEngine) or "sql" (generate_series query)
+    PRICING_BACKEND: str = "python"
+
     class Config:
         case_sensitive = True
 
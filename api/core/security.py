@@ -1,4 +1,5 @@
 import hashlib
+import hmac
 import secrets
 from datetime import datetime, timedelta
 from typing import Any, Union
@@ -38,6 +39,15 @@ def generate_refresh_token() -> tuple[str, str]:
 def hash_refresh_token(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
+def create_calendar_feed_token(property_id: Any) -> str:
+    """Secret, stable token of a property's public iCal feed URL (HMAC of the id)."""
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"calendar-feed:{property_id}".encode(), hashlib.sha256
+    ).hexdigest()[:32]
+
+def verify_calendar_feed_token(property_id: Any, token: str) -> bool:
+    return hmac.compare_digest(create_calendar_feed_token(property_id), token or "")
+
 def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
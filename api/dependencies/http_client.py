@@ -0,0 +1,112 @@
+import asyncio
+import ipaddress
+import socket
+from typing import AsyncIterator, Iterable, Optional
+
+import httpcore
+import httpx
+
+from core.config import settings
+
+# Redirect hops followed per feed request; every hop goes through PublicHostTransport
+MAX_REDIRECTS = 5
+
+
+class BlockedHostError(httpx.TransportError):
+    """The request targets a URL that external feed fetches are not allowed to reach."""
+
+
+def is_public_address(address: str) -> bool:
+    """True for globally routable unicast addresses (no loopback, private, link-local, metadata...)."""
+    ip = ipaddress.ip_address(address)
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class PublicHostBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that resolves the host itself and opens the socket only to an
+    address it has checked, so a name cannot be re-resolved to an internal address
+    after the check. URLs, connection pooling and TLS (SNI and certificate) keep
+    using the hostname.
+    """
+
+    def __init__(self, inner: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.inner = inner or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout
+            )
+        except (socket.gaierror, asyncio.TimeoutError) as exc:
+            raise httpcore.ConnectError(f"no se pudo resolver {host}: {exc}") from exc
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if not addresses or not all(is_public_address(address) for address in addresses):
+            raise BlockedHostError(f"el host {host} no es una dirección pública")
+
+        error: Exception | None = None
+        for address in addresses:
+            try:
+                return await self.inner.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                error = exc
+        raise error
+
+    async def connect_unix_socket(self, path: str, timeout=None, socket_options=None) -> httpcore.AsyncNetworkStream:
+        raise BlockedHostError("no se permiten sockets locales")
+
+    async def sleep(self, seconds: float) -> None:
+        await self.inner.sleep(seconds)
+
+
+class PublicHostTransport(httpx.AsyncHTTPTransport):
+    """
+    Guards fetches of user-supplied feed URLs against SSRF: every request, including each
+    redirect hop, must be https, and its connection goes through PublicHostBackend.
+    """
+
+    def __init__(self, limits: httpx.Limits, network_backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        super().__init__(limits=limits)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=PublicHostBackend(network_backend),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.scheme != "https":
+            raise BlockedHostError(f"solo se permiten URLs https: {request.url}", request=request)
+        return await super().handle_async_request(request)
+
+
+def create_http_client(max_connections: int = 10) -> httpx.AsyncClient:
+    """
+    Client for fetching external iCal feeds; keep-alive connections are pooled per host.
+    Only public https hosts are reachable (see PublicHostTransport); proxies from the
+    environment are ignored so they cannot bypass that check.
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(
+        transport=PublicHostTransport(limits),
+        timeout=settings.ICAL_SYNC_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        max_redirects=MAX_REDIRECTS,
+        trust_env=False,
+        headers={"User-Agent": f"{settings.PROJECT_NAME} calendar sync"},
+    )
+
+
+async def get_http_client() -> AsyncIterator[httpx.AsyncClient]:
+    async with create_http_client() as client:
+        yield client
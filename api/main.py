@@ -1,16 +1,34 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from core.config import settings
+from core.database import AsyncSessionLocal
 import models  # noqa: F401 — registers all ORM models before routers trigger configure_mappers()
-from routers import auth, property, guest, booking, cost, pricing, users, base_price
+from routers import auth, property, guest, booking, cost, pricing, users, base_price, portfolio, calendar_feed, calendar_source
 from exceptions.handlers import register_exception_handlers
+from services.calendar_sync_scheduler import CalendarSyncScheduler
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background polling of external iCal feeds; enable it in one process only
+    scheduler = None
+    if settings.CALENDAR_SYNC_ENABLED:
+        scheduler = CalendarSyncScheduler(AsyncSessionLocal)
+        await scheduler.start()
+    app.state.calendar_sync = scheduler
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 register_exception_handlers(app)
 app.include_router(auth.router)
@@ -21,6 +39,9 @@ app.include_router(cost.router)
 app.include_router(pricing.router)
 app.include_router(users.router)
 app.include_router(base_price.router)
+app.include_router(portfolio.router)
+app.include_router(calendar_feed.router)
+app.include_router(calendar_source.router)
 
 @app.get("/")
 async def root():
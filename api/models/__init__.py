@@ -6,5 +6,10 @@ from models.booking import Booking
 from models.property_cost import PropertyCost
 from models.pricing_rule import PricingRule
 from models.property_base_price import PropertyBasePrice
+from models.property_daily_price import PropertyDailyPrice
+from models.booking_night import BookingNight
+from models.financial_snapshot import FinancialSnapshot
+from models.calendar_feed_version import CalendarFeedVersion
+from models.calendar_source import CalendarSource
 
-__all__ = ["User", "RefreshToken", "Property", "Guest", "Booking", "PropertyCost", "PricingRule", "PropertyBasePrice"]
+__all__ = ["User", "RefreshToken", "Property", "Guest", "Booking", "PropertyCost", "PricingRule", "PropertyBasePrice", "PropertyDailyPrice", "BookingNight", "FinancialSnapshot", "CalendarFeedVersion", "CalendarSource"]
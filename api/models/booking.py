@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Text, Enum, CheckConstraint, Index, Numeric
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Text, Enum, CheckConstraint, Index, Numeric, text
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -13,6 +13,25 @@ class Booking(Base):
         CheckConstraint("check_out > check_in", name="ck_bookings_checkout_after_checkin"),
         Index("ix_bookings_property_dates", "property_id", "check_in", "check_out"),
         Index("ix_bookings_status", "status"),
+        # Keyset pagination of booking lists ordered by (check_in, id)
+        Index("ix_bookings_check_in_id", "check_in", "id"),
+        Index("ix_bookings_property_check_in_id", "property_id", "check_in", "id"),
+        # An OTA/import identifier is stored once per property (imports and iCal sync skip repeats)
+        Index(
+            "uq_bookings_property_external_id",
+            "property_id",
+            "external_id",
+            unique=True,
+            postgresql_where=text("external_id IS NOT NULL"),
+        ),
+        # Created by migration 001 (requires btree_gist); declared here so create_all builds it too
+        ExcludeConstraint(
+            ("property_id", "="),
+            (text("daterange(check_in, check_out)"), "&&"),
+            name="excl_bookings_no_overlap",
+            using="gist",
+            where=text("status != 'CANCELLED'"),
+        ),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class BookingNight(Base):
+    """
+    Ledger of the occupied nights of non-cancelled bookings: the nightly price and the
+    per-day reservation costs effective on that date. Written by BookingService on
+    every booking change and rebuilt by DailyPriceService when pricing inputs change,
+    so financial reports can aggregate it instead of re-deriving prices.
+    """
+    __tablename__ = "booking_nights"
+    __table_args__ = (
+        Index("ix_booking_nights_property_date", "property_id", "date"),
+    )
+
+    booking_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("bookings.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date = Column(Date, primary_key=True)
+    property_id = Column(UUID(as_uuid=True), ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
+
+    # Unscaled numerics, like property_daily_prices, so sums match a day-by-day Decimal sum
+    price = Column(Numeric, nullable=False)
+    per_day_cost = Column(Numeric, nullable=False)
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class CalendarFeedVersion(Base):
+    """
+    Change counter of a property's iCal export feed, bumped in the same transaction as
+    every booking change. The feed is cached and revalidated (ETag) by version, so a
+    poll costs one primary key lookup while nothing changed.
+    """
+    __tablename__ = "calendar_feed_versions"
+
+    property_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("properties.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
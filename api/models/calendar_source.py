@@ -0,0 +1,37 @@
+import uuid
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from core.database import Base
+from core.enums import BookingSource
+
+
+class CalendarSource(Base):
+    """
+    External iCal feed (Airbnb, Booking.com) whose events are synced into the bookings
+    of a property. etag / last_modified are the HTTP validators of the last fetch, sent
+    back on the next poll so an unchanged feed costs a 304.
+    """
+    __tablename__ = "calendar_sources"
+    __table_args__ = (
+        UniqueConstraint("property_id", "url", name="uq_calendar_sources_property_url"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    property_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("properties.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    url = Column(String, nullable=False)
+    source = Column(Enum(BookingSource), nullable=False)
+
+    # Sync state
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class FinancialSnapshot(Base):
+    """
+    Stored monthly financial summary of a closed (past) month. Written by PricingService
+    the first time the month is summarized and deleted whenever a booking or pricing
+    input of the property changes on or before that month.
+    """
+    __tablename__ = "financial_snapshots"
+
+    property_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("properties.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+
+    days_in_month = Column(Integer, nullable=False)
+    occupied_days = Column(Integer, nullable=False)
+    occupancy_rate = Column(Float, nullable=False)
+    total_bookings = Column(Integer, nullable=False)
+    total_income = Column(Numeric(14, 2), nullable=False)
+    fixed_monthly = Column(Numeric(14, 2), nullable=False)
+    fixed_daily = Column(Numeric(14, 2), nullable=False)
+    variable_per_reservation = Column(Numeric(14, 2), nullable=False)
+    commissions = Column(Numeric(14, 2), nullable=False)
+    total_costs = Column(Numeric(14, 2), nullable=False)
+    net_profit = Column(Numeric(14, 2), nullable=False)
+    profit_margin_percent = Column(Numeric(14, 2), nullable=False)
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, Date, Numeric, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class PropertyDailyPrice(Base):
+    """
+    Materialized nightly price of a property, derived from costs, base prices and
+    pricing rules. Rows are rebuilt by DailyPriceService whenever one of those inputs
+    changes for the affected dates.
+    """
+    __tablename__ = "property_daily_prices"
+
+    property_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("properties.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date = Column(Date, primary_key=True)
+
+    # Unscaled numerics keep the exact Decimal values so quotes can sum them before rounding
+    floor_price = Column(Numeric, nullable=False)
+    price = Column(Numeric, nullable=False)
+    profitability_percent = Column(Numeric, nullable=False)
+    rule_name = Column(String, nullable=True)
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
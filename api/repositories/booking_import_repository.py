@@ -0,0 +1,155 @@
+from decimal import Decimal
+from typing import AsyncIterable
+
+from sqlalchemy import ARRAY, Integer, Numeric, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+
+STAGING_TABLE = "booking_import_staging"
+
+# Column order of the records streamed by copy_rows
+STAGING_COLUMNS = (
+    "row_no", "id", "ical_uid", "property_id", "guest_id", "check_in", "check_out",
+    "summary", "description", "status", "source", "external_id",
+)
+
+# Set-wise validations run in order; each one only looks at rows without an error yet.
+# Rows of the same file are checked against earlier rows (by row_no) that passed the
+# previous checks, so the first of two overlapping (or duplicated) rows wins.
+_VALIDATIONS = (
+    (
+        "Propiedad no encontrada",
+        "NOT EXISTS (SELECT 1 FROM properties p WHERE p.id = s.property_id"
+        " AND (CAST(:manager_id AS uuid) IS NULL OR p.manager_id = CAST(:manager_id AS uuid)))",
+    ),
+    (
+        "Huésped no encontrado",
+        "s.guest_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM guests g WHERE g.id = s.guest_id)",
+    ),
+    (
+        "Reserva ya importada",
+        "s.external_id IS NOT NULL AND EXISTS (SELECT 1 FROM bookings b"
+        " WHERE b.property_id = s.property_id AND b.external_id = s.external_id)",
+    ),
+    (
+        "Reserva duplicada en el archivo",
+        "s.external_id IS NOT NULL AND EXISTS (SELECT 1 FROM " + STAGING_TABLE + " o"
+        " WHERE o.property_id = s.property_id AND o.external_id = s.external_id"
+        " AND o.row_no < s.row_no AND o.error IS NULL)",
+    ),
+    (
+        "Conflicto de fechas con una reserva existente",
+        "s.status != 'CANCELLED' AND EXISTS (SELECT 1 FROM bookings b"
+        " WHERE b.property_id = s.property_id AND b.status != 'CANCELLED'"
+        " AND daterange(b.check_in, b.check_out) && daterange(s.check_in, s.check_out))",
+    ),
+    (
+        "Conflicto de fechas con otra fila del archivo",
+        "s.status != 'CANCELLED' AND EXISTS (SELECT 1 FROM " + STAGING_TABLE + " o"
+        " WHERE o.property_id = s.property_id AND o.row_no < s.row_no"
+        " AND o.error IS NULL AND o.status != 'CANCELLED'"
+        " AND daterange(o.check_in, o.check_out) && daterange(s.check_in, s.check_out))",
+    ),
+)
+
+
+class BookingImportRepository:
+    """
+    Bulk booking import through a temporary staging table: rows are streamed in with
+    COPY, validated with a handful of set-wise UPDATEs and moved to bookings with one
+    INSERT ... SELECT. The staging table lives until the end of the transaction.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_staging(self) -> None:
+        await self.db.execute(text(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ("
+            " row_no integer PRIMARY KEY, id uuid NOT NULL, ical_uid text NOT NULL,"
+            " property_id uuid NOT NULL, guest_id uuid, check_in date NOT NULL, check_out date NOT NULL,"
+            " summary text NOT NULL, description text, status text NOT NULL, source text NOT NULL,"
+            " external_id text, total_amount numeric(10, 2), error text"
+            ") ON COMMIT DROP"
+        ))
+
+    async def copy_rows(self, records: AsyncIterable[tuple]) -> None:
+        """Streams STAGING_COLUMNS tuples into the staging table with COPY on the session's connection."""
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=list(STAGING_COLUMNS)
+        )
+
+    async def validate(self, manager_id: uuid.UUID | None) -> None:
+        """Flags invalid staged rows; manager_id restricts imports to that manager's properties."""
+        for message, condition in _VALIDATIONS:
+            await self.db.execute(
+                text(f"UPDATE {STAGING_TABLE} s SET error = :message WHERE s.error IS NULL AND {condition}")
+                .bindparams(bindparam("manager_id", type_=UUID(as_uuid=True))),
+                {"message": message, "manager_id": manager_id},
+            )
+
+    async def get_valid(self) -> list:
+        """(row_no, property_id, check_in, check_out) of the rows that passed validation."""
+        result = await self.db.execute(text(
+            f"SELECT row_no, property_id, check_in, check_out FROM {STAGING_TABLE}"
+            " WHERE error IS NULL ORDER BY check_in"
+        ))
+        return list(result.all())
+
+    async def set_totals(self, row_nos: list[int], totals: list[Decimal]) -> None:
+        """Stores the quoted total_amount of many rows in one UPDATE ... FROM unnest."""
+        if not row_nos:
+            return
+        await self.db.execute(
+            text(
+                f"UPDATE {STAGING_TABLE} s SET total_amount = t.total_amount"
+                " FROM unnest(:row_nos, :totals) AS t(row_no, total_amount) WHERE s.row_no = t.row_no"
+            ).bindparams(
+                bindparam("row_nos", type_=ARRAY(Integer)),
+                bindparam("totals", type_=ARRAY(Numeric)),
+            ),
+            {"row_nos": row_nos, "totals": totals},
+        )
+
+    async def insert_valid(self) -> list:
+        """
+        Moves the valid rows to bookings. Rows that lose a race against a concurrent
+        write are skipped (ON CONFLICT DO NOTHING, which covers excl_bookings_no_overlap
+        and uq_bookings_property_external_id) and flagged with the reason found
+        afterwards: an overlapping booking, a booking with the same external_id, or
+        otherwise another unique violation.
+        Returns (id, property_id, check_in, check_out, status) of the inserted bookings.
+        """
+        result = await self.db.execute(text(
+            "INSERT INTO bookings (id, ical_uid, property_id, guest_id, check_in, check_out, summary,"
+            " description, status, source, external_id, total_amount)"
+            " SELECT id, ical_uid, property_id, guest_id, check_in, check_out, summary, description,"
+            " CAST(status AS bookingstatus), CAST(source AS bookingsource), external_id, total_amount"
+            f" FROM {STAGING_TABLE} WHERE error IS NULL ORDER BY row_no"
+            " ON CONFLICT DO NOTHING"
+            " RETURNING id, property_id, check_in, check_out, status"
+        ))
+        inserted = list(result.all())
+        await self.db.execute(text(
+            f"UPDATE {STAGING_TABLE} s SET error = CASE"
+            " WHEN s.status != 'CANCELLED' AND EXISTS (SELECT 1 FROM bookings b"
+            " WHERE b.property_id = s.property_id AND b.status != 'CANCELLED'"
+            " AND daterange(b.check_in, b.check_out) && daterange(s.check_in, s.check_out))"
+            " THEN 'Conflicto de fechas con una reserva existente'"
+            " WHEN s.external_id IS NOT NULL AND EXISTS (SELECT 1 FROM bookings b"
+            " WHERE b.property_id = s.property_id AND b.external_id = s.external_id)"
+            " THEN 'Reserva ya importada'"
+            " ELSE 'No se pudo importar la reserva' END"
+            " WHERE s.error IS NULL AND NOT EXISTS (SELECT 1 FROM bookings b WHERE b.id = s.id)"
+        ))
+        return inserted
+
+    async def get_errors(self) -> list:
+        """(row_no, error) of the rejected rows, in file order."""
+        result = await self.db.execute(text(
+            f"SELECT row_no, error FROM {STAGING_TABLE} WHERE error IS NOT NULL ORDER BY row_no"
+        ))
+        return list(result.all())
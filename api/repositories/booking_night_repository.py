@@ -0,0 +1,52 @@
+from datetime import date
+
+from sqlalchemy import delete, extract, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models.booking_night import BookingNight
+from repositories.daily_price_repository import UPSERT_BATCH_SIZE
+import uuid
+
+
+class BookingNightRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def delete_for_bookings(self, booking_ids: list[uuid.UUID]) -> None:
+        """Removes every ledger night of the given bookings."""
+        await self.db.execute(delete(BookingNight).where(BookingNight.booking_id.in_(booking_ids)))
+
+    async def insert_many(self, rows: list[dict]) -> None:
+        """Inserts ledger nights in batches; callers delete the bookings' previous nights first."""
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            await self.db.execute(insert(BookingNight).values(rows[i:i + UPSERT_BATCH_SIZE]))
+
+    async def get_monthly_totals(
+        self, property_ids: list[uuid.UUID], range_start: date, range_end: date
+    ) -> list:
+        """
+        Per (booking, year, month) count and sums of the ledger nights in [range_start, range_end],
+        leaving out the last day of each month like the financial summary day walk does.
+        """
+        year = extract("year", BookingNight.date)
+        month = extract("month", BookingNight.date)
+        result = await self.db.execute(
+            select(
+                BookingNight.booking_id,
+                year.label("year"),
+                month.label("month"),
+                func.count().label("nights"),
+                func.sum(BookingNight.price).label("price"),
+                func.sum(BookingNight.per_day_cost).label("per_day_cost"),
+            )
+            .where(
+                BookingNight.property_id.in_(property_ids),
+                BookingNight.date >= range_start,
+                BookingNight.date <= range_end,
+                extract("day", BookingNight.date + 1) != 1,
+            )
+            .group_by(BookingNight.booking_id, year, month)
+        )
+        return list(result.all())
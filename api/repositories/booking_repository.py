@@ -1,10 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, insert, tuple_, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from models.booking import Booking
 from models.property import Property as PropertyModel
 from schemas.booking import BookingCreate, BookingUpdate
-from core.enums import BookingStatus
+from core.enums import BookingSource, BookingStatus
 from datetime import date
 import uuid
 
@@ -13,24 +14,32 @@ class BookingRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create(self, booking_create: BookingCreate, ical_uid: str, total_amount=None) -> Booking:
-        """Create a booking with auto-generated ical_uid."""
-        db_booking = Booking(
-            ical_uid=ical_uid,
-            property_id=booking_create.property_id,
-            guest_id=booking_create.guest_id,
-            check_in=booking_create.check_in,
-            check_out=booking_create.check_out,
-            summary=booking_create.summary,
-            description=booking_create.description,
-            status=booking_create.status,
-            source=booking_create.source,
-            total_amount=total_amount,
+    async def create(
+        self, booking_create: BookingCreate, ical_uid: str, total_amount=None, booking_id: uuid.UUID | None = None
+    ) -> Booking:
+        """
+        Create a booking with auto-generated ical_uid in a single INSERT ... RETURNING.
+        Overlaps with non-cancelled bookings are rejected by excl_bookings_no_overlap
+        and surface as IntegrityError.
+        """
+        result = await self.db.execute(
+            insert(Booking)
+            .values(
+                id=booking_id or uuid.uuid4(),
+                ical_uid=ical_uid,
+                property_id=booking_create.property_id,
+                guest_id=booking_create.guest_id,
+                check_in=booking_create.check_in,
+                check_out=booking_create.check_out,
+                summary=booking_create.summary,
+                description=booking_create.description,
+                status=booking_create.status,
+                source=booking_create.source,
+                total_amount=total_amount,
+            )
+            .returning(Booking)
         )
-        self.db.add(db_booking)
-        await self.db.flush()
-        await self.db.refresh(db_booking)
-        return db_booking
+        return result.scalars().one()
 
     async def get_by_id(self, booking_id: uuid.UUID) -> Booking | None:
         result = await self.db.execute(select(Booking).where(Booking.id == booking_id))
@@ -41,30 +50,41 @@ class BookingRepository:
         result = await self.db.execute(select(Booking).where(Booking.ical_uid == ical_uid))
         return result.scalars().first()
 
-    async def get_by_property(self, property_id: uuid.UUID, skip: int = 0, limit: int = 100) -> list[Booking]:
-        """Get all bookings for a property."""
-        result = await self.db.execute(
-            select(Booking)
-            .where(Booking.property_id == property_id)
-            .offset(skip)
-            .limit(limit)
-        )
-        return list(result.scalars().all())
-
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Booking]:
-        result = await self.db.execute(select(Booking).offset(skip).limit(limit))
-        return list(result.scalars().all())
-
-    async def get_all_by_manager(
-        self, manager_id: uuid.UUID, skip: int = 0, limit: int = 100
+    async def get_page(
+        self,
+        limit: int,
+        after: tuple[date, uuid.UUID] | None = None,
+        manager_id: uuid.UUID | None = None,
+        property_ids: list[uuid.UUID] | None = None,
+        statuses: list[BookingStatus] | None = None,
+        sources: list[BookingSource] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
     ) -> list[Booking]:
-        result = await self.db.execute(
-            select(Booking)
-            .join(PropertyModel, Booking.property_id == PropertyModel.id)
-            .where(PropertyModel.manager_id == manager_id)
-            .offset(skip)
-            .limit(limit)
-        )
+        """
+        One page of bookings ordered by (check_in, id), starting right after the
+        (check_in, id) key of the previous page. start_date / end_date keep the
+        bookings overlapping [start_date, end_date). Backed by ix_bookings_check_in_id
+        and ix_bookings_property_check_in_id.
+        """
+        query = select(Booking)
+        if manager_id is not None:
+            query = query.join(PropertyModel, Booking.property_id == PropertyModel.id).where(
+                PropertyModel.manager_id == manager_id
+            )
+        if property_ids:
+            query = query.where(Booking.property_id.in_(property_ids))
+        if statuses:
+            query = query.where(Booking.status.in_(statuses))
+        if sources:
+            query = query.where(Booking.source.in_(sources))
+        if start_date is not None:
+            query = query.where(Booking.check_out > start_date)
+        if end_date is not None:
+            query = query.where(Booking.check_in < end_date)
+        if after is not None:
+            query = query.where(tuple_(Booking.check_in, Booking.id) > tuple_(*after))
+        result = await self.db.execute(query.order_by(Booking.check_in, Booking.id).limit(limit))
         return list(result.scalars().all())
 
     async def check_conflicts(
@@ -102,6 +122,77 @@ class BookingRepository:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def get_for_financial_summary(
+        self, property_id: uuid.UUID, range_start: date, range_end: date
+    ) -> list:
+        """
+        Non-cancelled bookings with check_in < range_end and check_out > range_start,
+        as lightweight rows holding only the columns the financial summary reads.
+        Bounded by ix_bookings_property_dates instead of loading the whole history.
+        """
+        result = await self.db.execute(
+            select(Booking.id, Booking.check_in, Booking.check_out, Booking.status, Booking.paid_amount)
+            .where(
+                Booking.property_id == property_id,
+                Booking.check_in < range_end,
+                Booking.check_out > range_start,
+                Booking.status != BookingStatus.CANCELLED,
+            )
+            .order_by(Booking.check_in.asc())
+        )
+        return list(result.all())
+
+    async def get_for_financial_summary_for_properties(
+        self, property_ids: list[uuid.UUID], range_start: date, range_end: date
+    ) -> list:
+        """Same as get_for_financial_summary for several properties in one query (rows include property_id)."""
+        result = await self.db.execute(
+            select(
+                Booking.id, Booking.property_id, Booking.check_in, Booking.check_out,
+                Booking.status, Booking.paid_amount,
+            )
+            .where(
+                Booking.property_id.in_(property_ids),
+                Booking.check_in < range_end,
+                Booking.check_out > range_start,
+                Booking.status != BookingStatus.CANCELLED,
+            )
+            .order_by(Booking.check_in.asc())
+        )
+        return list(result.all())
+
+    async def get_nights_in_span(
+        self, property_id: uuid.UUID, range_start: date | None, range_end: date | None
+    ) -> list:
+        """
+        Non-cancelled bookings with at least one night in [range_start, range_end]
+        (None = unbounded), as (id, property_id, check_in, check_out) rows.
+        """
+        query = select(Booking.id, Booking.property_id, Booking.check_in, Booking.check_out).where(
+            Booking.property_id == property_id,
+            Booking.status != BookingStatus.CANCELLED,
+        )
+        if range_start is not None:
+            query = query.where(Booking.check_out > range_start)
+        if range_end is not None:
+            query = query.where(Booking.check_in <= range_end)
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def get_active_overlapping_for_properties(
+        self, property_ids: list[uuid.UUID], check_in: date, check_out: date
+    ) -> list[Booking]:
+        """Non-cancelled bookings of several properties overlapping [check_in, check_out), in one query."""
+        result = await self.db.execute(
+            select(Booking).where(
+                Booking.property_id.in_(property_ids),
+                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.TENTATIVE, BookingStatus.PAID]),
+                Booking.check_in < check_out,
+                Booking.check_out > check_in,
+            )
+        )
+        return list(result.scalars().all())
+
     async def exists_paid_booking_after(self, property_id: uuid.UUID, from_date: date) -> bool:
         """Returns True if any PAID booking for the property has check_out > from_date."""
         result = await self.db.execute(
@@ -127,6 +218,57 @@ class BookingRepository:
         )
         return result.scalars().first() is not None
 
+    async def get_for_sync(self, property_id: uuid.UUID, ical_url: str, uids: list[str]) -> list:
+        """
+        Bookings of the property an iCal sync has to diff against: those previously
+        synced from ical_url plus any whose external_id or ical_uid is one of the feed's UIDs.
+        """
+        result = await self.db.execute(
+            select(
+                Booking.id, Booking.property_id, Booking.ical_uid, Booking.external_id, Booking.ical_url,
+                Booking.check_in, Booking.check_out, Booking.summary, Booking.description, Booking.status,
+            ).where(
+                Booking.property_id == property_id,
+                or_(
+                    Booking.ical_url == ical_url,
+                    Booking.external_id.in_(uids),
+                    Booking.ical_uid.in_(uids),
+                ),
+            )
+        )
+        return list(result.all())
+
+    async def insert_many(self, rows: list[dict]) -> list:
+        """
+        Inserts many bookings in one INSERT ... ON CONFLICT DO NOTHING. Rows that would
+        overlap a non-cancelled booking are skipped by excl_bookings_no_overlap; returns
+        (id, property_id, check_in, check_out, status) of the inserted ones.
+        """
+        if not rows:
+            return []
+        result = await self.db.execute(
+            pg_insert(Booking)
+            .values(rows)
+            .on_conflict_do_nothing()
+            .returning(Booking.id, Booking.property_id, Booking.check_in, Booking.check_out, Booking.status)
+        )
+        return list(result.all())
+
+    async def update_many(self, rows: list[dict]) -> None:
+        """Bulk UPDATE by primary key; every row dict holds "id" and the same set of columns."""
+        if rows:
+            await self.db.execute(update(Booking), rows)
+
+    async def cancel_many(self, booking_ids: list[uuid.UUID], **values) -> None:
+        """Sets many bookings to CANCELLED in one UPDATE (values are extra columns to set)."""
+        if booking_ids:
+            await self.db.execute(
+                update(Booking)
+                .where(Booking.id.in_(booking_ids))
+                .values(status=BookingStatus.CANCELLED, **values)
+                .execution_options(synchronize_session=False)
+            )
+
     async def update(self, booking_id: uuid.UUID, booking_update: BookingUpdate) -> Booking | None:
         db_booking = await self.get_by_id(booking_id)
         if not db_booking:
@@ -140,22 +282,67 @@ class BookingRepository:
         await self.db.refresh(db_booking)
         return db_booking
 
-    async def delete(self, booking_id: uuid.UUID) -> Booking | None:
-        """Cancel a booking (set status to CANCELLED)."""
-        db_booking = await self.get_by_id(booking_id)
-        if not db_booking:
-            return None
+    def _target(self, booking_ids: list[uuid.UUID]):
+        """CTE of the requested bookings with their current status and their property's manager."""
+        return (
+            select(Booking.id, Booking.status.label("previous_status"), PropertyModel.manager_id)
+            .join(PropertyModel, PropertyModel.id == Booking.property_id)
+            .where(Booking.id.in_(booking_ids))
+            .cte("target")
+        )
 
-        db_booking.status = BookingStatus.CANCELLED
-        await self.db.flush()
-        await self.db.refresh(db_booking)
-        return db_booking
+    async def transition(
+        self,
+        booking_ids: list[uuid.UUID],
+        from_statuses: list[BookingStatus],
+        values: dict,
+        manager_id: uuid.UUID | None = None,
+    ) -> list:
+        """
+        Conditional status change of one or many bookings in a single round trip:
+        UPDATE ... FROM the target CTE WHERE status IN from_statuses (and the property is
+        managed by manager_id, unless None) RETURNING the updated rows. Returns one row per
+        existing booking with target_id, previous_status and manager_id, plus the updated
+        booking's columns (all None when the row was not updated); ids that do not exist
+        get no row.
+        """
+        target = self._target(booking_ids)
+        changed = (
+            update(Booking)
+            .where(Booking.id == target.c.id, Booking.status.in_(from_statuses))
+            .values(**values, updated_at=func.now())
+        )
+        if manager_id is not None:
+            changed = changed.where(target.c.manager_id == manager_id)
+        changed = changed.returning(*Booking.__table__.c).cte("changed")
+        result = await self.db.execute(
+            select(target.c.id.label("target_id"), target.c.previous_status, target.c.manager_id, *changed.c)
+            .select_from(target.outerjoin(changed, changed.c.id == target.c.id))
+        )
+        return list(result.all())
 
-    async def hard_delete(self, booking_id: uuid.UUID) -> bool:
-        """Permanently remove a booking from the database."""
-        db_booking = await self.get_by_id(booking_id)
-        if not db_booking:
-            return False
+    async def delete_in_status(
+        self,
+        booking_ids: list[uuid.UUID],
+        statuses: list[BookingStatus],
+        manager_id: uuid.UUID | None = None,
+    ) -> list:
+        """
+        Conditional hard delete with the same single round trip and result rows as
+        transition(); the deleted booking's columns are id, property_id and check_in.
+        """
+        target = self._target(booking_ids)
+        removed = delete(Booking).where(Booking.id == target.c.id, Booking.status.in_(statuses))
+        if manager_id is not None:
+            removed = removed.where(target.c.manager_id == manager_id)
+        removed = removed.returning(Booking.id, Booking.property_id, Booking.check_in).cte("removed")
+        result = await self.db.execute(
+            select(target.c.id.label("target_id"), target.c.previous_status, target.c.manager_id, *removed.c)
+            .select_from(target.outerjoin(removed, removed.c.id == target.c.id))
+        )
+        return list(result.all())
 
-        await self.db.delete(db_booking)
-        return True
+    @staticmethod
+    def to_booking(row) -> Booking:
+        """Booking built from the columns of a transition() row."""
+        return Booking(**{column.key: getattr(row, column.key) for column in Booking.__table__.c})
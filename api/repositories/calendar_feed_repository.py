@@ -0,0 +1,59 @@
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from core.enums import BookingStatus
+from models.booking import Booking
+from models.calendar_feed_version import CalendarFeedVersion
+from models.property import Property
+import uuid
+
+
+class CalendarFeedRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def bump(self, property_ids: list[uuid.UUID]) -> None:
+        """Increments the feed version of each property in one upsert (sorted to keep lock order stable)."""
+        if not property_ids:
+            return
+        # clock_timestamp(), not now(): the transaction may have started well before the change
+        stmt = insert(CalendarFeedVersion).values(
+            [
+                {"property_id": property_id, "version": 1, "updated_at": func.clock_timestamp()}
+                for property_id in sorted(set(property_ids))
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CalendarFeedVersion.property_id],
+            set_={"version": CalendarFeedVersion.version + 1, "updated_at": func.clock_timestamp()},
+        )
+        await self.db.execute(stmt)
+
+    async def get_state(self, property_id: uuid.UUID):
+        """
+        (name, created_at, version, updated_at, now) of an active property; version is None
+        before any change and now is the database clock, the one updated_at comes from.
+        """
+        result = await self.db.execute(
+            select(
+                Property.name, Property.created_at, CalendarFeedVersion.version, CalendarFeedVersion.updated_at,
+                func.clock_timestamp().label("now"),
+            )
+            .outerjoin(CalendarFeedVersion, CalendarFeedVersion.property_id == Property.id)
+            .where(Property.id == property_id, Property.is_active == True)
+        )
+        return result.first()
+
+    async def get_feed_bookings(self, property_id: uuid.UUID) -> list:
+        """Non-cancelled bookings of the property with the columns serialized into VEVENTs."""
+        result = await self.db.execute(
+            select(
+                Booking.ical_uid, Booking.check_in, Booking.check_out, Booking.summary,
+                Booking.description, Booking.status, Booking.created_at, Booking.updated_at,
+            )
+            .where(Booking.property_id == property_id, Booking.status != BookingStatus.CANCELLED)
+            .order_by(Booking.check_in)
+        )
+        return list(result.all())
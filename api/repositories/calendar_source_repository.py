@@ -0,0 +1,56 @@
+from sqlalchemy import delete, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models.calendar_source import CalendarSource
+from models.property import Property
+import uuid
+
+
+class CalendarSourceRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, property_id: uuid.UUID, url: str, source) -> CalendarSource:
+        calendar_source = CalendarSource(property_id=property_id, url=url, source=source)
+        self.db.add(calendar_source)
+        await self.db.flush()
+        await self.db.refresh(calendar_source)
+        return calendar_source
+
+    async def get_by_id(self, source_id: uuid.UUID) -> CalendarSource | None:
+        result = await self.db.execute(select(CalendarSource).where(CalendarSource.id == source_id))
+        return result.scalars().first()
+
+    async def get_by_property_url(self, property_id: uuid.UUID, url: str) -> CalendarSource | None:
+        result = await self.db.execute(
+            select(CalendarSource).where(CalendarSource.property_id == property_id, CalendarSource.url == url)
+        )
+        return result.scalars().first()
+
+    async def get_by_property(self, property_id: uuid.UUID) -> list[CalendarSource]:
+        result = await self.db.execute(
+            select(CalendarSource).where(CalendarSource.property_id == property_id).order_by(CalendarSource.created_at)
+        )
+        return list(result.scalars().all())
+
+    async def get_all_for_polling(self) -> list:
+        """(id, property_id) of the sources of every active property."""
+        result = await self.db.execute(
+            select(CalendarSource.id, CalendarSource.property_id)
+            .join(Property, Property.id == CalendarSource.property_id)
+            .where(Property.is_active == True)
+        )
+        return list(result.all())
+
+    async def mark_synced(
+        self, source_id: uuid.UUID, etag: str | None, last_modified: str | None, error: str | None = None
+    ) -> None:
+        """Records the outcome of a poll; validators are only replaced after a successful fetch."""
+        values = {"last_synced_at": func.now(), "last_error": error}
+        if error is None:
+            values.update(etag=etag, last_modified=last_modified)
+        await self.db.execute(update(CalendarSource).where(CalendarSource.id == source_id).values(**values))
+
+    async def delete(self, source_id: uuid.UUID) -> None:
+        await self.db.execute(delete(CalendarSource).where(CalendarSource.id == source_id))
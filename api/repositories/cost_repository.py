@@ -142,6 +142,20 @@ class CostRepository:
         )
         return list(result.scalars().all())
 
+    async def get_costs_overlapping_for_properties(
+        self, property_ids: list[uuid.UUID], range_start: date, range_end: date
+    ) -> list[PropertyCost]:
+        """Same as get_costs_overlapping for several properties in one query."""
+        result = await self.db.execute(
+            select(PropertyCost).where(
+                PropertyCost.property_id.in_(property_ids),
+                PropertyCost.is_active == True,
+                or_(PropertyCost.start_date == None, PropertyCost.start_date <= range_end),
+                or_(PropertyCost.end_date == None, PropertyCost.end_date >= range_start),
+            )
+        )
+        return list(result.scalars().all())
+
     # ------------------------------------------------------------------ #
     # Versioning operations                                                #
     # ------------------------------------------------------------------ #
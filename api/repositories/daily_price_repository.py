@@ -0,0 +1,167 @@
+from datetime import date
+
+from sqlalchemy import Date, bindparam, func, text
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models.property_daily_price import PropertyDailyPrice
+import uuid
+
+# Keeps multi-row INSERTs well under the PostgreSQL bind parameter limit
+UPSERT_BATCH_SIZE = 1000
+
+# Nightly prices of one property computed entirely in PostgreSQL: one row per day of
+# generate_series, with the active costs, base price and rule found by date containment.
+# Mirrors PriceTimeline / DailyPriceEngine: floor = monthly/30 + per-day + per-reservation/avg_stay
+# over FIXED_AMOUNT costs; the base is the first active version in the base price repository's
+# VERSION_ORDER and falls back to the property's base_price when there is none or it is zero;
+# percent falls back to 100.
+DAILY_PRICES_SQL = """
+    SELECT
+        priced.date,
+        priced.floor_price,
+        priced.floor_price
+            + (priced.base_price - priced.floor_price) * (priced.profitability_percent / 100) AS price,
+        priced.profitability_percent,
+        priced.rule_name
+    FROM (
+        SELECT
+            days.date,
+            COALESCE((
+                SELECT SUM(
+                    CASE c.category
+                        WHEN 'RECURRING_MONTHLY' THEN c.value / 30
+                        WHEN 'PER_DAY_RESERVATION' THEN c.value
+                        WHEN 'PER_RESERVATION' THEN
+                            CASE WHEN p.avg_stay_days > 0 THEN c.value / p.avg_stay_days ELSE 0 END
+                    END
+                )
+                FROM property_costs c
+                WHERE c.property_id = p.id
+                  AND c.is_active
+                  AND c.calculation_type = 'FIXED_AMOUNT'
+                  AND (c.start_date IS NULL OR c.start_date <= days.date)
+                  AND (c.end_date IS NULL OR c.end_date >= days.date)
+            ), 0) AS floor_price,
+            COALESCE(NULLIF((
+                SELECT bp.value
+                FROM property_base_prices bp
+                WHERE bp.property_id = p.id
+                  AND bp.is_active
+                  AND (bp.start_date IS NULL OR bp.start_date <= days.date)
+                  AND (bp.end_date IS NULL OR bp.end_date >= days.date)
+                ORDER BY bp.start_date NULLS FIRST, bp.id
+                LIMIT 1
+            ), 0), p.base_price) AS base_price,
+            COALESCE(r.profitability_percent, 100) AS profitability_percent,
+            r.name AS rule_name
+        FROM properties p
+        CROSS JOIN (
+            SELECT d::date AS date
+            FROM generate_series(CAST(:range_start AS date), CAST(:range_end AS date), interval '1 day') AS d
+        ) AS days
+        LEFT JOIN pricing_rules r
+            ON r.property_id = p.id AND days.date BETWEEN r.start_date AND r.end_date
+        WHERE p.id = :property_id
+    ) AS priced
+"""
+
+_DAILY_PRICES_PARAMS = (
+    bindparam("property_id", type_=UUID(as_uuid=True)),
+    bindparam("range_start", type_=Date),
+    bindparam("range_end", type_=Date),
+)
+
+
+class DailyPriceRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _in_span(property_id: uuid.UUID, range_start: date | None, range_end: date | None) -> list:
+        """Filters for rows of a property inside [range_start, range_end]; None means unbounded."""
+        conditions = [PropertyDailyPrice.property_id == property_id]
+        if range_start is not None:
+            conditions.append(PropertyDailyPrice.date >= range_start)
+        if range_end is not None:
+            conditions.append(PropertyDailyPrice.date <= range_end)
+        return conditions
+
+    async def get_range(
+        self, property_id: uuid.UUID, range_start: date, range_end: date
+    ) -> list[PropertyDailyPrice]:
+        """Returns the materialized rows in [range_start, range_end] ordered by date (primary key range scan)."""
+        result = await self.db.execute(
+            select(PropertyDailyPrice)
+            .where(*self._in_span(property_id, range_start, range_end))
+            .order_by(PropertyDailyPrice.date.asc())
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    async def get_range_for_properties(
+        self, property_ids: list[uuid.UUID], range_start: date, range_end: date
+    ) -> list[PropertyDailyPrice]:
+        """Same as get_range for several properties in one query, ordered by property and date."""
+        result = await self.db.execute(
+            select(PropertyDailyPrice)
+            .where(
+                PropertyDailyPrice.property_id.in_(property_ids),
+                PropertyDailyPrice.date >= range_start,
+                PropertyDailyPrice.date <= range_end,
+            )
+            .order_by(PropertyDailyPrice.property_id, PropertyDailyPrice.date.asc())
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    async def get_materialized_bounds(
+        self, property_id: uuid.UUID, range_start: date | None, range_end: date | None
+    ) -> tuple[date | None, date | None]:
+        """Returns (min date, max date) of the rows materialized inside the span, or (None, None)."""
+        result = await self.db.execute(
+            select(func.min(PropertyDailyPrice.date), func.max(PropertyDailyPrice.date))
+            .where(*self._in_span(property_id, range_start, range_end))
+        )
+        low, high = result.one()
+        return low, high
+
+    async def compute_in_sql(self, property_id: uuid.UUID, range_start: date, range_end: date) -> list:
+        """Nightly prices of [range_start, range_end] computed by DAILY_PRICES_SQL, ordered by date (not stored)."""
+        result = await self.db.execute(
+            text(DAILY_PRICES_SQL + " ORDER BY priced.date").bindparams(*_DAILY_PRICES_PARAMS),
+            {"property_id": property_id, "range_start": range_start, "range_end": range_end},
+        )
+        return list(result.all())
+
+    async def materialize_in_sql(self, property_id: uuid.UUID, range_start: date, range_end: date) -> None:
+        """Computes and upserts the nightly prices of [range_start, range_end] in a single statement."""
+        await self.db.execute(
+            text(
+                "INSERT INTO property_daily_prices"
+                " (property_id, date, floor_price, price, profitability_percent, rule_name, computed_at)"
+                " SELECT CAST(:property_id AS uuid), computed.*, now() FROM (" + DAILY_PRICES_SQL + ") AS computed"
+                " ON CONFLICT (property_id, date) DO UPDATE SET"
+                " floor_price = EXCLUDED.floor_price, price = EXCLUDED.price,"
+                " profitability_percent = EXCLUDED.profitability_percent,"
+                " rule_name = EXCLUDED.rule_name, computed_at = now()"
+            ).bindparams(*_DAILY_PRICES_PARAMS),
+            {"property_id": property_id, "range_start": range_start, "range_end": range_end},
+        )
+
+    async def upsert_many(self, rows: list[dict]) -> None:
+        """Inserts or replaces rows keyed by (property_id, date)."""
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            stmt = insert(PropertyDailyPrice).values(rows[i:i + UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[PropertyDailyPrice.property_id, PropertyDailyPrice.date],
+                set_={
+                    "floor_price": stmt.excluded.floor_price,
+                    "price": stmt.excluded.price,
+                    "profitability_percent": stmt.excluded.profitability_percent,
+                    "rule_name": stmt.excluded.rule_name,
+                    "computed_at": func.now(),
+                },
+            )
+            await self.db.execute(stmt)
@@ -0,0 +1,92 @@
+from datetime import date
+
+from sqlalchemy import delete, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models.financial_snapshot import FinancialSnapshot
+from repositories.pricing_lock_repository import PricingLockRepository
+import uuid
+
+_COST_COLUMNS = {
+    "fixed_monthly": "fixed_monthly",
+    "fixed_daily": "fixed_daily",
+    "variable_per_reservation": "variable_per_reservation",
+    "commissions": "commissions",
+    "total": "total_costs",
+}
+_SUMMARY_COLUMNS = (
+    "days_in_month", "occupied_days", "occupancy_rate", "total_bookings",
+    "total_income", "net_profit", "profit_margin_percent",
+)
+
+
+class FinancialSnapshotRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def to_summary(snapshot: FinancialSnapshot) -> dict:
+        """Rebuilds the dict returned by PricingService.get_financial_summary."""
+        return {
+            "year": snapshot.year,
+            "month": snapshot.month,
+            "days_in_month": snapshot.days_in_month,
+            "occupied_days": snapshot.occupied_days,
+            "occupancy_rate": snapshot.occupancy_rate,
+            "total_bookings": snapshot.total_bookings,
+            "total_income": snapshot.total_income,
+            "costs": {key: getattr(snapshot, column) for key, column in _COST_COLUMNS.items()},
+            "net_profit": snapshot.net_profit,
+            "profit_margin_percent": snapshot.profit_margin_percent,
+        }
+
+    async def get_many(
+        self, property_ids: list[uuid.UUID], first: tuple[int, int], last: tuple[int, int]
+    ) -> list[FinancialSnapshot]:
+        """Snapshots of the given properties for the months in [first, last] as (year, month)."""
+        period = tuple_(FinancialSnapshot.year, FinancialSnapshot.month)
+        result = await self.db.execute(
+            select(FinancialSnapshot).where(
+                FinancialSnapshot.property_id.in_(property_ids),
+                period >= tuple_(*first),
+                period <= tuple_(*last),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def upsert_many(self, summaries: list[tuple[uuid.UUID, dict]]) -> None:
+        """Stores (property_id, summary) pairs, replacing existing snapshots of the same months."""
+        if not summaries:
+            return
+        rows = []
+        for property_id, summary in summaries:
+            row = {"property_id": property_id, "year": summary["year"], "month": summary["month"]}
+            row.update({column: summary[column] for column in _SUMMARY_COLUMNS})
+            row.update({column: summary["costs"][key] for key, column in _COST_COLUMNS.items()})
+            rows.append(row)
+        stmt = insert(FinancialSnapshot).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FinancialSnapshot.property_id, FinancialSnapshot.year, FinancialSnapshot.month],
+            set_={
+                column: stmt.excluded[column]
+                for column in (*_SUMMARY_COLUMNS, *_COST_COLUMNS.values(), "computed_at")
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def invalidate(self, property_id: uuid.UUID, since: date | None = None) -> None:
+        """
+        Deletes the snapshots of the month containing since and every later month (all if None).
+        Takes the property's pricing lock first and keeps it until commit, so a summary being
+        computed concurrently from the old data is either stored before this delete or waits
+        for the change to commit.
+        """
+        await PricingLockRepository(self.db).lock([property_id])
+        query = delete(FinancialSnapshot).where(FinancialSnapshot.property_id == property_id)
+        if since is not None:
+            query = query.where(
+                tuple_(FinancialSnapshot.year, FinancialSnapshot.month) >= tuple_(since.year, since.month)
+            )
+        await self.db.execute(query)
@@ -0,0 +1,29 @@
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+
+# One transaction-scoped advisory lock per property, taken in key order so concurrent
+# multi-property holders cannot deadlock each other
+LOCK_SQL = text("""
+    SELECT pg_advisory_xact_lock(hashtextextended('pricing:' || keys.key, 0))
+    FROM (SELECT unnest(CAST(:keys AS text[])) AS key ORDER BY 1) AS keys
+""").bindparams(bindparam("keys", type_=ARRAY(String)))
+
+
+class PricingLockRepository:
+    """
+    Serializes the rows derived from a property's pricing inputs (nightly prices, financial
+    snapshots) with the changes of those inputs. Writers of the inputs take the lock before
+    invalidating; readers that materialize derived rows take it before loading the inputs, so
+    a derived row is always computed from committed inputs no older than the last invalidation.
+    The lock is released at commit/rollback and is re-entrant within a transaction.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def lock(self, property_ids: list[uuid.UUID]) -> None:
+        if not property_ids:
+            return
+        await self.db.execute(LOCK_SQL, {"keys": sorted({str(property_id) for property_id in property_ids})})
@@ -48,6 +48,36 @@ class PricingRuleRepository:
         )
         return list(result.scalars().all())
 
+    async def get_rules_overlapping(
+        self, property_id: uuid.UUID, range_start: date, range_end: date
+    ) -> list[PricingRule]:
+        """Returns all rules overlapping [range_start, range_end], ordered by start_date (for bulk lookups)."""
+        result = await self.db.execute(
+            select(PricingRule)
+            .where(
+                PricingRule.property_id == property_id,
+                PricingRule.start_date <= range_end,
+                PricingRule.end_date >= range_start,
+            )
+            .order_by(PricingRule.start_date.asc())
+        )
+        return list(result.scalars().all())
+
+    async def get_rules_overlapping_for_properties(
+        self, property_ids: list[uuid.UUID], range_start: date, range_end: date
+    ) -> list[PricingRule]:
+        """Same as get_rules_overlapping for several properties in one query."""
+        result = await self.db.execute(
+            select(PricingRule)
+            .where(
+                PricingRule.property_id.in_(property_ids),
+                PricingRule.start_date <= range_end,
+                PricingRule.end_date >= range_start,
+            )
+            .order_by(PricingRule.start_date.asc())
+        )
+        return list(result.scalars().all())
+
     async def update(self, rule_id: uuid.UUID, rule_update: PricingRuleUpdate) -> PricingRule | None:
         db_rule = await self.get_by_id(rule_id)
         if not db_rule:
@@ -9,6 +9,11 @@ from models.property_base_price import PropertyBasePrice
 import uuid
 
 
+# Precedence of overlapping active versions: the engine (PriceTimeline) and the SQL pricing
+# backend both take the first one in this order
+VERSION_ORDER = (PropertyBasePrice.start_date.asc().nulls_first(), PropertyBasePrice.id.asc())
+
+
 class PropertyBasePriceRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -86,21 +91,35 @@ class PropertyBasePriceRepository:
                 PropertyBasePrice.is_active == True,
                 or_(PropertyBasePrice.start_date == None, PropertyBasePrice.start_date <= ref_date),
                 or_(PropertyBasePrice.end_date == None, PropertyBasePrice.end_date >= ref_date),
-            )
+            ).order_by(*VERSION_ORDER)
         )
         return result.scalars().first()
 
     async def get_overlapping(
         self, property_id: uuid.UUID, range_start: date, range_end: date
     ) -> list[PropertyBasePrice]:
-        """Returns all base price records overlapping the given date range (for bulk lookups)."""
+        """Returns all base price records overlapping the given date range in VERSION_ORDER (for bulk lookups)."""
         result = await self.db.execute(
             select(PropertyBasePrice).where(
                 PropertyBasePrice.property_id == property_id,
                 PropertyBasePrice.is_active == True,
                 or_(PropertyBasePrice.start_date == None, PropertyBasePrice.start_date <= range_end),
                 or_(PropertyBasePrice.end_date == None, PropertyBasePrice.end_date >= range_start),
-            )
+            ).order_by(*VERSION_ORDER)
+        )
+        return list(result.scalars().all())
+
+    async def get_overlapping_for_properties(
+        self, property_ids: list[uuid.UUID], range_start: date, range_end: date
+    ) -> list[PropertyBasePrice]:
+        """Same as get_overlapping for several properties in one query."""
+        result = await self.db.execute(
+            select(PropertyBasePrice).where(
+                PropertyBasePrice.property_id.in_(property_ids),
+                PropertyBasePrice.is_active == True,
+                or_(PropertyBasePrice.start_date == None, PropertyBasePrice.start_date <= range_end),
+                or_(PropertyBasePrice.end_date == None, PropertyBasePrice.end_date >= range_start),
+            ).order_by(*VERSION_ORDER)
         )
         return list(result.scalars().all())
 
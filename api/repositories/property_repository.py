@@ -1,7 +1,11 @@
+from sqlalchemy import exists, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from models.booking import Booking
 from models.property import Property
 from schemas.property import PropertyCreate, PropertyUpdate
+from core.enums import BookingStatus
+from datetime import date
 import uuid
 
 
@@ -30,6 +34,45 @@ class PropertyRepository:
         result = await self.db.execute(select(Property).where(Property.id == property_id))
         return result.scalars().first()
 
+    async def get_by_ids(self, property_ids: list[uuid.UUID]) -> list[Property]:
+        result = await self.db.execute(select(Property).where(Property.id.in_(property_ids)))
+        return list(result.scalars().all())
+
+    async def reload(self, properties: list[Property]) -> None:
+        """Refreshes already loaded properties in place with their committed state (one query)."""
+        if not properties:
+            return
+        await self.db.execute(
+            select(Property)
+            .where(Property.id.in_([p.id for p in properties]))
+            .execution_options(populate_existing=True)
+        )
+
+    async def get_available(
+        self,
+        check_in: date,
+        check_out: date,
+        manager_id: uuid.UUID | None = None,
+        property_ids: list[uuid.UUID] | None = None,
+    ) -> list[Property]:
+        """
+        Active properties with no non-cancelled booking overlapping [check_in, check_out),
+        in one query. The overlap test uses the same daterange && expression and partial
+        predicate as the excl_bookings_no_overlap GiST index, so the planner can probe it.
+        """
+        overlapping = select(Booking.id).where(
+            Booking.property_id == Property.id,
+            Booking.status != BookingStatus.CANCELLED,
+            func.daterange(Booking.check_in, Booking.check_out).op("&&")(func.daterange(check_in, check_out)),
+        )
+        query = select(Property).where(Property.is_active == True, ~exists(overlapping))
+        if manager_id is not None:
+            query = query.where(Property.manager_id == manager_id)
+        if property_ids is not None:
+            query = query.where(Property.id.in_(property_ids))
+        result = await self.db.execute(query.order_by(Property.name))
+        return list(result.scalars().all())
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> list[Property]:
         result = await self.db.execute(select(Property).where(Property.is_active == True).offset(skip).limit(limit))
         return list(result.scalars().all())
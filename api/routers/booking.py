@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
+from datetime import date
 from uuid import UUID
 
-from schemas.booking import BookingCreate, BookingUpdate, BookingPay, BookingResponse
+from core.enums import BookingSource, BookingStatus
+from schemas.booking import (
+    BookingCreate, BookingUpdate, BookingPay, BookingResponse, BookingFilter, BookingImportResult,
+    BookingBulkRequest, BookingBulkPay, BookingBulkResult,
+)
+from services.booking_import_service import BookingImportService
 from services.booking_service import BookingService
 from core.database import get_db
 from dependencies.auth import get_current_user, has_role
@@ -12,6 +18,23 @@ from core.roles import Role
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
+# Response header carrying the cursor of the next page of a booking list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _booking_filter(
+    start_date: Optional[date] = Query(None, description="Bookings checking out after this date"),
+    end_date: Optional[date] = Query(None, description="Bookings checking in before this date"),
+    status: Optional[List[BookingStatus]] = Query(None),
+    source: Optional[List[BookingSource]] = Query(None),
+) -> BookingFilter:
+    return BookingFilter(start_date=start_date, end_date=end_date, status=status or [], source=source or [])
+
+
+def _set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
 
 @router.post("/", response_model=BookingResponse, status_code=201)
 async def create_booking(
@@ -23,15 +46,79 @@ async def create_booking(
     return await BookingService(db).create_booking(booking_in)
 
 
+@router.post("/import", response_model=BookingImportResult)
+async def import_bookings(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$", description="Defaults from the Content-Type"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(has_role(Role.ROLE_BOOKING_CREATE))
+):
+    """
+    Bulk import bookings from a CSV (text/csv, with header) or JSON lines (application/x-ndjson)
+    body. Valid rows are imported; invalid rows are reported by row number. Requires MANAGER or ADMIN role.
+    """
+    fmt = format or ("jsonl" if "json" in request.headers.get("content-type", "") else "csv")
+    return await BookingImportService(db).import_bookings(request.stream(), fmt, current_user)
+
+
+@router.post("/bulk/confirm", response_model=BookingBulkResult)
+async def bulk_confirm_bookings(
+    bulk_in: BookingBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(has_role(Role.ROLE_BOOKING_UPDATE))
+):
+    """Accept many TENTATIVE bookings; results per id. Requires MANAGER or ADMIN role."""
+    return await BookingService(db).bulk_accept(bulk_in.booking_ids, current_user)
+
+
+@router.post("/bulk/cancel", response_model=BookingBulkResult)
+async def bulk_cancel_bookings(
+    bulk_in: BookingBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(has_role(Role.ROLE_BOOKING_UPDATE))
+):
+    """Cancel many bookings; results per id. Requires MANAGER or ADMIN role."""
+    return await BookingService(db).bulk_cancel(bulk_in.booking_ids, current_user)
+
+
+@router.post("/bulk/pay", response_model=BookingBulkResult)
+async def bulk_pay_bookings(
+    bulk_in: BookingBulkPay,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(has_role(Role.ROLE_BOOKING_UPDATE))
+):
+    """Mark many bookings as PAID with the same payment date and method; results per id. Requires MANAGER or ADMIN role."""
+    return await BookingService(db).bulk_mark_as_paid(bulk_in.booking_ids, bulk_in, current_user)
+
+
+@router.post("/bulk/delete", response_model=BookingBulkResult)
+async def bulk_delete_bookings(
+    bulk_in: BookingBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(has_role(Role.ROLE_BOOKING_DELETE))
+):
+    """Permanently delete many CANCELLED bookings; results per id. Requires MANAGER or ADMIN role."""
+    return await BookingService(db).bulk_delete(bulk_in.booking_ids, current_user)
+
+
 @router.get("/", response_model=List[BookingResponse])
 async def list_bookings(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    cursor: Optional[str] = Query(None, description=f"Value of the {NEXT_CURSOR_HEADER} header of the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    property_id: Optional[List[UUID]] = Query(None),
+    filters: BookingFilter = Depends(_booking_filter),
     db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """List all bookings. Authenticated users only."""
-    return await BookingService(db).list_bookings(skip, limit, current_user)
+    """
+    List bookings ordered by check-in. Authenticated users only.
+    Paginated by cursor: pass the X-Next-Cursor header of a page to get the next one.
+    """
+    filters.property_id = property_id or []
+    bookings, next_cursor = await BookingService(db).list_bookings(current_user, filters, cursor, limit)
+    _set_next_cursor(response, next_cursor)
+    return bookings
 
 
 @router.get("/{booking_id}", response_model=BookingResponse)
@@ -110,10 +197,16 @@ async def delete_booking(
 @router.get("/properties/{property_id}/bookings", response_model=List[BookingResponse])
 async def list_property_bookings(
     property_id: UUID,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    response: Response,
+    cursor: Optional[str] = Query(None, description=f"Value of the {NEXT_CURSOR_HEADER} header of the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    filters: BookingFilter = Depends(_booking_filter),
     db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """List bookings for a specific property. Authenticated users only."""
-    return await BookingService(db).list_bookings_by_property(property_id, skip, limit, current_user)
+    """List bookings for a specific property ordered by check-in, paginated like /bookings/."""
+    bookings, next_cursor = await BookingService(db).list_bookings_by_property(
+        property_id, current_user, filters, cursor, limit
+    )
+    _set_next_cursor(response, next_cursor)
+    return bookings
@@ -0,0 +1,49 @@
+from email.utils import format_datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from dependencies.auth import get_current_user
+from models.user import User as Usuario
+from services.calendar_feed_service import FEED_MEDIA_TYPE, CalendarFeedService
+
+router = APIRouter(tags=["calendar-feed"])
+
+
+@router.get("/properties/{property_id}/calendar.ics", name="get_calendar_feed")
+async def get_calendar_feed(
+    property_id: UUID,
+    token: str = Query(..., description="Feed token from /properties/{id}/calendar-feed"),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    iCal export of the property's non-cancelled bookings for OTAs. Authenticated by the
+    feed token instead of a bearer token; supports conditional GETs (ETag / Last-Modified).
+    """
+    feed = await CalendarFeedService(db).get_feed(property_id, token, if_none_match, if_modified_since)
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": format_datetime(feed.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if feed.body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=feed.body, media_type=FEED_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/properties/{property_id}/calendar-feed")
+async def get_calendar_feed_url(
+    property_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """URL of the property's iCal export feed, to register in Airbnb / Booking.com."""
+    token = await CalendarFeedService(db).get_feed_token(property_id, current_user)
+    url = request.url_for("get_calendar_feed", property_id=str(property_id)).include_query_params(token=token)
+    return {"url": str(url)}
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from uuid import UUID
+
+import httpx
+
+from schemas.calendar_source import (
+    CalendarSourceCreate, CalendarSourceResponse, CalendarSyncResult, CalendarSyncStatus,
+)
+from services.calendar_sync_service import CalendarSyncService
+from core.database import get_db
+from dependencies.auth import get_current_user, has_role
+from dependencies.http_client import get_http_client
+from models.user import User as Usuario
+from core.roles import Role
+from core.config import settings
+
+router = APIRouter(tags=["calendar-sources"])
+
+
+@router.get("/calendar-sources/sync-status", response_model=CalendarSyncStatus)
+async def get_calendar_sync_status(
+    request: Request,
+    current_user: Usuario = Depends(has_role(Role.ROLE_ADMIN)),
+):
+    """Per-feed lag of the background poller of this process (empty when polling is disabled). Requires ADMIN role."""
+    scheduler = getattr(request.app.state, "calendar_sync", None)
+    if scheduler is None:
+        return {
+            "enabled": False,
+            "interval_seconds": settings.CALENDAR_SYNC_INTERVAL_SECONDS,
+            "workers": settings.CALENDAR_SYNC_WORKERS,
+            "max_lag_seconds": None,
+            "feeds": [],
+        }
+    feeds = scheduler.metrics()
+    return {
+        "enabled": True,
+        "interval_seconds": scheduler.interval,
+        "workers": scheduler.workers,
+        "max_lag_seconds": max((feed["lag_seconds"] for feed in feeds), default=None),
+        "feeds": feeds,
+    }
+
+
+@router.post(
+    "/properties/{property_id}/calendar-sources",
+    response_model=CalendarSourceResponse,
+    status_code=201,
+)
+async def add_calendar_source(
+    property_id: UUID,
+    source_in: CalendarSourceCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(has_role(Role.ROLE_BOOKING_SYNC)),
+):
+    """Register an external iCal feed (Airbnb, Booking.com) of the property. Requires MANAGER or ADMIN role."""
+    return await CalendarSyncService(db).add_source(property_id, source_in, current_user)
+
+
+@router.get(
+    "/properties/{property_id}/calendar-sources",
+    response_model=List[CalendarSourceResponse],
+)
+async def list_calendar_sources(
+    property_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user),
+):
+    """List the external iCal feeds of the property with their last sync state."""
+    return await CalendarSyncService(db).list_sources(property_id, current_user)
+
+
+@router.delete("/properties/{property_id}/calendar-sources/{source_id}", status_code=204)
+async def delete_calendar_source(
+    property_id: UUID,
+    source_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(has_role(Role.ROLE_BOOKING_SYNC)),
+):
+    """Unregister an external iCal feed. Bookings already synced from it are kept."""
+    await CalendarSyncService(db).delete_source(property_id, source_id, current_user)
+
+
+@router.post(
+    "/properties/{property_id}/calendar-sources/{source_id}/sync",
+    response_model=CalendarSyncResult,
+)
+async def sync_calendar_source(
+    property_id: UUID,
+    source_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_http_client),
+    current_user: Usuario = Depends(has_role(Role.ROLE_BOOKING_SYNC)),
+):
+    """
+    Fetch the feed now and apply its new, changed and cancelled stays to the bookings.
+    Fetch errors are returned in "error" and stored on the source. Requires MANAGER or ADMIN role.
+    """
+    return await CalendarSyncService(db, http).sync(property_id, source_id, current_user)
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from datetime import date
+
+from services.portfolio_service import PortfolioService
+from core.database import get_db
+from dependencies.auth import get_current_user
+from models.user import User as Usuario
+
+router = APIRouter(prefix="/portfolio", tags=["portfolio"])
+
+
+@router.get("/calendar")
+async def get_calendar_grid(
+    start_date: date,
+    end_date: date,
+    property_ids: Optional[List[UUID]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Get the price and availability calendar of several properties (defaults to the managed ones)."""
+    return await PortfolioService(db).get_calendar_grid(property_ids, start_date, end_date, current_user)
+
+
+@router.get("/financial-summary")
+async def get_financial_rollup(
+    year: int = Query(..., ge=2020, le=2100),
+    month: int = Query(..., ge=1, le=12),
+    scope: str = Query("managed", pattern="^(managed|owned)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Get the monthly financial summary of every managed (or owned) property, with portfolio totals."""
+    return await PortfolioService(db).get_financial_rollup(year, month, scope, current_user)
+
+
+@router.get("/availability")
+async def search_availability(
+    check_in: date,
+    check_out: date,
+    property_ids: Optional[List[UUID]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Find which properties (defaults to the managed ones) are free for a stay, with the quoted total of each."""
+    return await PortfolioService(db).search_availability(check_in, check_out, property_ids, current_user)
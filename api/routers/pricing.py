@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, Query
+import json
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from datetime import date
 
-from schemas.pricing_rule import PricingRuleCreate, PricingRuleUpdate, PricingRuleResponse
-from schemas.booking import PriceQuoteResponse
+from schemas.pricing_rule import PricingRuleCreate, PricingRuleUpdate, PricingRuleResponse, PricingSimulationRequest
+from schemas.booking import PriceQuoteResponse, BatchPriceQuoteRequest, BatchPriceQuoteItem
 from services.pricing_service import PricingService
+from services.pricing_cache import pricing_cache
 from core.database import get_db
 from dependencies.auth import get_current_user, has_role
 from models.user import User as Usuario
@@ -53,15 +58,32 @@ async def delete_pricing_rule(
     await PricingService(db).delete_rule(rule_id)
     return {"message": "Regla de precio eliminada correctamente"}
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _ndjson_lines(chunks):
+    async for days in chunks:
+        yield "".join(json.dumps(jsonable_encoder(day)) + "\n" for day in days)
+
+
 @router.get("/properties/{property_id}/calendar")
 async def get_calendar(
     property_id: UUID,
     start_date: date,
     end_date: date,
+    stream: bool = Query(False),
+    accept: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Get calendar with calculated prices."""
+    """
+    Get calendar with calculated prices. With stream=true or Accept: application/x-ndjson
+    the days are streamed as NDJSON (one JSON object per line) and the range may span up
+    to 3660 days instead of 731.
+    """
+    if stream or NDJSON_MEDIA_TYPE in (accept or ""):
+        chunks = await PricingService(db).stream_calendar(property_id, start_date, end_date)
+        return StreamingResponse(_ndjson_lines(chunks), media_type=NDJSON_MEDIA_TYPE)
     return await PricingService(db).get_calendar(property_id, start_date, end_date)
 
 @router.get("/properties/{property_id}/price-quote", response_model=PriceQuoteResponse)
@@ -80,6 +102,38 @@ async def get_price_quote(
     return {"total_amount": total, "nights": (check_out - check_in).days}
 
 
+@router.post("/pricing/price-quotes", response_model=List[BatchPriceQuoteItem])
+async def get_price_quotes(
+    batch: BatchPriceQuoteRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Get estimated totals for many (property, check_in, check_out) ranges in one request."""
+    quotes = [(q.property_id, q.check_in, q.check_out) for q in batch.quotes]
+    totals = await PricingService(db).calculate_booking_totals(quotes)
+    return [
+        {
+            "property_id": q.property_id,
+            "check_in": q.check_in,
+            "check_out": q.check_out,
+            "total_amount": total,
+            "nights": (q.check_out - q.check_in).days,
+        }
+        for q, total in zip(batch.quotes, totals)
+    ]
+
+
+@router.post("/properties/{property_id}/pricing-simulation")
+async def simulate_pricing(
+    property_id: UUID,
+    sim: PricingSimulationRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Project prices and monthly revenue for candidate percents or rule sets without saving any rule."""
+    return await PricingService(db).simulate(property_id, sim)
+
+
 @router.get("/properties/{property_id}/financial-summary")
 async def get_financial_summary(
     property_id: UUID,
@@ -90,3 +144,27 @@ async def get_financial_summary(
 ):
     """Get monthly financial performance summary."""
     return await PricingService(db).get_financial_summary(property_id, year, month)
+
+
+@router.get("/properties/{property_id}/financial-summary/range")
+async def get_financial_summary_range(
+    property_id: UUID,
+    start_year: int = Query(..., ge=2020, le=2100),
+    start_month: int = Query(..., ge=1, le=12),
+    end_year: int = Query(..., ge=2020, le=2100),
+    end_month: int = Query(..., ge=1, le=12),
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Get the monthly financial summaries of a month range (e.g. a whole year) in one request."""
+    return await PricingService(db).get_financial_summary_range(
+        property_id, start_year, start_month, end_year, end_month
+    )
+
+
+@router.get("/pricing/cache-stats")
+async def get_pricing_cache_stats(
+    current_user: Usuario = Depends(has_role(Role.ROLE_ADMIN))
+):
+    """Hit/miss counters of the in-process calendar and price quote cache. Requires ADMIN role."""
+    return pricing_cache.stats()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, UUID4, Field, model_validator
 from datetime import datetime, date
 from typing import Optional
 from decimal import Decimal
@@ -29,6 +29,15 @@ class BookingUpdate(BaseModel):
     status: Optional[BookingStatus] = None
 
 
+class BookingFilter(BaseModel):
+    """Optional filters of booking lists; the date window keeps bookings overlapping [start_date, end_date)."""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    status: list[BookingStatus] = Field(default_factory=list)
+    source: list[BookingSource] = Field(default_factory=list)
+    property_id: list[UUID4] = Field(default_factory=list)
+
+
 class BookingPay(BaseModel):
     paid_at: date
     payment_method: PaymentMethod
@@ -40,6 +49,28 @@ class PriceQuoteResponse(BaseModel):
     nights: int
 
 
+class PriceQuoteRequest(BaseModel):
+    property_id: UUID4
+    check_in: date
+    check_out: date
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.check_in >= self.check_out:
+            raise ValueError("check_out debe ser posterior a check_in")
+        return self
+
+
+class BatchPriceQuoteRequest(BaseModel):
+    quotes: list[PriceQuoteRequest] = Field(..., min_length=1, max_length=500)
+
+
+class BatchPriceQuoteItem(PriceQuoteResponse):
+    property_id: UUID4
+    check_in: date
+    check_out: date
+
+
 class BookingResponse(BookingBase):
     id: UUID4
     ical_uid: str
@@ -57,3 +88,49 @@ class BookingResponse(BookingBase):
 
     class Config:
         from_attributes = True
+
+
+class BookingImportRow(BookingCreate):
+    """One row of a bulk import file; imported bookings default to the MANUAL source."""
+    source: BookingSource = BookingSource.MANUAL
+    external_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.check_in >= self.check_out:
+            raise ValueError("check_out debe ser posterior a check_in")
+        return self
+
+
+class BookingImportError(BaseModel):
+    row: int
+    error: str
+
+
+class BookingImportResult(BaseModel):
+    received: int
+    imported: int
+    errors: list[BookingImportError]
+
+
+class BookingBulkRequest(BaseModel):
+    booking_ids: list[UUID4] = Field(..., min_length=1, max_length=500)
+
+
+class BookingBulkPay(BookingPay):
+    """Payment recorded on every booking of the batch; paid_amount, if given, applies to each one."""
+    booking_ids: list[UUID4] = Field(..., min_length=1, max_length=500)
+
+
+class BookingBulkItem(BaseModel):
+    id: UUID4
+    success: bool
+    status_code: int
+    detail: Optional[str] = None
+    status: Optional[BookingStatus] = None
+
+
+class BookingBulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BookingBulkItem]
@@ -0,0 +1,75 @@
+from pydantic import AnyHttpUrl, BaseModel, UUID4, field_validator
+from datetime import datetime
+from typing import Optional
+from core.enums import BookingSource
+from dependencies.http_client import is_public_address
+import ipaddress
+
+
+class CalendarSourceCreate(BaseModel):
+    url: AnyHttpUrl
+    source: BookingSource
+
+    @field_validator('url')
+    @classmethod
+    def validate_url(cls, v: AnyHttpUrl) -> AnyHttpUrl:
+        """Only https feeds on public hosts; hostnames are checked again on every fetch."""
+        if v.scheme != "https":
+            raise ValueError("La URL del calendario debe usar https")
+        host = (v.host or "").strip("[]")
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            if host == "localhost" or host.endswith(".localhost"):
+                raise ValueError("La URL del calendario debe apuntar a un host público")
+            return v
+        if not is_public_address(host):
+            raise ValueError("La URL del calendario debe apuntar a un host público")
+        return v
+
+
+class CalendarSourceResponse(BaseModel):
+    id: UUID4
+    property_id: UUID4
+    url: str
+    source: BookingSource
+    last_synced_at: Optional[datetime]
+    last_error: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CalendarSyncConflict(BaseModel):
+    uid: str
+    error: str
+
+
+class CalendarSyncResult(BaseModel):
+    not_modified: bool = False
+    inserted: int = 0
+    updated: int = 0
+    cancelled: int = 0
+    unchanged: int = 0
+    conflicts: list[CalendarSyncConflict] = []
+    error: Optional[str] = None
+
+
+class CalendarSyncFeedStatus(BaseModel):
+    source_id: UUID4
+    property_id: UUID4
+    lag_seconds: float
+    next_poll_in_seconds: float
+    failures: int
+    polls: int
+    last_duration_seconds: Optional[float]
+    last_error: Optional[str]
+
+
+class CalendarSyncStatus(BaseModel):
+    enabled: bool
+    interval_seconds: float
+    workers: int
+    max_lag_seconds: Optional[float]
+    feeds: list[CalendarSyncFeedStatus]
@@ -37,3 +37,31 @@ class PricingRuleResponse(PricingRuleBase):
 
     class Config:
         from_attributes = True
+
+
+class PricingRuleSet(BaseModel):
+    """A named candidate rule set; replaces the property's rules in a simulation."""
+    name: str
+    rules: list[PricingRuleBase] = Field(default_factory=list)
+
+
+class PricingSimulationRequest(BaseModel):
+    start_date: date
+    end_date: date
+    percents: list[Decimal] = Field(default_factory=list, description="Each percent is simulated over the whole range")
+    rule_sets: list[PricingRuleSet] = Field(default_factory=list)
+    include_days: bool = True
+
+    @field_validator('end_date')
+    @classmethod
+    def validate_dates(cls, v: date, info) -> date:
+        if 'start_date' in info.data and v < info.data['start_date']:
+            raise ValueError('end_date must be after start_date')
+        return v
+
+    @field_validator('percents')
+    @classmethod
+    def validate_percents(cls, v: list[Decimal]) -> list[Decimal]:
+        if any(p < 0 for p in v):
+            raise ValueError('profitability_percent must be >= 0')
+        return v
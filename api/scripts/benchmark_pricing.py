@@ -0,0 +1,209 @@
+"""
+Benchmark the per-day cost rescan against the compiled PriceTimeline and the
+DailyPriceEngine, and the per-day booking scan against the OccupancyOverlay.
+
+Builds a synthetic property with many cost, base price and rule versions in
+memory (no database needed) and prices every day of the range each way,
+checking that the results match exactly.
+
+Usage:
+    python scripts/benchmark_pricing.py [--days 730] [--versions 48] [--bookings 300] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.enums import CostCategory, CostCalculationType
+from services.occupancy_overlay import OccupancyOverlay
+from services.pricing_engine import DailyPriceEngine
+from services.pricing_timeline import PriceTimeline, RuleTimeline, calculate_floor_price, is_active_on
+
+
+def _versioned(start: date, days: int, versions: int, make_value):
+    """Splits [start, start + days) into consecutive versions of a single concept."""
+    cuts = sorted(random.sample(range(1, days), versions - 1))
+    bounds = [0, *cuts, None]
+    records = []
+    for i in range(versions):
+        records.append(SimpleNamespace(
+            start_date=None if i == 0 else start + timedelta(days=bounds[i]),
+            end_date=None if bounds[i + 1] is None else start + timedelta(days=bounds[i + 1] - 1),
+            value=make_value(),
+        ))
+    return records
+
+
+def build_fixture(start: date, days: int, versions: int):
+    costs = []
+    concepts = [
+        (CostCategory.RECURRING_MONTHLY, CostCalculationType.FIXED_AMOUNT),
+        (CostCategory.PER_DAY_RESERVATION, CostCalculationType.FIXED_AMOUNT),
+        (CostCategory.PER_RESERVATION, CostCalculationType.FIXED_AMOUNT),
+        (CostCategory.PER_RESERVATION, CostCalculationType.PERCENTAGE),
+    ]
+    for category, calculation_type in concepts:
+        for record in _versioned(start, days, versions, lambda: Decimal(random.randint(100, 90000)) / 100):
+            record.category = category
+            record.calculation_type = calculation_type
+            costs.append(record)
+    base_prices = _versioned(start, days, max(2, versions // 4), lambda: Decimal(random.randint(5000, 50000)) / 100)
+
+    rules = []
+    rule_start = start + timedelta(days=random.randint(0, 14))
+    while rule_start < start + timedelta(days=days):
+        length = random.randint(2, 30)
+        rules.append(SimpleNamespace(
+            id=uuid.uuid4(),
+            name=f"Rule {len(rules) + 1}",
+            start_date=rule_start,
+            end_date=rule_start + timedelta(days=length),
+            profitability_percent=Decimal(random.randint(0, 15000)) / 100,
+        ))
+        rule_start += timedelta(days=length + random.randint(1, 21))
+    return costs, base_prices, rules
+
+
+def per_day_rescan(costs, base_prices, default_base, avg_stay, start, end):
+    result = []
+    current = start
+    while current <= end:
+        day_costs = [c for c in costs if is_active_on(c, current)]
+        floor = calculate_floor_price(day_costs, avg_stay)
+        base = next((p.value for p in base_prices if is_active_on(p, current)), None) or default_base
+        result.append((current, floor, base))
+        current += timedelta(days=1)
+    return result
+
+
+def compiled_timeline(costs, base_prices, default_base, avg_stay, start, end):
+    timeline = PriceTimeline.compile(costs, base_prices, default_base, avg_stay, start, end)
+    return [(day, seg.floor_price, seg.base_price) for day, seg in timeline.iter_days(start, end)]
+
+
+def per_day_prices(costs, base_prices, rules, prop, start, end):
+    rule_timeline = RuleTimeline(rules)
+    result = []
+    current = start
+    while current <= end:
+        floor = calculate_floor_price([c for c in costs if is_active_on(c, current)], prop.avg_stay_days)
+        base = next((p.value for p in base_prices if is_active_on(p, current)), None) or prop.base_price
+        rule = rule_timeline.rule_for(current)
+        percent = rule.profitability_percent if rule else Decimal(100)
+        price = floor + ((base - floor) * (percent / Decimal(100)))
+        result.append((current, round(price, 2), round(floor, 2), percent))
+        current += timedelta(days=1)
+    return result
+
+
+def engine_prices(costs, base_prices, rules, prop, start, end):
+    engine = DailyPriceEngine.build(prop, costs, base_prices, rules, start, end)
+    return [
+        (day, round(piece.price, 2), round(piece.floor_price, 2), piece.percent)
+        for day, piece in engine.iter_days(start, end)
+    ]
+
+
+def build_bookings(start: date, days: int, count: int):
+    """Back-to-back short stays with random gaps, like a high-turnover property."""
+    bookings = []
+    check_in = start
+    for _ in range(count):
+        check_in += timedelta(days=random.randint(0, 2))
+        check_out = check_in + timedelta(days=random.randint(1, 4))
+        if check_out > start + timedelta(days=days):
+            break
+        bookings.append(SimpleNamespace(id=uuid.uuid4(), check_in=check_in, check_out=check_out))
+        check_in = check_out
+    random.shuffle(bookings)
+    return bookings
+
+
+def per_day_booking_scan(bookings, start, end):
+    result = []
+    current = start
+    while current <= end:
+        booking = next((b for b in bookings if b.check_in <= current < b.check_out), None)
+        result.append((current, booking.id if booking else None))
+        current += timedelta(days=1)
+    return result
+
+
+def occupancy_overlay(bookings, start, end):
+    overlay = OccupancyOverlay(bookings, start, end)
+    result = []
+    current = start
+    while current <= end:
+        booking = overlay.booking_on(current)
+        result.append((current, booking.id if booking else None))
+        current += timedelta(days=1)
+    return result
+
+
+def _best_of(fn, repeat, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--versions", type=int, default=48, help="versions per cost concept")
+    parser.add_argument("--bookings", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    start = date(2026, 1, 1)
+    end = start + timedelta(days=args.days - 1)
+    costs, base_prices, rules = build_fixture(start, args.days, args.versions)
+    prop = SimpleNamespace(base_price=Decimal("100.00"), avg_stay_days=3)
+    pricing_args = (costs, base_prices, prop.base_price, prop.avg_stay_days, start, end)
+
+    rescan_time, rescan = _best_of(per_day_rescan, args.repeat, *pricing_args)
+    timeline_time, timeline = _best_of(compiled_timeline, args.repeat, *pricing_args)
+    if rescan != timeline:
+        print("MISMATCH between per-day rescan and compiled timeline")
+        sys.exit(1)
+
+    price_args = (costs, base_prices, rules, prop, start, end)
+    per_day_time, per_day = _best_of(per_day_prices, args.repeat, *price_args)
+    engine_time, engine = _best_of(engine_prices, args.repeat, *price_args)
+    if per_day != engine:
+        print("MISMATCH between per-day prices and DailyPriceEngine")
+        sys.exit(1)
+
+    bookings = build_bookings(start, args.days, args.bookings)
+    scan_time, scan = _best_of(per_day_booking_scan, args.repeat, bookings, start, end)
+    overlay_time, overlay = _best_of(occupancy_overlay, args.repeat, bookings, start, end)
+    if scan != overlay:
+        print("MISMATCH between per-day booking scan and OccupancyOverlay")
+        sys.exit(1)
+
+    print(
+        f"days={args.days} cost_records={len(costs)} "
+        f"base_price_records={len(base_prices)} rules={len(rules)} bookings={len(bookings)}"
+    )
+    print(f"floor/base  per-day rescan:    {rescan_time * 1000:8.2f} ms")
+    print(f"floor/base  compiled timeline: {timeline_time * 1000:8.2f} ms  ({rescan_time / timeline_time:.1f}x)")
+    print(f"full price  per-day formula:   {per_day_time * 1000:8.2f} ms")
+    print(f"full price  DailyPriceEngine:  {engine_time * 1000:8.2f} ms  ({per_day_time / engine_time:.1f}x)")
+    print(f"occupancy   per-day scan:      {scan_time * 1000:8.2f} ms")
+    print(f"occupancy   OccupancyOverlay:  {overlay_time * 1000:8.2f} ms  ({scan_time / overlay_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark the Python DailyPriceEngine against the in-SQL generate_series backend
+(DAILY_PRICES_SQL) on a real database.
+
+Prices the given properties (or the first --limit active ones) over the range with
+both backends, checks that the rounded prices, floor prices, percents and rule
+names match, and prints the best time of each. Nothing is written.
+
+Usage:
+    python scripts/benchmark_pricing_sql.py [--start 2026-01-01] [--days 730]
+        [--property-id UUID ...] [--limit 20] [--repeat 3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models  # noqa: F401 — registers all ORM models
+from sqlalchemy.future import select
+
+from core.database import AsyncSessionLocal, engine
+from models.property import Property
+from repositories.daily_price_repository import DailyPriceRepository
+from services.daily_price_service import DailyPriceService
+
+
+async def python_backend(db, props, start, end):
+    service = DailyPriceService(db)
+    result = {}
+    for prop in props:
+        price_engine = await service.load_engine(prop, start, end)
+        result[prop.id] = [
+            (day, round(piece.floor_price, 2), round(piece.price, 2), piece.percent, piece.rule_name)
+            for day, piece in price_engine.iter_days(start, end)
+        ]
+    return result
+
+
+async def sql_backend(db, props, start, end):
+    repo = DailyPriceRepository(db)
+    result = {}
+    for prop in props:
+        rows = await repo.compute_in_sql(prop.id, start, end)
+        result[prop.id] = [
+            (r.date, round(r.floor_price, 2), round(r.price, 2), r.profitability_percent, r.rule_name)
+            for r in rows
+        ]
+    return result
+
+
+async def _best_of(fn, repeat, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = await fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+async def run(args) -> int:
+    start = date.fromisoformat(args.start)
+    end = start + timedelta(days=args.days - 1)
+    async with AsyncSessionLocal() as db:
+        query = select(Property).where(Property.is_active == True)
+        if args.property_id:
+            query = query.where(Property.id.in_([uuid.UUID(pid) for pid in args.property_id]))
+        props = list((await db.execute(query.limit(args.limit))).scalars().all())
+        if not props:
+            print("No properties found")
+            return 1
+
+        python_time, python_prices = await _best_of(python_backend, args.repeat, db, props, start, end)
+        sql_time, sql_prices = await _best_of(sql_backend, args.repeat, db, props, start, end)
+
+    mismatches = sum(python_prices[p.id] != sql_prices[p.id] for p in props)
+    print(f"properties={len(props)} days={args.days} nights={len(props) * args.days}")
+    print(f"python engine:  {python_time * 1000:8.2f} ms")
+    print(f"sql backend:    {sql_time * 1000:8.2f} ms  ({python_time / sql_time:.1f}x)")
+    if mismatches:
+        print(f"MISMATCH in {mismatches} properties")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", default=date.today().isoformat())
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--property-id", action="append")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    async def _main():
+        try:
+            return await run(args)
+        finally:
+            await engine.dispose()
+
+    sys.exit(asyncio.run(_main()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import codecs
+import csv
+import json
+import uuid
+from collections import defaultdict
+from typing import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.enums import UserRole
+from exceptions.general import BadRequestException, ImportarArchivoCsvException
+from models.user import User as UserModel
+from repositories.booking_import_repository import BookingImportRepository
+from repositories.calendar_feed_repository import CalendarFeedRepository
+from repositories.financial_snapshot_repository import FinancialSnapshotRepository
+from schemas.booking import BookingImportRow
+from services.booking_night_service import BookingNightService
+from services.booking_service import generate_ical_uid
+from services.pricing_cache import pricing_cache
+from services.pricing_service import MAX_CALENDAR_DAYS, PricingService
+
+# Upper bound for the data rows of one import request
+MAX_IMPORT_ROWS = 100_000
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+class BookingImportService:
+    """
+    Bulk import of historical and OTA bookings from CSV or JSON lines. Rows are parsed
+    while the body streams in, copied into a staging table, validated set-wise (property
+    access, guests, duplicates, overlaps with existing bookings and with earlier rows),
+    priced with batch quotes and inserted with a single statement. Invalid rows are
+    reported instead of aborting the import.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.import_repo = BookingImportRepository(db)
+        self.snapshot_repo = FinancialSnapshotRepository(db)
+        self.feed_repo = CalendarFeedRepository(db)
+        self.booking_nights = BookingNightService(db)
+        self.pricing = PricingService(db)
+
+    async def import_bookings(self, body: AsyncIterable[bytes], fmt: str, current_user: UserModel) -> dict:
+        if fmt not in IMPORT_FORMATS:
+            raise BadRequestException(f"Formato no soportado: {fmt}")
+
+        errors: list[dict] = []
+        received = 0
+
+        async def records() -> AsyncIterator[tuple]:
+            nonlocal received
+            rows = self._csv_rows(body) if fmt == "csv" else self._jsonl_rows(body)
+            async for row_no, data in rows:
+                received = row_no
+                if row_no > MAX_IMPORT_ROWS:
+                    raise BadRequestException(f"La importación no puede superar {MAX_IMPORT_ROWS} filas")
+                if data is None:
+                    errors.append({"row": row_no, "error": "La fila no es un objeto JSON válido"})
+                    continue
+                try:
+                    row = BookingImportRow.model_validate(data)
+                except ValidationError as exc:
+                    errors.append({"row": row_no, "error": self._validation_message(exc)})
+                    continue
+                booking_id = uuid.uuid4()
+                yield (
+                    row_no, booking_id, generate_ical_uid(booking_id), row.property_id, row.guest_id,
+                    row.check_in, row.check_out, row.summary, row.description,
+                    row.status.value, row.source.value, row.external_id,
+                )
+
+        await self.import_repo.create_staging()
+        await self.import_repo.copy_rows(records())
+
+        manager_id = None if current_user.role == UserRole.ADMIN else current_user.id
+        await self.import_repo.validate(manager_id)
+        await self._price_valid_rows()
+        inserted = await self.import_repo.insert_valid()
+
+        by_property: dict[uuid.UUID, list] = defaultdict(list)
+        for booking in inserted:
+            by_property[booking.property_id].append(booking)
+        for property_id, bookings in sorted(by_property.items()):
+            pricing_cache.invalidate(self.db, property_id)
+            await self.snapshot_repo.invalidate(property_id, min(b.check_in for b in bookings))
+        await self.booking_nights.write_many(inserted)
+        await self.feed_repo.bump(list(by_property))
+
+        errors.extend({"row": row.row_no, "error": row.error} for row in await self.import_repo.get_errors())
+        errors.sort(key=lambda e: e["row"])
+        return {"received": received, "imported": len(inserted), "errors": errors}
+
+    async def _price_valid_rows(self) -> None:
+        """
+        Quotes total_amount for the valid rows with batch price quotes, in chunks whose
+        date hull stays within MAX_CALENDAR_DAYS. Stays longer than that keep no total,
+        like bookings whose price cannot be computed on creation.
+        """
+        chunks: list[list] = []
+        chunk_end = None
+        for row in await self.import_repo.get_valid():  # ordered by check_in
+            if (row.check_out - row.check_in).days > MAX_CALENDAR_DAYS:
+                continue
+            if chunks and (max(chunk_end, row.check_out) - chunks[-1][0].check_in).days <= MAX_CALENDAR_DAYS:
+                chunks[-1].append(row)
+                chunk_end = max(chunk_end, row.check_out)
+            else:
+                chunks.append([row])
+                chunk_end = row.check_out
+
+        row_nos, totals = [], []
+        for chunk in chunks:
+            totals.extend(await self.pricing.calculate_booking_totals(
+                [(row.property_id, row.check_in, row.check_out) for row in chunk]
+            ))
+            row_nos.extend(row.row_no for row in chunk)
+        await self.import_repo.set_totals(row_nos, totals)
+
+    @staticmethod
+    def _validation_message(exc: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" if err["loc"] else err["msg"]
+            for err in exc.errors()
+        )
+
+    @staticmethod
+    async def _lines(body: AsyncIterable[bytes]) -> AsyncIterator[str]:
+        """Decodes the streamed body as UTF-8 and yields its lines without line endings."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+        try:
+            async for chunk in body:
+                pending += decoder.decode(chunk)
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    yield line.rstrip("\r")
+            pending += decoder.decode(b"", final=True)
+        except UnicodeDecodeError as exc:
+            raise ImportarArchivoCsvException(extra="el archivo no está codificado en UTF-8") from exc
+        if pending:
+            yield pending.rstrip("\r")
+
+    async def _csv_rows(self, body: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, dict]]:
+        """(row number, fields) per CSV record; the first record is the header, empty cells are None."""
+        header = None
+        row_no = 0
+        record = ""
+        async for line in self._lines(body):
+            record = f"{record}\n{line}" if record else line
+            if record.count('"') % 2:
+                continue  # Quoted field spanning lines
+            values, record = next(csv.reader([record]), []), ""
+            if not values:
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                missing = {"property_id", "check_in", "check_out", "summary"} - set(header)
+                if missing:
+                    raise ImportarArchivoCsvException(extra=f"faltan columnas {', '.join(sorted(missing))}")
+                continue
+            row_no += 1
+            yield row_no, {name: (value or None) for name, value in zip(header, values)}
+        if record:
+            raise ImportarArchivoCsvException(extra="comillas sin cerrar al final del archivo")
+
+    async def _jsonl_rows(self, body: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, dict]]:
+        """(row number, object) per non-empty line; malformed lines yield None."""
+        row_no = 0
+        async for line in self._lines(body):
+            if not line.strip():
+                continue
+            row_no += 1
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                data = None
+            yield row_no, data if isinstance(data, dict) else None
@@ -0,0 +1,92 @@
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.enums import BookingStatus
+from repositories.booking_night_repository import BookingNightRepository
+from repositories.booking_repository import BookingRepository
+from repositories.cost_repository import CostRepository
+from repositories.pricing_rule_repository import PricingRuleRepository
+from repositories.property_base_price_repository import PropertyBasePriceRepository
+from repositories.property_repository import PropertyRepository
+from services.pricing_engine import DailyPriceEngine
+
+
+class BookingNightService:
+    """
+    Maintains the booking_nights ledger: one row per occupied night of every
+    non-cancelled booking with the nightly price and per-day reservation costs in
+    effect that night. BookingService writes a booking's nights whenever it changes;
+    DailyPriceService rebuilds the nights of a span when pricing inputs change.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.night_repo = BookingNightRepository(db)
+        self.booking_repo = BookingRepository(db)
+        self.property_repo = PropertyRepository(db)
+        self.cost_repo = CostRepository(db)
+        self.base_price_repo = PropertyBasePriceRepository(db)
+        self.pricing_repo = PricingRuleRepository(db)
+
+    async def write(self, booking) -> None:
+        """Replaces the ledger nights of a booking; cancelled bookings have none."""
+        if booking.status == BookingStatus.CANCELLED:
+            await self.night_repo.delete_for_bookings([booking.id])
+            return
+        prop = await self.property_repo.get_by_id(booking.property_id)
+        if prop:
+            await self._write_many(prop, [booking])
+
+    async def write_many(self, bookings: list) -> None:
+        """write() for many bookings: one delete for the cancelled ones, one engine per property for the rest."""
+        by_property: dict[uuid.UUID, list] = defaultdict(list)
+        cancelled = []
+        for booking in bookings:
+            if booking.status == BookingStatus.CANCELLED:
+                cancelled.append(booking.id)
+            else:
+                by_property[booking.property_id].append(booking)
+        if cancelled:
+            await self.night_repo.delete_for_bookings(cancelled)
+        if not by_property:
+            return
+        for prop in await self.property_repo.get_by_ids(list(by_property)):
+            await self._write_many(prop, by_property[prop.id])
+
+    async def rebuild(
+        self, property_id: uuid.UUID, range_start: date | None = None, range_end: date | None = None
+    ) -> None:
+        """Reprices the ledger nights of every booking with a night in [range_start, range_end] (None = unbounded)."""
+        bookings = await self.booking_repo.get_nights_in_span(property_id, range_start, range_end)
+        if not bookings:
+            return
+        prop = await self.property_repo.get_by_id(property_id)
+        if prop:
+            await self._write_many(prop, bookings)
+
+    async def _write_many(self, prop, bookings: list) -> None:
+        """Recomputes the nights of bookings of one property with a single engine over their hull."""
+        start_date = min(b.check_in for b in bookings)
+        end_date = max(b.check_out for b in bookings) - timedelta(days=1)
+
+        all_costs = await self.cost_repo.get_costs_overlapping(prop.id, start_date, end_date)
+        all_base_prices = await self.base_price_repo.get_overlapping(prop.id, start_date, end_date)
+        rules = await self.pricing_repo.get_rules_overlapping(prop.id, start_date, end_date)
+        engine = DailyPriceEngine.build(prop, all_costs, all_base_prices, rules, start_date, end_date)
+
+        rows = [
+            {
+                "booking_id": booking.id,
+                "date": day,
+                "property_id": prop.id,
+                "price": piece.price,
+                "per_day_cost": piece.segment.per_day_reservation_cost,
+            }
+            for booking in bookings
+            for day, piece in engine.iter_days(booking.check_in, booking.check_out - timedelta(days=1))
+        ]
+        await self.night_repo.delete_for_bookings([b.id for b in bookings])
+        await self.night_repo.insert_many(rows)
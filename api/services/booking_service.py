@@ -1,21 +1,54 @@
 from models.booking import Booking
 from models.user import User as UserModel
-from schemas.booking import BookingCreate, BookingUpdate
+from schemas.booking import BookingCreate, BookingFilter, BookingUpdate
 from repositories.booking_repository import BookingRepository
+from repositories.calendar_feed_repository import CalendarFeedRepository
+from repositories.financial_snapshot_repository import FinancialSnapshotRepository
 from repositories.property_repository import PropertyRepository
-from exceptions.general import NotFoundException, ConflictException, BadRequestException, ForbiddenException
+from exceptions.general import APIException, NotFoundException, ConflictException, BadRequestException, ForbiddenException
 from core.enums import UserRole, BookingStatus, PaymentMethod
 from schemas.booking import BookingPay
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.config import settings
+from services.booking_night_service import BookingNightService
+from services.pricing_cache import pricing_cache
+from datetime import date
+import base64
+import re
 import uuid
 
+_DATERANGE = re.compile(r"\[(\d{4}-\d{2}-\d{2}),(\d{4}-\d{2}-\d{2})\)")
+
+# Status transitions: (statuses the booking may be in, error when it is in another one)
+ACCEPT_RULE = ([BookingStatus.TENTATIVE], "Solo se pueden aceptar reservas en estado Tentativo")
+CANCEL_RULE = (
+    [BookingStatus.CONFIRMED, BookingStatus.TENTATIVE, BookingStatus.PAID],
+    "La reserva ya está cancelada",
+)
+PAY_RULE = (
+    [BookingStatus.CONFIRMED, BookingStatus.TENTATIVE],
+    "Solo se pueden marcar como pagadas reservas Confirmadas o Tentativas",
+)
+REVERT_PAYMENT_RULE = ([BookingStatus.PAID], "Solo se puede revertir el pago de reservas en estado Pagado")
+DELETE_RULE = ([BookingStatus.CANCELLED], "Solo se pueden eliminar reservas canceladas")
+
+
+def generate_ical_uid(booking_id: uuid.UUID) -> str:
+    """Generate iCal UID in format: {booking_id}@domu.{domain}"""
+    # Extract domain from API_V1_STR or use default
+    domain = getattr(settings, 'DOMAIN', 'domu.com')
+    return f"{booking_id}@{domain}"
+
 
 class BookingService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.booking_repo = BookingRepository(db)
         self.property_repo = PropertyRepository(db)
+        self.booking_nights = BookingNightService(db)
+        self.snapshot_repo = FinancialSnapshotRepository(db)
+        self.feed_repo = CalendarFeedRepository(db)
 
     def _is_admin(self, user: UserModel) -> bool:
         return user.role == UserRole.ADMIN
@@ -27,11 +60,58 @@ class BookingService:
         if not prop or prop.manager_id != current_user.id:
             raise ForbiddenException("No tienes permiso para acceder a esta reserva")
 
+    async def _booking_changed(self, booking: Booking, previous_check_in: date | None = None) -> None:
+        """
+        Invalidates cached prices of the property, rewrites the booking's ledger nights,
+        drops the financial snapshots from its (previous or new) check-in month on and
+        bumps the property's iCal feed version.
+        """
+        pricing_cache.invalidate(self.db, booking.property_id)
+        await self.booking_nights.write(booking)
+        since = min(booking.check_in, previous_check_in or booking.check_in)
+        await self.snapshot_repo.invalidate(booking.property_id, since)
+        await self.feed_repo.bump([booking.property_id])
+
+    async def _status_changed(self, booking: Booking) -> None:
+        """
+        _booking_changed after a status transition. Nightly prices do not depend on the
+        status, so the ledger is untouched except for a cancellation, which drops the nights.
+        """
+        pricing_cache.invalidate(self.db, booking.property_id)
+        if booking.status == BookingStatus.CANCELLED:
+            await self.booking_nights.night_repo.delete_for_bookings([booking.id])
+        await self.snapshot_repo.invalidate(booking.property_id, booking.check_in)
+        await self.feed_repo.bump([booking.property_id])
+
+    async def _bookings_changed(self, bookings: list[Booking]) -> None:
+        """_status_changed for many transitioned bookings, batched per property."""
+        if not bookings:
+            return
+        since: dict[uuid.UUID, date] = {}
+        for booking in bookings:
+            since[booking.property_id] = min(booking.check_in, since.get(booking.property_id, booking.check_in))
+        cancelled = [booking.id for booking in bookings if booking.status == BookingStatus.CANCELLED]
+        if cancelled:
+            await self.booking_nights.night_repo.delete_for_bookings(cancelled)
+        for property_id, check_in in sorted(since.items()):
+            pricing_cache.invalidate(self.db, property_id)
+            await self.snapshot_repo.invalidate(property_id, check_in)
+        await self.feed_repo.bump(list(since))
+
+    @staticmethod
+    def _overlap_conflict(exc: IntegrityError) -> ConflictException | None:
+        """Maps an excl_bookings_no_overlap violation to a ConflictException naming the existing stay."""
+        if "excl_bookings_no_overlap" not in str(exc.orig):
+            return None
+        # DETAIL: Key (...)=(<id>, [new range)) conflicts with existing key (...)=(<id>, [existing range))
+        ranges = _DATERANGE.findall(getattr(exc.orig, "detail", None) or "")
+        if not ranges:
+            return ConflictException("Conflicto de fechas con una reserva existente")
+        check_in, check_out = ranges[-1]
+        return ConflictException(f"Conflicto de fechas con una reserva existente ({check_in} a {check_out})")
+
     def _generate_ical_uid(self, booking_id: uuid.UUID) -> str:
-        """Generate iCal UID in format: {booking_id}@domu.{domain}"""
-        # Extract domain from API_V1_STR or use default
-        domain = getattr(settings, 'DOMAIN', 'domu.com')
-        return f"{booking_id}@{domain}"
+        return generate_ical_uid(booking_id)
 
     async def create_booking(self, booking_create: BookingCreate) -> Booking:
         """Create a new booking with validation."""
@@ -39,18 +119,6 @@ class BookingService:
         if booking_create.check_in >= booking_create.check_out:
             raise BadRequestException("La fecha de check-in debe ser anterior a la de check-out")
 
-        # Check for conflicts
-        conflicts = await self.booking_repo.check_conflicts(
-            property_id=booking_create.property_id,
-            check_in=booking_create.check_in,
-            check_out=booking_create.check_out
-        )
-        
-        if conflicts:
-            raise ConflictException(
-                f"Conflicto de fechas con {len(conflicts)} reserva(s) existente(s)"
-            )
-
         # Generate iCal UID
         booking_id = uuid.uuid4()
         ical_uid = self._generate_ical_uid(booking_id)
@@ -67,8 +135,17 @@ class BookingService:
         except Exception:
             pass
 
-        # Create booking
-        booking = await self.booking_repo.create(booking_create, ical_uid, total_amount=total_amount)
+        # Create booking; overlaps are rejected by the exclusion constraint, not a pre-check
+        try:
+            booking = await self.booking_repo.create(
+                booking_create, ical_uid, total_amount=total_amount, booking_id=booking_id
+            )
+        except IntegrityError as exc:
+            conflict = self._overlap_conflict(exc)
+            if conflict is None:
+                raise
+            raise conflict from exc
+        await self._booking_changed(booking)
         return booking
 
     async def get_booking(self, booking_id: uuid.UUID, current_user: UserModel) -> Booking:
@@ -79,23 +156,68 @@ class BookingService:
         await self._check_booking_access(booking, current_user)
         return booking
 
-    async def list_bookings(self, skip: int = 0, limit: int = 100, current_user: UserModel = None) -> list[Booking]:
-        """List bookings. ADMIN sees all; others see only bookings for their properties."""
-        if self._is_admin(current_user):
-            return await self.booking_repo.get_all(skip, limit)
-        return await self.booking_repo.get_all_by_manager(current_user.id, skip, limit)
+    @staticmethod
+    def _encode_cursor(booking: Booking) -> str:
+        """Opaque cursor holding the (check_in, id) key of the last booking of a page."""
+        return base64.urlsafe_b64encode(f"{booking.check_in.isoformat()}|{booking.id}".encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[date, uuid.UUID]:
+        try:
+            check_in, booking_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return date.fromisoformat(check_in), uuid.UUID(booking_id)
+        except ValueError:
+            raise BadRequestException("Cursor de paginación inválido")
+
+    async def _list_page(
+        self, filters: BookingFilter, cursor: str | None, limit: int, **scope
+    ) -> tuple[list[Booking], str | None]:
+        """Fetches one keyset page (one extra row tells whether there is a next page)."""
+        if filters.start_date and filters.end_date and filters.end_date <= filters.start_date:
+            raise BadRequestException("La fecha final debe ser posterior a la inicial")
+        bookings = await self.booking_repo.get_page(
+            limit + 1,
+            after=self._decode_cursor(cursor) if cursor else None,
+            statuses=filters.status,
+            sources=filters.source,
+            start_date=filters.start_date,
+            end_date=filters.end_date,
+            **scope,
+        )
+        if len(bookings) <= limit:
+            return bookings, None
+        page = bookings[:limit]
+        return page, self._encode_cursor(page[-1])
+
+    async def list_bookings(
+        self, current_user: UserModel, filters: BookingFilter, cursor: str | None = None, limit: int = 100
+    ) -> tuple[list[Booking], str | None]:
+        """
+        List bookings ordered by (check_in, id) with keyset pagination; returns the page and
+        the cursor of the next one (None on the last page). ADMIN sees all; others see only
+        bookings for their properties.
+        """
+        manager_id = None if self._is_admin(current_user) else current_user.id
+        return await self._list_page(
+            filters, cursor, limit, manager_id=manager_id, property_ids=filters.property_id
+        )
 
     async def list_bookings_by_property(
-        self, property_id: uuid.UUID, skip: int = 0, limit: int = 100, current_user: UserModel = None
-    ) -> list[Booking]:
-        """List bookings for a specific property."""
+        self,
+        property_id: uuid.UUID,
+        current_user: UserModel,
+        filters: BookingFilter,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> tuple[list[Booking], str | None]:
+        """List bookings for a specific property, paginated like list_bookings."""
         if not self._is_admin(current_user):
             prop = await self.property_repo.get_by_id(property_id)
             if not prop:
                 raise NotFoundException("Propiedad no encontrada")
             if prop.manager_id != current_user.id:
                 raise ForbiddenException("No tienes permiso para ver las reservas de esta propiedad")
-        return await self.booking_repo.get_by_property(property_id, skip, limit)
+        return await self._list_page(filters, cursor, limit, property_ids=[property_id])
 
     async def update_booking(self, booking_id: uuid.UUID, booking_update: BookingUpdate, current_user: UserModel) -> Booking:
         """Update a booking with conflict validation."""
@@ -122,75 +244,131 @@ class BookingService:
                     f"Conflicto de fechas con {len(conflicts)} reserva(s) existente(s)"
                 )
 
+        previous_check_in = existing.check_in
         booking = await self.booking_repo.update(booking_id, booking_update)
         if not booking:
             raise NotFoundException("Reserva no encontrada")
+        await self._booking_changed(booking, previous_check_in)
+        return booking
+
+    def _manager_scope(self, user: UserModel) -> uuid.UUID | None:
+        """manager_id a user's booking writes are restricted to (None = any property)."""
+        return None if self._is_admin(user) else user.id
+
+    @staticmethod
+    def _check_transition(row, manager_id: uuid.UUID | None, wrong_state_message: str) -> None:
+        """
+        Maps a BookingRepository.transition() / delete_in_status() row to the errors of a
+        lookup + access check + state check: missing booking, other manager's property,
+        status the transition does not apply to.
+        """
+        if row is None:
+            raise NotFoundException("Reserva no encontrada")
+        if row.id is None:
+            if manager_id is not None and row.manager_id != manager_id:
+                raise ForbiddenException("No tienes permiso para acceder a esta reserva")
+            raise BadRequestException(wrong_state_message)
+
+    async def _transition(self, booking_id: uuid.UUID, current_user: UserModel, rule: tuple, **values) -> Booking:
+        """Applies a status transition with a single conditional UPDATE ... RETURNING."""
+        manager_id = self._manager_scope(current_user)
+        rows = await self.booking_repo.transition([booking_id], rule[0], values, manager_id)
+        row = rows[0] if rows else None
+        self._check_transition(row, manager_id, rule[1])
+        booking = self.booking_repo.to_booking(row)
+        await self._status_changed(booking)
         return booking
 
+    @staticmethod
+    def _pay_values(pay_in: BookingPay) -> dict:
+        values = {"status": BookingStatus.PAID, "paid_at": pay_in.paid_at, "payment_method": pay_in.payment_method}
+        if pay_in.paid_amount is not None:
+            values["paid_amount"] = pay_in.paid_amount
+        return values
+
     async def accept_booking(self, booking_id: uuid.UUID, current_user: UserModel) -> Booking:
         """Accept a TENTATIVE booking, changing its status to CONFIRMED."""
-        booking = await self.booking_repo.get_by_id(booking_id)
-        if not booking:
-            raise NotFoundException("Reserva no encontrada")
-        await self._check_booking_access(booking, current_user)
-        if booking.status != BookingStatus.TENTATIVE:
-            raise BadRequestException("Solo se pueden aceptar reservas en estado Tentativo")
-        from schemas.booking import BookingUpdate
-        updated = await self.booking_repo.update(booking_id, BookingUpdate(status=BookingStatus.CONFIRMED))
-        return updated
+        return await self._transition(booking_id, current_user, ACCEPT_RULE, status=BookingStatus.CONFIRMED)
 
     async def cancel_booking(self, booking_id: uuid.UUID, current_user: UserModel) -> Booking:
         """Cancel a booking (set status to CANCELLED)."""
-        booking = await self.booking_repo.get_by_id(booking_id)
-        if not booking:
-            raise NotFoundException("Reserva no encontrada")
-        await self._check_booking_access(booking, current_user)
-        if booking.status == BookingStatus.CANCELLED:
-            raise BadRequestException("La reserva ya está cancelada")
-        booking = await self.booking_repo.delete(booking_id)
-        return booking
+        return await self._transition(booking_id, current_user, CANCEL_RULE, status=BookingStatus.CANCELLED)
 
     async def mark_as_paid(self, booking_id: uuid.UUID, pay_in: BookingPay, current_user: UserModel) -> Booking:
         """Mark a CONFIRMED or TENTATIVE booking as PAID, recording date and payment method."""
-        booking = await self.booking_repo.get_by_id(booking_id)
-        if not booking:
-            raise NotFoundException("Reserva no encontrada")
-        await self._check_booking_access(booking, current_user)
-        if booking.status not in (BookingStatus.CONFIRMED, BookingStatus.TENTATIVE):
-            raise BadRequestException("Solo se pueden marcar como pagadas reservas Confirmadas o Tentativas")
-
-        booking.status = BookingStatus.PAID
-        booking.paid_at = pay_in.paid_at
-        booking.payment_method = pay_in.payment_method
-        if pay_in.paid_amount is not None:
-            booking.paid_amount = pay_in.paid_amount
-        await self.db.flush()
-        await self.db.refresh(booking)
-        return booking
+        return await self._transition(booking_id, current_user, PAY_RULE, **self._pay_values(pay_in))
 
     async def revert_payment(self, booking_id: uuid.UUID, current_user: UserModel) -> Booking:
         """Revert a PAID booking back to CONFIRMED, clearing all payment fields."""
-        booking = await self.booking_repo.get_by_id(booking_id)
-        if not booking:
-            raise NotFoundException("Reserva no encontrada")
-        await self._check_booking_access(booking, current_user)
-        if booking.status != BookingStatus.PAID:
-            raise BadRequestException("Solo se puede revertir el pago de reservas en estado Pagado")
-
-        booking.status = BookingStatus.CONFIRMED
-        booking.paid_at = None
-        booking.payment_method = None
-        booking.paid_amount = None
-        await self.db.flush()
-        await self.db.refresh(booking)
-        return booking
+        return await self._transition(
+            booking_id, current_user, REVERT_PAYMENT_RULE,
+            status=BookingStatus.CONFIRMED, paid_at=None, payment_method=None, paid_amount=None,
+        )
 
     async def delete_booking(self, booking_id: uuid.UUID, current_user: UserModel) -> None:
         """Permanently delete a booking. Only allowed if status is CANCELLED."""
-        booking = await self.booking_repo.get_by_id(booking_id)
-        if not booking:
-            raise NotFoundException("Reserva no encontrada")
-        await self._check_booking_access(booking, current_user)
-        if booking.status != BookingStatus.CANCELLED:
-            raise BadRequestException("Solo se pueden eliminar reservas canceladas")
-        await self.booking_repo.hard_delete(booking_id)
+        manager_id = self._manager_scope(current_user)
+        rows = await self.booking_repo.delete_in_status([booking_id], DELETE_RULE[0], manager_id)
+        row = rows[0] if rows else None
+        self._check_transition(row, manager_id, DELETE_RULE[1])
+        pricing_cache.invalidate(self.db, row.property_id)
+
+    # ---------- Bulk operations ----------
+
+    def _bulk_results(self, booking_ids: list[uuid.UUID], rows: list, manager_id, wrong_state_message: str):
+        """Per-id results in request order, with the same errors as the single-item operations."""
+        by_id = {row.target_id: row for row in rows}
+        results, done = [], []
+        for booking_id in booking_ids:
+            row = by_id.get(booking_id)
+            try:
+                self._check_transition(row, manager_id, wrong_state_message)
+            except APIException as exc:
+                results.append({"id": booking_id, "success": False, "status_code": exc.status_code, "detail": exc.message})
+                continue
+            done.append(row)
+            results.append({"id": booking_id, "success": True, "status_code": 200, "detail": None})
+        return results, done
+
+    async def bulk_transition(
+        self, booking_ids: list[uuid.UUID], current_user: UserModel, rule: tuple, **values
+    ) -> dict:
+        """
+        Applies a status transition to many bookings with one conditional UPDATE, which is
+        also the single authorization query. Ids failing a rule are reported, not raised.
+        """
+        booking_ids = list(dict.fromkeys(booking_ids))
+        manager_id = self._manager_scope(current_user)
+        rows = await self.booking_repo.transition(booking_ids, rule[0], values, manager_id)
+        results, done = self._bulk_results(booking_ids, rows, manager_id, rule[1])
+        bookings = [self.booking_repo.to_booking(row) for row in done]
+        await self._bookings_changed(bookings)
+        statuses = {booking.id: booking.status for booking in bookings}
+        for result in results:
+            result["status"] = statuses.get(result["id"])
+        return self._bulk_summary(results)
+
+    async def bulk_accept(self, booking_ids: list[uuid.UUID], current_user: UserModel) -> dict:
+        return await self.bulk_transition(booking_ids, current_user, ACCEPT_RULE, status=BookingStatus.CONFIRMED)
+
+    async def bulk_cancel(self, booking_ids: list[uuid.UUID], current_user: UserModel) -> dict:
+        return await self.bulk_transition(booking_ids, current_user, CANCEL_RULE, status=BookingStatus.CANCELLED)
+
+    async def bulk_mark_as_paid(self, booking_ids: list[uuid.UUID], pay_in: BookingPay, current_user: UserModel) -> dict:
+        return await self.bulk_transition(booking_ids, current_user, PAY_RULE, **self._pay_values(pay_in))
+
+    async def bulk_delete(self, booking_ids: list[uuid.UUID], current_user: UserModel) -> dict:
+        booking_ids = list(dict.fromkeys(booking_ids))
+        manager_id = self._manager_scope(current_user)
+        rows = await self.booking_repo.delete_in_status(booking_ids, DELETE_RULE[0], manager_id)
+        results, done = self._bulk_results(booking_ids, rows, manager_id, DELETE_RULE[1])
+        for property_id in {row.property_id for row in done}:
+            pricing_cache.invalidate(self.db, property_id)
+        for result in results:
+            result["status"] = None
+        return self._bulk_summary(results)
+
+    @staticmethod
+    def _bulk_summary(results: list[dict]) -> dict:
+        succeeded = sum(1 for result in results if result["success"])
+        return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
@@ -0,0 +1,155 @@
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from icalendar import Calendar, Event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.enums import BookingStatus
+from core.security import create_calendar_feed_token, verify_calendar_feed_token
+from exceptions.general import NotFoundException
+from models.user import User as UserModel
+from repositories.calendar_feed_repository import CalendarFeedRepository
+
+FEED_MEDIA_TYPE = "text/calendar; charset=utf-8"
+
+
+@dataclass
+class CalendarFeed:
+    etag: str
+    last_modified: datetime
+    body: Optional[bytes]  # None when the client's copy is still current (304)
+
+
+class FeedCache:
+    """Per-process LRU of serialized feeds keyed by (property_id, version); old versions age out."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[uuid.UUID, int], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[uuid.UUID, int]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: tuple[uuid.UUID, int], body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+feed_cache = FeedCache(settings.CALENDAR_FEED_CACHE_MAX_ENTRIES)
+
+
+class CalendarFeedService:
+    """
+    Public iCal export feed of a property's non-cancelled bookings, polled by OTAs.
+    The URL is authenticated by an HMAC token instead of a session. Every booking change
+    bumps the property's feed version (BookingService), so a poll is one primary key
+    lookup: 304 if the client's ETag / Last-Modified is current, otherwise the cached
+    bytes of that version, serializing the bookings only on the first poll after a change.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.feed_repo = CalendarFeedRepository(db)
+
+    async def get_feed_token(self, property_id: uuid.UUID, current_user: UserModel) -> str:
+        """Token of the feed URL; only users who can access the property may read it."""
+        from services.property_service import PropertyService
+        await PropertyService(self.db).get_property(property_id, current_user)
+        return create_calendar_feed_token(property_id)
+
+    async def get_feed(
+        self,
+        property_id: uuid.UUID,
+        token: str,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
+    ) -> CalendarFeed:
+        if not verify_calendar_feed_token(property_id, token):
+            raise NotFoundException("Calendario no encontrado")
+        state = await self.feed_repo.get_state(property_id)
+        if not state:
+            raise NotFoundException("Calendario no encontrado")
+
+        version = state.version or 0
+        etag = f'"{version}"'
+        last_modified = self._last_modified(state.updated_at or state.created_at, state.now)
+
+        if self._not_modified(etag, last_modified, if_none_match, if_modified_since):
+            return CalendarFeed(etag=etag, last_modified=last_modified, body=None)
+
+        body = feed_cache.get((property_id, version))
+        if body is None:
+            body = self._serialize(state.name, await self.feed_repo.get_feed_bookings(property_id))
+            feed_cache.set((property_id, version), body)
+        return CalendarFeed(etag=etag, last_modified=last_modified, body=body)
+
+    @staticmethod
+    def _last_modified(changed_at: datetime, now: datetime) -> datetime:
+        """
+        Last-Modified of the feed. HTTP dates have one-second resolution, so while the
+        second of the last change is still running a later change could share it and
+        be hidden from If-Modified-Since; until that second is over the previous one
+        is sent instead, which makes the next conditional poll fetch the feed again.
+        """
+        last_modified = changed_at.replace(microsecond=0)
+        if now.replace(microsecond=0) <= last_modified:
+            last_modified -= timedelta(seconds=1)
+        return last_modified
+
+    @staticmethod
+    def _not_modified(
+        etag: str, last_modified: datetime, if_none_match: Optional[str], if_modified_since: Optional[str]
+    ) -> bool:
+        """RFC 9110 conditional GET: If-None-Match (weak comparison) takes precedence over If-Modified-Since."""
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return last_modified <= since
+        return False
+
+    @staticmethod
+    def _serialize(property_name: str, bookings: list) -> bytes:
+        cal = Calendar()
+        cal.add("prodid", "-//Domu//Reservas//ES")
+        cal.add("version", "2.0")
+        cal.add("calscale", "GREGORIAN")
+        cal.add("method", "PUBLISH")
+        cal.add("x-wr-calname", property_name)
+        for booking in bookings:
+            event = Event()
+            event.add("uid", booking.ical_uid)
+            event.add("dtstamp", booking.updated_at or booking.created_at or datetime.now(timezone.utc))
+            # DATE values: check-out is the exclusive DTEND, as in the bookings table
+            event.add("dtstart", booking.check_in)
+            event.add("dtend", booking.check_out)
+            event.add("summary", booking.summary)
+            if booking.description:
+                event.add("description", booking.description)
+            event.add("status", "TENTATIVE" if booking.status == BookingStatus.TENTATIVE else "CONFIRMED")
+            cal.add_component(event)
+        return cal.to_ical()
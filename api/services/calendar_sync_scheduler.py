@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from repositories.calendar_source_repository import CalendarSourceRepository
+from services.calendar_sync_service import CalendarSyncService
+
+logger = logging.getLogger(__name__)
+
+# How often the dispatcher reloads the list of registered feeds
+SOURCE_REFRESH_SECONDS = 60
+# Longest the dispatcher sleeps, so feeds rescheduled by workers are picked up promptly
+DISPATCH_TICK_SECONDS = 1.0
+
+
+@dataclass
+class FeedState:
+    source_id: uuid.UUID
+    property_id: uuid.UUID
+    next_poll: float  # time.monotonic() deadline
+    fresh_since: float  # monotonic time of the last successful poll (or of discovery)
+    failures: int = 0
+    queued: bool = False
+    polls: int = 0
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class CalendarSyncScheduler:
+    """
+    Background poller of every registered external iCal feed. A dispatcher queues the
+    feeds that are due and a bounded pool of workers syncs them concurrently over one
+    shared, connection-pooled httpx client (conditional GETs, so unchanged feeds are a
+    304). Each feed is rescheduled on its own jittered interval, so polls of hundreds of
+    feeds spread out instead of firing together; failures back off exponentially.
+    A worker holds a database connection only while it loads the source and while it
+    writes the result, never during the HTTP fetch.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        http: Optional[httpx.AsyncClient] = None,
+        interval: float = settings.CALENDAR_SYNC_INTERVAL_SECONDS,
+        workers: int = settings.CALENDAR_SYNC_WORKERS,
+        jitter: float = settings.CALENDAR_SYNC_JITTER,
+        retry: float = settings.CALENDAR_SYNC_RETRY_SECONDS,
+        max_backoff: float = settings.CALENDAR_SYNC_MAX_BACKOFF_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.http = http
+        self.interval = interval
+        self.workers = workers
+        self.jitter = jitter
+        self.retry = retry
+        self.max_backoff = max_backoff
+        self.feeds: dict[uuid.UUID, FeedState] = {}
+        self._owns_http = http is None
+        self._loaded = False
+        self._queue: asyncio.Queue[uuid.UUID] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    # ---------- Lifecycle ----------
+
+    async def start(self) -> None:
+        if self.http is None:
+            from dependencies.http_client import create_http_client
+            self.http = create_http_client(settings.CALENDAR_SYNC_MAX_CONNECTIONS)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._dispatcher()))
+        logger.info(f"[CalendarSync] scheduler started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._owns_http and self.http is not None:
+            await self.http.aclose()
+            self.http = None
+
+    # ---------- Scheduling ----------
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _backoff(self, failures: int) -> float:
+        return self._jittered(min(self.max_backoff, self.retry * 2 ** (failures - 1)))
+
+    async def refresh_sources(self) -> None:
+        """
+        Picks up added and removed sources. On the first load the feeds' first polls are
+        spread over one interval; feeds added later are polled right away (within the jitter).
+        """
+        async with self.session_factory() as db:
+            rows = await CalendarSourceRepository(db).get_all_for_polling()
+        now = time.monotonic()
+        current = {row.id: row.property_id for row in rows}
+        for source_id in set(self.feeds) - set(current):
+            del self.feeds[source_id]
+        spread = self.interval if not self._loaded else self.interval * self.jitter
+        for source_id, property_id in current.items():
+            if source_id not in self.feeds:
+                self.feeds[source_id] = FeedState(
+                    source_id=source_id,
+                    property_id=property_id,
+                    next_poll=now + random.uniform(0, spread),
+                    fresh_since=now,
+                )
+        self._loaded = True
+
+    def _enqueue_due(self) -> float:
+        """Queues the due feeds; returns the seconds until the next one is due."""
+        now = time.monotonic()
+        wait = self.interval
+        for state in self.feeds.values():
+            if state.queued:
+                continue
+            if state.next_poll <= now:
+                state.queued = True
+                self._queue.put_nowait(state.source_id)
+            else:
+                wait = min(wait, state.next_poll - now)
+        return wait
+
+    async def _dispatcher(self) -> None:
+        next_refresh = 0.0
+        while True:
+            try:
+                if time.monotonic() >= next_refresh:
+                    await self.refresh_sources()
+                    next_refresh = time.monotonic() + SOURCE_REFRESH_SECONDS
+                wait = self._enqueue_due()
+            except Exception:
+                logger.exception("[CalendarSync] dispatcher error")
+                wait = self.retry
+            await asyncio.sleep(max(0.05, min(wait, next_refresh - time.monotonic(), DISPATCH_TICK_SECONDS)))
+
+    async def _worker(self) -> None:
+        while True:
+            source_id = await self._queue.get()
+            try:
+                state = self.feeds.get(source_id)
+                if state is not None:
+                    await self.poll(state)
+            finally:
+                self._queue.task_done()
+
+    async def poll_due(self) -> None:
+        """Refreshes the sources and polls every due feed with the worker pool, then returns."""
+        await self.refresh_sources()
+        due = [state for state in self.feeds.values() if state.next_poll <= time.monotonic()]
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def run(state: FeedState) -> None:
+            async with semaphore:
+                await self.poll(state)
+
+        await asyncio.gather(*(run(state) for state in due))
+
+    async def poll(self, state: FeedState) -> None:
+        """Syncs one feed and reschedules it: the regular interval after a success, backoff after a failure."""
+        started = time.monotonic()
+        error = None
+        try:
+            async with self.session_factory() as db:
+                service = CalendarSyncService(db, self.http)
+                calendar_source = await service.source_repo.get_by_id(state.source_id)
+                # Ends the read transaction so the connection goes back to the pool during the fetch
+                await db.commit()
+                if calendar_source is None:
+                    self.feeds.pop(state.source_id, None)
+                    return
+                fetched = await service.fetch(calendar_source)
+                try:
+                    result = await service.apply_fetch(calendar_source, fetched)
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+            error = result.get("error")
+        except Exception as exc:
+            logger.exception(f"[CalendarSync] source {state.source_id} failed")
+            error = str(exc) or exc.__class__.__name__
+            await self._record_error(state, error)
+
+        finished = time.monotonic()
+        state.polls += 1
+        state.queued = False
+        state.last_duration = finished - started
+        state.last_error = error
+        if error is None:
+            state.failures = 0
+            state.fresh_since = started
+            state.next_poll = finished + self._jittered(self.interval)
+        else:
+            state.failures += 1
+            state.next_poll = finished + self._backoff(state.failures)
+
+    async def _record_error(self, state: FeedState, error: str) -> None:
+        """
+        Stores an unexpected poll failure on the source in its own transaction (the poll's
+        was rolled back), as sync_source does for fetch errors, so the API shows it too.
+        """
+        try:
+            async with self.session_factory() as db:
+                await CalendarSourceRepository(db).mark_synced(state.source_id, None, None, error=error)
+                await db.commit()
+        except Exception:
+            logger.exception(f"[CalendarSync] could not record the failure of source {state.source_id}")
+
+    # ---------- Metrics ----------
+
+    def metrics(self) -> list[dict]:
+        """
+        Per-feed freshness: lag_seconds is the age of the data from the last successful
+        poll (or since the feed was discovered if none succeeded yet).
+        """
+        now = time.monotonic()
+        return [
+            {
+                "source_id": state.source_id,
+                "property_id": state.property_id,
+                "lag_seconds": round(now - state.fresh_since, 3),
+                "next_poll_in_seconds": round(max(0.0, state.next_poll - now), 3),
+                "failures": state.failures,
+                "polls": state.polls,
+                "last_duration_seconds": None if state.last_duration is None else round(state.last_duration, 3),
+                "last_error": state.last_error,
+            }
+            for state in sorted(self.feeds.values(), key=lambda s: s.fresh_since)
+        ]
@@ -0,0 +1,348 @@
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import AsyncIterator, Optional
+
+import httpx
+from icalendar import Event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.enums import BookingStatus
+from exceptions.general import ConflictException, NotFoundException
+from models.calendar_source import CalendarSource
+from models.user import User as UserModel
+from repositories.booking_night_repository import BookingNightRepository
+from repositories.booking_repository import BookingRepository
+from repositories.calendar_feed_repository import CalendarFeedRepository
+from repositories.calendar_source_repository import CalendarSourceRepository
+from repositories.financial_snapshot_repository import FinancialSnapshotRepository
+from schemas.calendar_source import CalendarSourceCreate
+from services.booking_night_service import BookingNightService
+from services.booking_service import generate_ical_uid
+from services.pricing_cache import pricing_cache
+
+OVERLAP_ERROR = "Conflicto de fechas con una reserva existente"
+
+
+@dataclass
+class FeedEvent:
+    uid: str
+    check_in: date
+    check_out: date
+    summary: Optional[str]
+    description: Optional[str]
+    status: BookingStatus
+
+
+@dataclass
+class FeedFetch:
+    """Result of one conditional GET of a feed."""
+    events: list[FeedEvent] = field(default_factory=list)
+    not_modified: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+
+
+class CalendarSyncService:
+    """
+    Incremental sync of external iCal feeds (Airbnb, Booking.com) into bookings. The
+    feed is fetched conditionally (ETag / Last-Modified) and parsed one VEVENT at a
+    time while it streams in. Events are diffed against the property's bookings by
+    external_id (the event UID) and only the differences are written, in bulk:
+    cancellations, then updates, then inserts. Events echoing our own export feed
+    (UID equal to one of our ical_uid) are ignored.
+    """
+
+    def __init__(self, db: AsyncSession, http: httpx.AsyncClient | None = None):
+        self.db = db
+        self.http = http
+        self.source_repo = CalendarSourceRepository(db)
+        self.booking_repo = BookingRepository(db)
+        self.night_repo = BookingNightRepository(db)
+        self.snapshot_repo = FinancialSnapshotRepository(db)
+        self.feed_repo = CalendarFeedRepository(db)
+        self.booking_nights = BookingNightService(db)
+
+    async def _check_property_access(self, property_id: uuid.UUID, current_user: UserModel) -> None:
+        from services.property_service import PropertyService
+        await PropertyService(self.db).get_property(property_id, current_user)
+
+    async def _get_source(self, property_id: uuid.UUID, source_id: uuid.UUID, current_user: UserModel) -> CalendarSource:
+        await self._check_property_access(property_id, current_user)
+        calendar_source = await self.source_repo.get_by_id(source_id)
+        if not calendar_source or calendar_source.property_id != property_id:
+            raise NotFoundException("Calendario externo no encontrado")
+        return calendar_source
+
+    async def add_source(
+        self, property_id: uuid.UUID, source_in: CalendarSourceCreate, current_user: UserModel
+    ) -> CalendarSource:
+        await self._check_property_access(property_id, current_user)
+        url = str(source_in.url)
+        if await self.source_repo.get_by_property_url(property_id, url):
+            raise ConflictException("El calendario externo ya está registrado para esta propiedad")
+        return await self.source_repo.create(property_id, url, source_in.source)
+
+    async def list_sources(self, property_id: uuid.UUID, current_user: UserModel) -> list[CalendarSource]:
+        await self._check_property_access(property_id, current_user)
+        return await self.source_repo.get_by_property(property_id)
+
+    async def delete_source(self, property_id: uuid.UUID, source_id: uuid.UUID, current_user: UserModel) -> None:
+        """Unregisters the feed; bookings already synced from it are kept."""
+        calendar_source = await self._get_source(property_id, source_id, current_user)
+        await self.source_repo.delete(calendar_source.id)
+
+    async def sync(self, property_id: uuid.UUID, source_id: uuid.UUID, current_user: UserModel) -> dict:
+        return await self.sync_source(await self._get_source(property_id, source_id, current_user))
+
+    async def sync_source(self, calendar_source: CalendarSource) -> dict:
+        """
+        Polls one feed and applies its changes. Fetch and parse failures are recorded on
+        the source and returned in "error" rather than raised, so they are persisted.
+        """
+        return await self.apply_fetch(calendar_source, await self.fetch(calendar_source))
+
+    async def fetch(self, calendar_source: CalendarSource) -> FeedFetch:
+        """Conditional GET of the feed; touches no database, so callers may run it outside a session."""
+        headers = {}
+        if calendar_source.etag:
+            headers["If-None-Match"] = calendar_source.etag
+        if calendar_source.last_modified:
+            headers["If-Modified-Since"] = calendar_source.last_modified
+
+        try:
+            async with self.http.stream("GET", calendar_source.url, headers=headers) as response:
+                if response.status_code == 304:
+                    return FeedFetch(
+                        not_modified=True, etag=calendar_source.etag, last_modified=calendar_source.last_modified
+                    )
+                response.raise_for_status()
+                events = await self._parse(response.aiter_lines())
+                return FeedFetch(
+                    events=events, etag=response.headers.get("etag"), last_modified=response.headers.get("last-modified")
+                )
+        except httpx.HTTPError as exc:
+            return FeedFetch(error=f"Error al descargar el calendario: {exc}")
+        except ValueError as exc:
+            return FeedFetch(error=f"Calendario inválido: {exc}")
+
+    async def apply_fetch(self, calendar_source: CalendarSource, fetched: FeedFetch) -> dict:
+        """Writes the outcome of fetch(): the booking changes and the source's sync state."""
+        if fetched.error:
+            await self.source_repo.mark_synced(calendar_source.id, None, None, error=fetched.error)
+            return {"error": fetched.error}
+        if fetched.not_modified:
+            await self.source_repo.mark_synced(calendar_source.id, fetched.etag, fetched.last_modified)
+            return {"not_modified": True}
+        result = await self._apply(calendar_source, fetched.events)
+        await self.source_repo.mark_synced(calendar_source.id, fetched.etag, fetched.last_modified)
+        return result
+
+    @classmethod
+    async def _parse(cls, lines: AsyncIterator[str]) -> list[FeedEvent]:
+        """
+        Parses the VEVENTs of a streamed feed one block at a time, so only the current
+        event is held as text. A repeated UID keeps its last occurrence.
+        """
+        events: dict[str, FeedEvent] = {}
+        block: list[str] | None = None
+        size = 0
+        async for line in lines:
+            size += len(line) + 2
+            if size > settings.ICAL_SYNC_MAX_BYTES:
+                raise ValueError(f"supera {settings.ICAL_SYNC_MAX_BYTES} bytes")
+            marker = line.strip().upper()
+            if block is None:
+                if marker == "BEGIN:VEVENT":
+                    block = [line]
+                continue
+            block.append(line)
+            if marker == "END:VEVENT":
+                event = cls._to_event(Event.from_ical("\r\n".join(block)))
+                block = None
+                if event:
+                    events[event.uid] = event
+        return list(events.values())
+
+    @staticmethod
+    def _as_date(value) -> date:
+        return value.date() if isinstance(value, datetime) else value
+
+    @classmethod
+    def _to_event(cls, component) -> FeedEvent | None:
+        """Booking fields of a VEVENT; events without UID / DTSTART or with an empty stay are skipped."""
+        uid = str(component.get("uid") or "").strip()
+        dtstart = component.get("dtstart")
+        if not uid or dtstart is None:
+            return None
+        check_in = cls._as_date(dtstart.dt)
+        if component.get("dtend") is not None:
+            check_out = cls._as_date(component.get("dtend").dt)
+        elif component.get("duration") is not None:
+            check_out = check_in + timedelta(days=component.get("duration").dt.days)
+        else:
+            check_out = check_in + timedelta(days=1)
+        if check_out <= check_in:
+            return None
+
+        status = str(component.get("status") or "").upper()
+        return FeedEvent(
+            uid=uid,
+            check_in=check_in,
+            check_out=check_out,
+            summary=str(component.get("summary") or "").strip() or None,
+            description=str(component.get("description") or "").strip() or None,
+            status={"CANCELLED": BookingStatus.CANCELLED, "TENTATIVE": BookingStatus.TENTATIVE}.get(
+                status, BookingStatus.CONFIRMED
+            ),
+        )
+
+    async def _apply(self, calendar_source: CalendarSource, events: list[FeedEvent]) -> dict:
+        property_id, url = calendar_source.property_id, calendar_source.url
+        now = datetime.now(timezone.utc)
+        existing = await self.booking_repo.get_for_sync(property_id, url, [event.uid for event in events])
+        own_uids = {booking.ical_uid for booking in existing}
+        by_external_id = {booking.external_id: booking for booking in existing if booking.external_id}
+
+        inserts: list[dict] = []
+        updates: list[dict] = []
+        cancelled: list = []
+        seen: set[uuid.UUID] = set()
+        unchanged = 0
+        default_summary = f"Reserva {calendar_source.source.value.title()}"
+
+        for event in events:
+            if event.uid in own_uids:
+                continue
+            booking = by_external_id.get(event.uid)
+            if booking is not None:
+                seen.add(booking.id)
+            if event.status == BookingStatus.CANCELLED:
+                if booking is not None and booking.status != BookingStatus.CANCELLED:
+                    cancelled.append(booking)
+                continue
+
+            summary = event.summary or default_summary
+            if booking is None:
+                booking_id = uuid.uuid4()
+                inserts.append({
+                    "id": booking_id,
+                    "ical_uid": generate_ical_uid(booking_id),
+                    "property_id": property_id,
+                    "check_in": event.check_in,
+                    "check_out": event.check_out,
+                    "summary": summary,
+                    "description": event.description,
+                    "status": event.status,
+                    "source": calendar_source.source,
+                    "external_id": event.uid,
+                    "ical_url": url,
+                    "last_synced_at": now,
+                })
+                continue
+
+            # Local workflow states (accepted, paid) win over the feed; a cancelled booking is revived
+            status = event.status if booking.status == BookingStatus.CANCELLED else booking.status
+            changed = (
+                booking.check_in != event.check_in
+                or booking.check_out != event.check_out
+                or booking.summary != summary
+                or booking.description != event.description
+                or booking.status != status
+                or booking.ical_url != url
+            )
+            if not changed:
+                unchanged += 1
+                continue
+            updates.append({
+                "id": booking.id,
+                "check_in": event.check_in,
+                "check_out": event.check_out,
+                "summary": summary,
+                "description": event.description,
+                "status": status,
+                "ical_url": url,
+                "last_synced_at": now,
+            })
+
+        # Stays that left the feed were cancelled at the OTA; past stays drop out of
+        # feeds on their own and are kept
+        today = date.today()
+        cancelled.extend(
+            booking for booking in existing
+            if booking.ical_url == url
+            and booking.id not in seen
+            and booking.status != BookingStatus.CANCELLED
+            and booking.check_out > today
+        )
+
+        await self.booking_repo.cancel_many([booking.id for booking in cancelled], last_synced_at=now)
+        updated, conflicts = await self._update(updates, existing)
+        inserted = await self.booking_repo.insert_many(inserts)
+        inserted_ids = {row.id for row in inserted}
+        conflicts.extend(
+            {"uid": row["external_id"], "error": OVERLAP_ERROR} for row in inserts if row["id"] not in inserted_ids
+        )
+
+        await self._bookings_changed(property_id, inserted, updated, cancelled, existing)
+        return {
+            "inserted": len(inserted),
+            "updated": len(updated),
+            "cancelled": len(cancelled),
+            "unchanged": unchanged,
+            "conflicts": conflicts,
+        }
+
+    async def _update(self, updates: list[dict], existing: list) -> tuple[list[dict], list[dict]]:
+        """
+        Applies the updates in one bulk statement; if a moved stay hits excl_bookings_no_overlap,
+        falls back to one savepoint per row so only the overlapping rows are skipped.
+        """
+        if not updates:
+            return [], []
+        try:
+            async with self.db.begin_nested():
+                await self.booking_repo.update_many(updates)
+            return updates, []
+        except IntegrityError as exc:
+            if "excl_bookings_no_overlap" not in str(exc.orig):
+                raise
+
+        external_ids = {booking.id: booking.external_id for booking in existing}
+        updated, conflicts = [], []
+        for row in updates:
+            try:
+                async with self.db.begin_nested():
+                    await self.booking_repo.update_many([row])
+                updated.append(row)
+            except IntegrityError as exc:
+                if "excl_bookings_no_overlap" not in str(exc.orig):
+                    raise
+                conflicts.append({"uid": external_ids[row["id"]], "error": OVERLAP_ERROR})
+        return updated, conflicts
+
+    async def _bookings_changed(
+        self, property_id: uuid.UUID, inserted: list, updated: list[dict], cancelled: list, existing: list
+    ) -> None:
+        """Same hooks as BookingService._booking_changed, once for the whole sync."""
+        if not (inserted or updated or cancelled):
+            return
+        previous = {booking.id: booking for booking in existing}
+        since = min(
+            [row.check_in for row in inserted]
+            + [row["check_in"] for row in updated]
+            + [previous[row["id"]].check_in for row in updated]
+            + [booking.check_in for booking in cancelled]
+        )
+        pricing_cache.invalidate(self.db, property_id)
+        if cancelled:
+            await self.night_repo.delete_for_bookings([booking.id for booking in cancelled])
+        await self.booking_nights.write_many(
+            list(inserted) + [SimpleNamespace(property_id=property_id, **row) for row in updated]
+        )
+        await self.snapshot_repo.invalidate(property_id, since)
+        await self.feed_repo.bump([property_id])
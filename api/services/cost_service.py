@@ -10,6 +10,7 @@ from repositories.booking_repository import BookingRepository
 from repositories.cost_repository import CostRepository
 from repositories.property_repository import PropertyRepository
 from schemas.property_cost import PropertyCostCreate, PropertyCostFinalize, PropertyCostModify, PropertyCostUpdate
+from services.daily_price_service import DailyPriceService
 
 
 class CostService:
@@ -18,6 +19,7 @@ class CostService:
         self.cost_repo = CostRepository(db)
         self.property_repo = PropertyRepository(db)
         self.booking_repo = BookingRepository(db)
+        self.daily_prices = DailyPriceService(db)
 
     async def create_cost(self, property_id: uuid.UUID, cost_in: PropertyCostCreate) -> PropertyCost:
         """Create a new property cost."""
@@ -28,7 +30,9 @@ class CostService:
         if cost_in.calculation_type == CostCalculationType.PERCENTAGE and cost_in.value > 100:
             raise BadRequestException("El porcentaje no puede ser mayor al 100%")
 
-        return await self.cost_repo.create(property_id, cost_in)
+        cost = await self.cost_repo.create(property_id, cost_in)
+        await self.daily_prices.refresh(property_id)
+        return cost
 
     async def list_costs(self, property_id: uuid.UUID) -> list[PropertyCost]:
         """List current active versions of costs for a property."""
@@ -43,6 +47,7 @@ class CostService:
         updated = await self.cost_repo.update(cost_id, cost_in)
         if not updated:
             raise NotFoundException("Costo no encontrado")
+        await self.daily_prices.refresh(updated.property_id, updated.start_date, updated.end_date)
         return updated
 
     async def delete_cost(self, cost_id: uuid.UUID) -> PropertyCost:
@@ -50,6 +55,7 @@ class CostService:
         deleted = await self.cost_repo.delete(cost_id)
         if not deleted:
             raise NotFoundException("Costo no encontrado")
+        await self.daily_prices.refresh(deleted.property_id, deleted.start_date, deleted.end_date)
         return deleted
 
     async def modify_cost(self, cost_id: uuid.UUID, modify_in: PropertyCostModify) -> PropertyCost:
@@ -76,7 +82,9 @@ class CostService:
                 "No se puede modificar el costo: el nuevo período incluye fechas de reservas pagadas"
             )
 
-        return await self.cost_repo.modify_cost_value(current, modify_in.value, modify_in.start_date)
+        new_version = await self.cost_repo.modify_cost_value(current, modify_in.value, modify_in.start_date)
+        await self.daily_prices.refresh(new_version.property_id, modify_in.start_date)
+        return new_version
 
     async def revert_cost(self, cost_id: uuid.UUID) -> PropertyCost:
         """
@@ -90,6 +98,7 @@ class CostService:
         if not restored:
             raise BadRequestException("Este costo no tiene modificaciones que revertir")
 
+        await self.daily_prices.refresh(restored.property_id, restored.start_date)
         return restored
 
     async def list_all_costs(self, property_id: uuid.UUID) -> list[PropertyCost]:
@@ -117,7 +126,9 @@ class CostService:
                 "No se puede finalizar el costo: existen reservas pagadas con fechas posteriores a la fecha de finalización"
             )
 
-        return await self.cost_repo.finalize_cost(current, finalize_in.end_date)
+        finalized = await self.cost_repo.finalize_cost(current, finalize_in.end_date)
+        await self.daily_prices.refresh(finalized.property_id, finalize_in.end_date + timedelta(days=1))
+        return finalized
 
     async def get_cost_history(self, cost_id: uuid.UUID) -> list[PropertyCost]:
         """Returns all historical versions of a cost concept, ordered chronologically."""
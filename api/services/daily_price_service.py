@@ -0,0 +1,184 @@
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.property_daily_price import PropertyDailyPrice
+from repositories.cost_repository import CostRepository
+from repositories.daily_price_repository import DailyPriceRepository
+from repositories.financial_snapshot_repository import FinancialSnapshotRepository
+from repositories.pricing_lock_repository import PricingLockRepository
+from repositories.pricing_rule_repository import PricingRuleRepository
+from repositories.property_base_price_repository import PropertyBasePriceRepository
+from repositories.property_repository import PropertyRepository
+from services.booking_night_service import BookingNightService
+from services.pricing_cache import pricing_cache
+from services.pricing_engine import DailyPriceEngine
+
+
+class DailyPriceService:
+    """
+    Maintains the property_daily_prices table: nightly prices are computed once with
+    DailyPriceEngine, stored, and served with a single range scan. Services that change
+    costs, base prices, rules or the property's pricing settings call refresh() for the
+    dates they touched. refresh() and every materialization hold the property's pricing
+    lock, so a read can never store nights computed from inputs a concurrent writer is
+    replacing.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.daily_price_repo = DailyPriceRepository(db)
+        self.property_repo = PropertyRepository(db)
+        self.cost_repo = CostRepository(db)
+        self.base_price_repo = PropertyBasePriceRepository(db)
+        self.pricing_repo = PricingRuleRepository(db)
+        self.booking_nights = BookingNightService(db)
+        self.snapshot_repo = FinancialSnapshotRepository(db)
+        self.lock_repo = PricingLockRepository(db)
+
+    async def load_engine(self, prop, start_date: date, end_date: date) -> DailyPriceEngine:
+        """Fetches costs, base prices and rules overlapping the range once and builds the price engine."""
+        all_costs = await self.cost_repo.get_costs_overlapping(prop.id, start_date, end_date)
+        all_base_prices = await self.base_price_repo.get_overlapping(prop.id, start_date, end_date)
+        rules = await self.pricing_repo.get_rules_overlapping(prop.id, start_date, end_date)
+        return DailyPriceEngine.build(prop, all_costs, all_base_prices, rules, start_date, end_date)
+
+    @staticmethod
+    def _rows(prop, engine: DailyPriceEngine, start_date: date, end_date: date) -> list[dict]:
+        return [
+            {
+                "property_id": prop.id,
+                "date": day,
+                "floor_price": piece.floor_price,
+                "price": piece.price,
+                "profitability_percent": piece.percent,
+                "rule_name": piece.rule_name,
+            }
+            for day, piece in engine.iter_days(start_date, end_date)
+        ]
+
+    @staticmethod
+    def _missing_hull(stored: set[date], start_date: date, end_date: date) -> tuple[date, date]:
+        """Smallest [start, end] covering every night of the range that is not in stored."""
+        missing_start = start_date
+        while missing_start in stored:
+            missing_start += timedelta(days=1)
+        missing_end = end_date
+        while missing_end in stored:
+            missing_end -= timedelta(days=1)
+        return missing_start, missing_end
+
+    async def _materialize(self, prop, start_date: date, end_date: date) -> None:
+        """
+        Computes and stores the nightly prices of [start_date, end_date]. The inputs are
+        (re)loaded under the pricing lock, after any concurrent change has committed.
+        """
+        await self.lock_repo.lock([prop.id])
+        if settings.PRICING_BACKEND == "sql":
+            await self.daily_price_repo.materialize_in_sql(prop.id, start_date, end_date)
+            return
+        await self.property_repo.reload([prop])
+        engine = await self.load_engine(prop, start_date, end_date)
+        await self.daily_price_repo.upsert_many(self._rows(prop, engine, start_date, end_date))
+
+    async def get_prices(self, prop, start_date: date, end_date: date) -> list[PropertyDailyPrice]:
+        """
+        Returns one row per night in [start_date, end_date]. Nights that were never
+        materialized are computed and stored on the way.
+        """
+        rows = await self.daily_price_repo.get_range(prop.id, start_date, end_date)
+        if len(rows) == (end_date - start_date).days + 1:
+            return rows
+
+        # Fill the hull of the missing nights in one pass; existing rows are rewritten unchanged
+        missing_start, missing_end = self._missing_hull({r.date for r in rows}, start_date, end_date)
+        await self._materialize(prop, missing_start, missing_end)
+        return await self.daily_price_repo.get_range(prop.id, start_date, end_date)
+
+    async def get_prices_for_properties(
+        self, props: list, start_date: date, end_date: date
+    ) -> dict[uuid.UUID, list[PropertyDailyPrice]]:
+        """
+        Same as get_prices for several properties, with a constant number of queries:
+        one range scan for all of them and, when some nights are missing, one query
+        per pricing input (costs, base prices, rules) for the incomplete properties
+        (or one INSERT ... SELECT per incomplete property with the SQL backend).
+        """
+        nights = (end_date - start_date).days + 1
+        by_property: dict[uuid.UUID, list[PropertyDailyPrice]] = {p.id: [] for p in props}
+        for row in await self.daily_price_repo.get_range_for_properties(list(by_property), start_date, end_date):
+            by_property[row.property_id].append(row)
+
+        incomplete = [p for p in props if len(by_property[p.id]) < nights]
+        if not incomplete:
+            return by_property
+
+        hulls = {
+            p.id: self._missing_hull({r.date for r in by_property[p.id]}, start_date, end_date)
+            for p in incomplete
+        }
+        ids = [p.id for p in incomplete]
+        await self.lock_repo.lock(ids)
+        if settings.PRICING_BACKEND == "sql":
+            for prop in incomplete:
+                await self.daily_price_repo.materialize_in_sql(prop.id, *hulls[prop.id])
+        else:
+            await self._materialize_many(incomplete, hulls)
+
+        for prop in incomplete:
+            by_property[prop.id] = []
+        for row in await self.daily_price_repo.get_range_for_properties(ids, start_date, end_date):
+            by_property[row.property_id].append(row)
+        return by_property
+
+    async def _materialize_many(self, props: list, hulls: dict[uuid.UUID, tuple[date, date]]) -> None:
+        """Computes and stores the given range of each property, loading pricing inputs for all of them at once."""
+        fetch_start = min(low for low, _ in hulls.values())
+        fetch_end = max(high for _, high in hulls.values())
+        ids = [p.id for p in props]
+        await self.property_repo.reload(props)
+
+        costs, base_prices, rules = defaultdict(list), defaultdict(list), defaultdict(list)
+        for cost in await self.cost_repo.get_costs_overlapping_for_properties(ids, fetch_start, fetch_end):
+            costs[cost.property_id].append(cost)
+        for base_price in await self.base_price_repo.get_overlapping_for_properties(ids, fetch_start, fetch_end):
+            base_prices[base_price.property_id].append(base_price)
+        for rule in await self.pricing_repo.get_rules_overlapping_for_properties(ids, fetch_start, fetch_end):
+            rules[rule.property_id].append(rule)
+
+        rows = []
+        for prop in props:
+            low, high = hulls[prop.id]
+            engine = DailyPriceEngine.build(
+                prop, costs[prop.id], base_prices[prop.id], rules[prop.id], low, high
+            )
+            rows.extend(self._rows(prop, engine, low, high))
+        await self.daily_price_repo.upsert_many(rows)
+
+    async def refresh(
+        self, property_id: uuid.UUID, range_start: date | None = None, range_end: date | None = None
+    ) -> None:
+        """
+        Rebuilds the materialized nights inside [range_start, range_end] (None = unbounded)
+        after a pricing input changed. Only nights that were already materialized are
+        recomputed (upserted in place); the rest are filled on demand by get_prices.
+        Also invalidates the cached calendars and quotes of the property, reprices
+        the booking_nights ledger of the bookings in the span and drops the financial
+        snapshots from range_start on (bookings checking in later can still be affected
+        through check-in costs, so the upper bound is not used). Must run in the
+        transaction that changed the input, which then holds the pricing lock until commit.
+        """
+        await self.lock_repo.lock([property_id])
+        pricing_cache.invalidate(self.db, property_id)
+        await self.booking_nights.rebuild(property_id, range_start, range_end)
+        await self.snapshot_repo.invalidate(property_id, range_start)
+        low, high = await self.daily_price_repo.get_materialized_bounds(property_id, range_start, range_end)
+        if low is None:
+            return
+
+        prop = await self.property_repo.get_by_id(property_id)
+        if prop:
+            await self._materialize(prop, low, high)
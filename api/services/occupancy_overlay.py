@@ -0,0 +1,30 @@
+from datetime import date
+from typing import Iterable, Optional
+
+from models.booking import Booking
+
+
+class OccupancyOverlay:
+    """
+    Day-indexed view of which booking occupies each night of [start, end].
+
+    Bookings are sorted by check_in once and their nights are written into a
+    slot per day, so building the overlay costs O(days + booked nights) instead
+    of scanning every booking for every day. When bookings overlap (only
+    possible without the exclusion constraint), the earliest check_in wins.
+    """
+
+    def __init__(self, bookings: Iterable[Booking], start: date, end: date):
+        self.start = start
+        self._slots: list[Optional[Booking]] = [None] * max((end - start).days + 1, 0)
+        for booking in sorted(bookings, key=lambda b: b.check_in):
+            first = max((booking.check_in - start).days, 0)
+            last = min((booking.check_out - start).days, len(self._slots))
+            for i in range(first, last):
+                if self._slots[i] is None:
+                    self._slots[i] = booking
+
+    def booking_on(self, day: date) -> Optional[Booking]:
+        """Returns the booking occupying the night of day, or None if it is free or outside the range."""
+        i = (day - self.start).days
+        return self._slots[i] if 0 <= i < len(self._slots) else None
@@ -0,0 +1,151 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.enums import UserRole
+from exceptions.general import BadRequestException, ForbiddenException, NotFoundException
+from models.property import Property
+from models.user import User as UserModel
+from repositories.property_repository import PropertyRepository
+from services.pricing_service import MAX_CALENDAR_DAYS, PricingService
+
+# Upper bounds for a single grid request (properties x nights)
+MAX_GRID_PROPERTIES = 100
+MAX_GRID_DAYS = 366
+
+
+class PortfolioService:
+    """Views that span several properties at once, loaded with set-based queries."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.property_repo = PropertyRepository(db)
+        self.pricing = PricingService(db)
+
+    def _is_admin(self, user: UserModel) -> bool:
+        return user.role == UserRole.ADMIN
+
+    async def resolve_properties(
+        self, property_ids: list[uuid.UUID] | None, current_user: UserModel
+    ) -> list[Property]:
+        """
+        Loads the requested properties in one query, checking access. Without ids,
+        returns the properties managed by the current user.
+        """
+        if not property_ids:
+            return await self.property_repo.get_by_manager(current_user.id)
+
+        property_ids = list(dict.fromkeys(property_ids))
+        if len(property_ids) > MAX_GRID_PROPERTIES:
+            raise BadRequestException(f"No se pueden consultar más de {MAX_GRID_PROPERTIES} propiedades")
+
+        props = {p.id: p for p in await self.property_repo.get_by_ids(property_ids)}
+        if len(props) < len(property_ids):
+            raise NotFoundException("Propiedad no encontrada")
+        if not self._is_admin(current_user) and any(p.manager_id != current_user.id for p in props.values()):
+            raise ForbiddenException("No tienes permiso para acceder a esta propiedad")
+        return [props[pid] for pid in property_ids]
+
+    async def get_calendar_grid(
+        self,
+        property_ids: list[uuid.UUID] | None,
+        start_date: date,
+        end_date: date,
+        current_user: UserModel,
+    ) -> list[dict]:
+        """Price and availability of many properties over [start_date, end_date], one row per property."""
+        if end_date < start_date:
+            raise BadRequestException("Fecha fin debe ser posterior a inicio")
+        if (end_date - start_date).days + 1 > MAX_GRID_DAYS:
+            raise BadRequestException(f"El rango no puede superar {MAX_GRID_DAYS} días")
+
+        props = await self.resolve_properties(property_ids, current_user)
+        calendars = await self.pricing.get_calendars(props, start_date, end_date)
+        return [
+            {
+                "property_id": prop.id,
+                "property_name": prop.name,
+                "days": calendars[prop.id],
+            }
+            for prop in props
+        ]
+
+    async def get_financial_rollup(self, year: int, month: int, scope: str, current_user: UserModel) -> dict:
+        """
+        Monthly financial summary of every property the user manages (scope="managed")
+        or owns (scope="owned"): one row per property plus portfolio totals.
+        """
+        if scope == "owned":
+            props = await self.property_repo.get_by_owner(current_user.id)
+        else:
+            props = await self.property_repo.get_by_manager(current_user.id)
+
+        summaries = await self.pricing.get_financial_summaries(props, year, month) if props else {}
+        rows = [
+            {"property_id": prop.id, "property_name": prop.name, **summaries[prop.id]}
+            for prop in props
+        ]
+
+        # Totals add up the rounded per-property figures so they match the rows shown
+        cost_keys = ("fixed_monthly", "fixed_daily", "variable_per_reservation", "commissions", "total")
+        total_income = sum((r["total_income"] for r in rows), Decimal(0))
+        net_profit = sum((r["net_profit"] for r in rows), Decimal(0))
+        available_days = sum(r["days_in_month"] for r in rows)
+        occupied_days = sum(r["occupied_days"] for r in rows)
+        totals = {
+            "properties": len(rows),
+            "available_days": available_days,
+            "occupied_days": occupied_days,
+            "occupancy_rate": round(occupied_days / available_days * 100, 2) if available_days else 0,
+            "total_bookings": sum(r["total_bookings"] for r in rows),
+            "total_income": total_income,
+            "costs": {key: sum((r["costs"][key] for r in rows), Decimal(0)) for key in cost_keys},
+            "net_profit": net_profit,
+            "profit_margin_percent": round(
+                (net_profit / total_income * 100) if total_income > 0 else 0, 2
+            ),
+        }
+        return {"year": year, "month": month, "scope": scope, "totals": totals, "properties": rows}
+
+    async def search_availability(
+        self,
+        check_in: date,
+        check_out: date,
+        property_ids: list[uuid.UUID] | None,
+        current_user: UserModel,
+    ) -> list[dict]:
+        """
+        Properties (the requested ones, or the user's managed ones) free for the whole
+        stay, each with its quoted total. Only the free properties are priced.
+        """
+        if check_in >= check_out:
+            raise BadRequestException("check_out debe ser posterior a check_in")
+        if (check_out - check_in).days > MAX_CALENDAR_DAYS:
+            raise BadRequestException(f"La estadía no puede superar {MAX_CALENDAR_DAYS} noches")
+
+        if property_ids:
+            props = await self.resolve_properties(property_ids, current_user)
+            available = await self.property_repo.get_available(
+                check_in, check_out, property_ids=[p.id for p in props]
+            )
+        else:
+            available = await self.property_repo.get_available(check_in, check_out, manager_id=current_user.id)
+        if not available:
+            return []
+
+        totals = await self.pricing.calculate_booking_totals([(p.id, check_in, check_out) for p in available])
+        nights = (check_out - check_in).days
+        return [
+            {
+                "property_id": prop.id,
+                "property_name": prop.name,
+                "address": prop.address,
+                "check_in": check_in,
+                "check_out": check_out,
+                "nights": nights,
+                "total_amount": total,
+            }
+            for prop, total in zip(available, totals)
+        ]
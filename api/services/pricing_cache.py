@@ -0,0 +1,113 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+_PENDING_BUMPS_KEY = "pricing_epoch_bumps"
+_MISSING = object()
+
+
+class PricingCache:
+    """
+    In-process LRU/TTL cache for calendar and price quote results.
+
+    Entries are keyed by (kind, property_id, ..., pricing_epoch). Every change to
+    the costs, base prices, rules or bookings of a property bumps its epoch, so
+    stale entries are never read again and simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._epochs: dict[uuid.UUID, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------ #
+    # Epochs                                                               #
+    # ------------------------------------------------------------------ #
+
+    def epoch(self, property_id: uuid.UUID) -> int:
+        return self._epochs.get(property_id, 0)
+
+    def bump(self, property_id: uuid.UUID) -> None:
+        with self._lock:
+            self._epochs[property_id] = self._epochs.get(property_id, 0) + 1
+
+    def invalidate(self, db: AsyncSession, property_id: uuid.UUID) -> None:
+        """
+        Bumps the property's epoch now and again once the session commits, so a
+        concurrent read that cached pre-commit data under the new epoch is discarded too.
+        """
+        self.bump(property_id)
+        db.sync_session.info.setdefault(_PENDING_BUMPS_KEY, set()).add(property_id)
+
+    # ------------------------------------------------------------------ #
+    # Entries                                                              #
+    # ------------------------------------------------------------------ #
+
+    def key(self, kind: str, property_id: uuid.UUID, *args: Hashable) -> tuple:
+        return (kind, property_id, *args, self.epoch(property_id))
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not _MISSING:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+pricing_cache = PricingCache(
+    max_entries=settings.PRICING_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRICING_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_epochs_after_commit(session: Session) -> None:
+    for property_id in session.info.pop(_PENDING_BUMPS_KEY, ()):
+        pricing_cache.bump(property_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_bumps(session: Session) -> None:
+    session.info.pop(_PENDING_BUMPS_KEY, None)
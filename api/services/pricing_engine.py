@@ -0,0 +1,126 @@
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from models.pricing_rule import PricingRule
+from models.property_base_price import PropertyBasePrice
+from models.property_cost import PropertyCost
+from services.pricing_timeline import PriceSegment, PriceTimeline, RuleTimeline
+
+DEFAULT_PROFITABILITY_PERCENT = Decimal(100)
+
+
+@dataclass(frozen=True)
+class SimulatedRule:
+    """Rule-shaped value for what-if scenarios; read by RuleTimeline like a PricingRule, never persisted."""
+    name: str
+    start_date: date
+    end_date: date
+    profitability_percent: Decimal
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+
+
+@dataclass
+class PricePiece:
+    """
+    A run of days [start, end] sharing the same cost segment and pricing rule,
+    and therefore the same floor price, percent and final price.
+    """
+    start: date
+    end: date
+    segment: PriceSegment
+    rule: Optional[PricingRule]
+    percent: Decimal
+    floor_price: Decimal
+    price: Decimal
+
+    @property
+    def rule_name(self) -> Optional[str]:
+        return self.rule.name if self.rule else None
+
+    @property
+    def nights(self) -> int:
+        return (self.end - self.start).days + 1
+
+
+class DailyPriceEngine:
+    """
+    Batch daily price engine for a single property.
+
+    Prices are piecewise constant: they can only change where a cost / base price
+    segment or a pricing rule starts or ends. The engine walks both timelines once,
+    evaluates the pricing formula once per piece with the same Decimal operations
+    PricingService always used (so round(price, 2) is unchanged), and expands the
+    pieces to days only when a per-day view is requested.
+    """
+
+    def __init__(self, timeline: PriceTimeline, rule_timeline: RuleTimeline):
+        self.timeline = timeline
+        self.rule_timeline = rule_timeline
+
+    @classmethod
+    def build(
+        cls,
+        prop,
+        costs: list[PropertyCost],
+        base_prices: list[PropertyBasePrice],
+        rules: list[PricingRule],
+        start_date: date,
+        end_date: date,
+    ) -> "DailyPriceEngine":
+        """Builds an engine covering [start_date, end_date] from pre-fetched property data."""
+        timeline = PriceTimeline.compile(
+            costs, base_prices, prop.base_price, prop.avg_stay_days, start_date, end_date
+        )
+        return cls(timeline, RuleTimeline(rules))
+
+    def with_rules(self, rules) -> "DailyPriceEngine":
+        """Same cost / base price timeline priced with another rule set (no recompilation)."""
+        return DailyPriceEngine(self.timeline, RuleTimeline(rules))
+
+    def pieces(self, start: date, end: date) -> Iterator[PricePiece]:
+        """Yields the constant-price pieces covering [start, end] in chronological order."""
+        ratios: dict = {}
+        for segment in self.timeline.segments:
+            if segment.end < start:
+                continue
+            if segment.start > end:
+                break
+            seg_start = max(segment.start, start)
+            seg_end = min(segment.end, end)
+            floor_price = segment.floor_price
+            margin = segment.base_price - floor_price
+            for span_start, span_end, rule in self.rule_timeline.spans(seg_start, seg_end):
+                key = rule.id if rule else None
+                if key not in ratios:
+                    percent = rule.profitability_percent if rule else DEFAULT_PROFITABILITY_PERCENT
+                    ratios[key] = (percent, percent / Decimal(100))
+                percent, ratio = ratios[key]
+                yield PricePiece(
+                    start=span_start,
+                    end=span_end,
+                    segment=segment,
+                    rule=rule,
+                    percent=percent,
+                    floor_price=floor_price,
+                    price=floor_price + (margin * ratio),
+                )
+
+    def iter_days(self, start: date, end: date) -> Iterator[tuple[date, PricePiece]]:
+        """Yields (day, piece) for every day in [start, end]."""
+        for piece in self.pieces(start, end):
+            day = piece.start
+            while day <= piece.end:
+                yield day, piece
+                day += timedelta(days=1)
+
+    def total(self, check_in: date, check_out: date) -> Decimal:
+        """Unrounded sum of nightly prices from check_in to check_out (exclusive)."""
+        total = Decimal(0)
+        for piece in self.pieces(check_in, check_out - timedelta(days=1)):
+            # Accumulate night by night to keep the exact Decimal rounding of a day-by-day sum
+            for _ in range(piece.nights):
+                total += piece.price
+        return total
@@ -1,20 +1,42 @@
 import calendar
 import uuid
+from collections import defaultdict
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.enums import CostCategory, CostCalculationType
 from exceptions.general import BadRequestException, NotFoundException
 from models.property_cost import PropertyCost
+from repositories.booking_night_repository import BookingNightRepository
 from repositories.booking_repository import BookingRepository
 from repositories.cost_repository import CostRepository
+from repositories.financial_snapshot_repository import FinancialSnapshotRepository
+from repositories.pricing_lock_repository import PricingLockRepository
 from repositories.pricing_rule_repository import PricingRuleRepository
 from repositories.property_base_price_repository import PropertyBasePriceRepository
 from repositories.property_repository import PropertyRepository
-from schemas.pricing_rule import PricingRuleCreate, PricingRuleUpdate
+from schemas.pricing_rule import PricingRuleCreate, PricingRuleUpdate, PricingSimulationRequest
+from services.daily_price_service import DailyPriceService
+from services.occupancy_overlay import OccupancyOverlay
+from services.pricing_cache import pricing_cache
+from services.pricing_engine import DailyPriceEngine, SimulatedRule
+from services.pricing_timeline import is_active_on
+
+# Upper bound for a single financial summary range request
+MAX_SUMMARY_MONTHS = 36
+
+# Longest range returned as a single JSON list; longer ranges must be streamed
+MAX_CALENDAR_DAYS = 731
+# Longest range of a streamed calendar (about ten years); every night of it is materialized
+MAX_STREAM_CALENDAR_DAYS = 3660
+# Nights computed and sent per step when streaming a calendar
+CALENDAR_STREAM_CHUNK_DAYS = 92
+
+# Upper bound for candidate scenarios in one simulation request
+MAX_SIMULATION_SCENARIOS = 20
 
 
 class PricingService:
@@ -25,6 +47,10 @@ class PricingService:
         self.cost_repo = CostRepository(db)
         self.base_price_repo = PropertyBasePriceRepository(db)
         self.booking_repo = BookingRepository(db)
+        self.booking_night_repo = BookingNightRepository(db)
+        self.snapshot_repo = FinancialSnapshotRepository(db)
+        self.lock_repo = PricingLockRepository(db)
+        self.daily_prices = DailyPriceService(db)
 
     # ------------------------------------------------------------------ #
     # Pricing rules CRUD                                                   #
@@ -46,7 +72,9 @@ class PricingService:
                 "No se puede crear la regla: el período incluye fechas de reservas pagadas"
             )
 
-        return await self.pricing_repo.create(property_id, rule_in)
+        rule = await self.pricing_repo.create(property_id, rule_in)
+        await self.daily_prices.refresh(property_id, rule.start_date, rule.end_date)
+        return rule
 
     async def update_rule(self, rule_id: uuid.UUID, rule_in: PricingRuleUpdate) -> object:
         db_rule = await self.pricing_repo.get_by_id(rule_id)
@@ -67,11 +95,18 @@ class PricingService:
                 "No se puede modificar la regla: el período incluye fechas de reservas pagadas"
             )
 
-        return await self.pricing_repo.update(rule_id, rule_in)
+        old_start, old_end = db_rule.start_date, db_rule.end_date
+        rule = await self.pricing_repo.update(rule_id, rule_in)
+        await self.daily_prices.refresh(rule.property_id, min(old_start, start_date), max(old_end, end_date))
+        return rule
 
     async def delete_rule(self, rule_id: uuid.UUID) -> bool:
-        if not await self.pricing_repo.delete(rule_id):
+        db_rule = await self.pricing_repo.get_by_id(rule_id)
+        if not db_rule:
             raise NotFoundException("Regla de precio no encontrada")
+        property_id, start_date, end_date = db_rule.property_id, db_rule.start_date, db_rule.end_date
+        await self.pricing_repo.delete(rule_id)
+        await self.daily_prices.refresh(property_id, start_date, end_date)
         return True
 
     async def list_rules_by_property(self, property_id: uuid.UUID):
@@ -84,39 +119,7 @@ class PricingService:
     @staticmethod
     def _costs_for_date(all_costs: list[PropertyCost], ref_date: date) -> list[PropertyCost]:
         """Filters a pre-fetched cost list to only those active on ref_date."""
-        return [
-            c for c in all_costs
-            if (c.start_date is None or c.start_date <= ref_date)
-            and (c.end_date is None or c.end_date >= ref_date)
-        ]
-
-    @staticmethod
-    def _base_price_for_date(records, ref_date: date) -> Optional[Decimal]:
-        """Returns the base price value active on ref_date from a pre-fetched list."""
-        for r in records:
-            if (r.start_date is None or r.start_date <= ref_date) \
-                    and (r.end_date is None or r.end_date >= ref_date):
-                return r.value
-        return None
-
-    def _calculate_floor_price(self, costs: list[PropertyCost], avg_stay: int) -> Decimal:
-        """
-        Calculate the 'zero profit' floor price per day from a pre-filtered cost list.
-        Formula:
-          (Monthly Fixed / 30) + (Per Day Reservation) + (Per Reservation Fixed / avg_stay)
-        Percentage costs are treated as markups applied separately.
-        """
-        floor = Decimal(0)
-        for cost in costs:
-            if cost.calculation_type == CostCalculationType.FIXED_AMOUNT:
-                if cost.category == CostCategory.RECURRING_MONTHLY:
-                    floor += cost.value / Decimal(30)
-                elif cost.category == CostCategory.PER_DAY_RESERVATION:
-                    floor += cost.value
-                elif cost.category == CostCategory.PER_RESERVATION:
-                    if avg_stay > 0:
-                        floor += cost.value / Decimal(avg_stay)
-        return floor
+        return [c for c in all_costs if is_active_on(c, ref_date)]
 
     # ------------------------------------------------------------------ #
     # Price quote                                                          #
@@ -126,103 +129,441 @@ class PricingService:
         self, property_id: uuid.UUID, check_in: date, check_out: date
     ) -> Decimal:
         """Calculate total booking price summing daily prices from check_in to check_out (exclusive)."""
+        cache_key = pricing_cache.key("quote", property_id, check_in, check_out)
+        cached = pricing_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         prop = await self.property_repo.get_by_id(property_id)
         if not prop:
             raise NotFoundException("Propiedad no encontrada")
 
-        all_costs = await self.cost_repo.get_costs_overlapping(property_id, check_in, check_out)
-        all_base_prices = await self.base_price_repo.get_overlapping(property_id, check_in, check_out)
-
+        nights = await self.daily_prices.get_prices(prop, check_in, check_out - timedelta(days=1))
         total = Decimal(0)
-        current = check_in
-        while current < check_out:
-            day_costs = self._costs_for_date(all_costs, current)
-            floor_price = self._calculate_floor_price(day_costs, prop.avg_stay_days)
+        for night in nights:
+            total += night.price
 
-            rules = await self.pricing_repo.get_active_rules_for_date(property_id, current)
-            active_rule = rules[0] if rules else None
-            percent = active_rule.profitability_percent if active_rule else Decimal(100)
+        total = round(total, 2)
+        pricing_cache.set(cache_key, total)
+        return total
 
-            day_base_price = self._base_price_for_date(all_base_prices, current) or prop.base_price
-            price = floor_price + (day_base_price - floor_price) * (percent / Decimal(100))
-            total += price
-            current += timedelta(days=1)
+    async def calculate_booking_totals(self, quotes: list[tuple[uuid.UUID, date, date]]) -> list[Decimal]:
+        """
+        Totals of many (property_id, check_in, check_out) quotes, in order. Uncached
+        quotes share one set-based price load over the hull of their ranges, so every
+        night is priced once however many quotes include it.
+        """
+        cache_keys = [pricing_cache.key("quote", pid, check_in, check_out) for pid, check_in, check_out in quotes]
+        totals = [pricing_cache.get(key) for key in cache_keys]
+        pending: dict[uuid.UUID, list[int]] = defaultdict(list)
+        for i, total in enumerate(totals):
+            if total is None:
+                pending[quotes[i][0]].append(i)
+        if not pending:
+            return totals
+
+        props = await self.property_repo.get_by_ids(list(pending))
+        if len(props) < len(pending):
+            raise NotFoundException("Propiedad no encontrada")
 
-        return round(total, 2)
+        start_date = min(quotes[i][1] for indexes in pending.values() for i in indexes)
+        end_date = max(quotes[i][2] for indexes in pending.values() for i in indexes) - timedelta(days=1)
+        if (end_date - start_date).days + 1 > MAX_CALENDAR_DAYS:
+            raise BadRequestException(f"Las cotizaciones no pueden abarcar más de {MAX_CALENDAR_DAYS} días")
+
+        nights = await self.daily_prices.get_prices_for_properties(props, start_date, end_date)
+        for property_id, indexes in pending.items():
+            property_nights = nights[property_id]
+            for i in indexes:
+                _, check_in, check_out = quotes[i]
+                total = Decimal(0)
+                for night in property_nights[(check_in - start_date).days:(check_out - start_date).days]:
+                    total += night.price
+                totals[i] = round(total, 2)
+                pricing_cache.set(cache_keys[i], totals[i])
+        return totals
 
     # ------------------------------------------------------------------ #
     # Calendar                                                             #
     # ------------------------------------------------------------------ #
 
     async def get_calendar(self, property_id: uuid.UUID, start_date: date, end_date: date):
+        if (end_date - start_date).days + 1 > MAX_CALENDAR_DAYS:
+            raise BadRequestException(
+                f"El rango no puede superar {MAX_CALENDAR_DAYS} días; usa el modo stream para rangos mayores"
+            )
+
+        cache_key = pricing_cache.key("calendar", property_id, start_date, end_date)
+        cached = pricing_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         prop = await self.property_repo.get_by_id(property_id)
         if not prop:
             raise NotFoundException("Propiedad no encontrada")
 
-        # Fetch all cost versions and base price versions overlapping the calendar range once
-        all_costs = await self.cost_repo.get_costs_overlapping(property_id, start_date, end_date)
-        all_base_prices = await self.base_price_repo.get_overlapping(property_id, start_date, end_date)
+        # Nightly prices come from the materialized table (computed on first access)
+        nights = await self.daily_prices.get_prices(prop, start_date, end_date)
 
         bookings = await self.booking_repo.check_conflicts(property_id, start_date, end_date)
 
-        result = []
-        current = start_date
-        while current <= end_date:
-            day_costs = self._costs_for_date(all_costs, current)
-            floor_price = self._calculate_floor_price(day_costs, prop.avg_stay_days)
-
-            rules = await self.pricing_repo.get_active_rules_for_date(property_id, current)
-            active_rule = rules[0] if rules else None
-            percent = active_rule.profitability_percent if active_rule else Decimal(100)
+        result = self._calendar_days(nights, bookings)
+        pricing_cache.set(cache_key, result)
+        return result
 
-            day_base_price = self._base_price_for_date(all_base_prices, current) or prop.base_price
-            margin = day_base_price - floor_price
-            price = floor_price + (margin * (percent / Decimal(100)))
+    async def stream_calendar(
+        self, property_id: uuid.UUID, start_date: date, end_date: date
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Calendar of up to MAX_STREAM_CALENDAR_DAYS nights, produced in chunks of
+        CALENDAR_STREAM_CHUNK_DAYS nights so memory stays flat. The range and the property
+        are checked up front; the returned iterator yields each chunk's entries as soon as
+        they are computed.
+        """
+        if (end_date - start_date).days + 1 > MAX_STREAM_CALENDAR_DAYS:
+            raise BadRequestException(f"El rango no puede superar {MAX_STREAM_CALENDAR_DAYS} días")
+        prop = await self.property_repo.get_by_id(property_id)
+        if not prop:
+            raise NotFoundException("Propiedad no encontrada")
+        return self._iter_calendar_chunks(prop, start_date, end_date)
+
+    async def _iter_calendar_chunks(self, prop, start_date: date, end_date: date) -> AsyncIterator[list[dict]]:
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            chunk_end = min(chunk_start + timedelta(days=CALENDAR_STREAM_CHUNK_DAYS - 1), end_date)
+            nights = await self.daily_prices.get_prices(prop, chunk_start, chunk_end)
+            bookings = await self.booking_repo.check_conflicts(prop.id, chunk_start, chunk_end)
+            yield self._calendar_days(nights, bookings)
+            chunk_start = chunk_end + timedelta(days=1)
+
+    async def get_calendars(self, props: list, start_date: date, end_date: date) -> dict[uuid.UUID, list[dict]]:
+        """
+        Calendars of several properties over the same range. Cached calendars are reused;
+        the rest are built from one price query and one booking query for all of them.
+        """
+        calendars: dict[uuid.UUID, list[dict]] = {}
+        cache_keys = {}
+        pending = []
+        for prop in props:
+            cache_keys[prop.id] = pricing_cache.key("calendar", prop.id, start_date, end_date)
+            cached = pricing_cache.get(cache_keys[prop.id])
+            if cached is not None:
+                calendars[prop.id] = cached
+            else:
+                pending.append(prop)
+        if not pending:
+            return calendars
+
+        nights = await self.daily_prices.get_prices_for_properties(pending, start_date, end_date)
+        bookings: dict[uuid.UUID, list] = {prop.id: [] for prop in pending}
+        for booking in await self.booking_repo.get_active_overlapping_for_properties(
+            list(bookings), start_date, end_date
+        ):
+            bookings[booking.property_id].append(booking)
+
+        for prop in pending:
+            calendars[prop.id] = self._calendar_days(nights[prop.id], bookings[prop.id])
+            pricing_cache.set(cache_keys[prop.id], calendars[prop.id])
+        return calendars
 
-            status = "AVAILABLE"
-            for b in bookings:
-                if b.check_in <= current < b.check_out:
-                    status = "RESERVED"
-                    break
+    @staticmethod
+    def _calendar_days(nights: list, bookings: list) -> list[dict]:
+        """Builds the calendar entries from materialized nights and the bookings overlapping them."""
+        if not nights:
+            return []
+        overlay = OccupancyOverlay(bookings, nights[0].date, nights[-1].date)
 
+        result = []
+        for night in nights:
+            booking = overlay.booking_on(night.date)
             result.append({
-                "date": current,
-                "price": round(price, 2),
-                "status": status,
-                "rule_name": active_rule.name if active_rule else None,
-                "floor_price": round(floor_price, 2),
-                "profitability_percent": percent,
+                "date": night.date,
+                "price": round(night.price, 2),
+                "status": "RESERVED" if booking else "AVAILABLE",
+                "rule_name": night.rule_name,
+                "floor_price": round(night.floor_price, 2),
+                "profitability_percent": night.profitability_percent,
+                "booking_id": booking.id if booking else None,
+                "booking_status": booking.status if booking else None,
             })
-            current += timedelta(days=1)
-
         return result
 
+    # ------------------------------------------------------------------ #
+    # What-if simulation                                                   #
+    # ------------------------------------------------------------------ #
+
+    async def simulate(self, property_id: uuid.UUID, sim: PricingSimulationRequest) -> dict:
+        """
+        Projects nightly prices and monthly revenue (at full occupancy) for candidate
+        percents or rule sets, next to the current rules. The cost / base price timeline
+        is compiled once and every scenario is priced over it in memory; nothing is persisted.
+        """
+        scenario_count = len(sim.percents) + len(sim.rule_sets)
+        if scenario_count == 0:
+            raise BadRequestException("Indica al menos un porcentaje o un conjunto de reglas a simular")
+        if scenario_count > MAX_SIMULATION_SCENARIOS:
+            raise BadRequestException(f"No se pueden simular más de {MAX_SIMULATION_SCENARIOS} escenarios")
+        if (sim.end_date - sim.start_date).days + 1 > MAX_CALENDAR_DAYS:
+            raise BadRequestException(f"El rango no puede superar {MAX_CALENDAR_DAYS} días")
+
+        prop = await self.property_repo.get_by_id(property_id)
+        if not prop:
+            raise NotFoundException("Propiedad no encontrada")
+
+        engine = await self.daily_prices.load_engine(prop, sim.start_date, sim.end_date)
+        scenarios = [("Actual", "current", engine)]
+        for percent in sim.percents:
+            name = f"{percent}%"
+            rule = SimulatedRule(name, sim.start_date, sim.end_date, percent)
+            scenarios.append((name, "percent", engine.with_rules([rule])))
+        for rule_set in sim.rule_sets:
+            rules = sorted(
+                (SimulatedRule(r.name, r.start_date, r.end_date, r.profitability_percent) for r in rule_set.rules),
+                key=lambda r: r.start_date,
+            )
+            if any(rules[i].start_date <= rules[i - 1].end_date for i in range(1, len(rules))):
+                raise BadRequestException(f"Las reglas del escenario '{rule_set.name}' se solapan")
+            scenarios.append((rule_set.name, "rules", engine.with_rules(rules)))
+
+        return {
+            "start_date": sim.start_date,
+            "end_date": sim.end_date,
+            "scenarios": [
+                self._simulate_scenario(name, kind, scenario_engine, sim.start_date, sim.end_date, sim.include_days)
+                for name, kind, scenario_engine in scenarios
+            ],
+        }
+
+    @staticmethod
+    def _simulate_scenario(
+        name: str, kind: str, engine: DailyPriceEngine, start_date: date, end_date: date, include_days: bool
+    ) -> dict:
+        days = []
+        months: dict[tuple[int, int], dict] = {}
+        total_revenue = Decimal(0)
+        for day, piece in engine.iter_days(start_date, end_date):
+            month = months.setdefault(
+                (day.year, day.month),
+                {"year": day.year, "month": day.month, "nights": 0, "revenue": Decimal(0)},
+            )
+            month["nights"] += 1
+            month["revenue"] += piece.price
+            total_revenue += piece.price
+            if include_days:
+                days.append({
+                    "date": day,
+                    "price": round(piece.price, 2),
+                    "floor_price": round(piece.floor_price, 2),
+                    "profitability_percent": piece.percent,
+                    "rule_name": piece.rule_name,
+                })
+
+        for month in months.values():
+            month["revenue"] = round(month["revenue"], 2)
+        return {
+            "name": name,
+            "kind": kind,
+            "total_revenue": round(total_revenue, 2),
+            "months": list(months.values()),
+            "days": days,
+        }
+
     # ------------------------------------------------------------------ #
     # Financial summary                                                    #
     # ------------------------------------------------------------------ #
 
     async def get_financial_summary(self, property_id: uuid.UUID, year: int, month: int):
-        """Calculate monthly financial performance using temporally accurate cost values."""
+        """
+        Calculate monthly financial performance using temporally accurate cost values.
+        Closed months are served from their stored snapshot when one exists.
+        """
         prop = await self.property_repo.get_by_id(property_id)
         if not prop:
             raise NotFoundException("Propiedad no encontrada")
 
-        days_in_month = calendar.monthrange(year, month)[1]
+        if self._is_closed(year, month):
+            snapshots = await self._snapshots([property_id], (year, month), (year, month))
+            if (property_id, year, month) in snapshots:
+                return snapshots[(property_id, year, month)]
+            await self._lock_for_snapshots([prop])
+
         start_date = date(year, month, 1)
-        end_date = date(year, month, days_in_month)
+        end_date = date(year, month, calendar.monthrange(year, month)[1])
 
-        # Fetch all cost versions and base price versions overlapping the month once
+        # Fetch all cost versions, base price versions and rules overlapping the month once
         all_costs = await self.cost_repo.get_costs_overlapping(property_id, start_date, end_date)
         all_base_prices = await self.base_price_repo.get_overlapping(property_id, start_date, end_date)
+        rules = await self.pricing_repo.get_rules_overlapping(property_id, start_date, end_date)
+        engine = DailyPriceEngine.build(prop, all_costs, all_base_prices, rules, start_date, end_date)
+
+        bookings = await self.booking_repo.get_for_financial_summary(property_id, start_date, end_date)
+        ledger = await self._ledger_totals([property_id], start_date, end_date)
+        summary = self._summarize_month(engine, all_costs, bookings, year, month, ledger)
+        await self._store_snapshots([(property_id, summary)])
+        return summary
+
+    async def get_financial_summary_range(
+        self, property_id: uuid.UUID, start_year: int, start_month: int, end_year: int, end_month: int
+    ) -> list[dict]:
+        """
+        Monthly financial summaries for every month in [start, end], identical to calling
+        get_financial_summary once per month. Closed months with a snapshot are read in one
+        query; every input of the remaining months is fetched once for their span.
+        """
+        months = [
+            (y, m)
+            for y in range(start_year, end_year + 1)
+            for m in range(1, 13)
+            if (start_year, start_month) <= (y, m) <= (end_year, end_month)
+        ]
+        if not months:
+            raise BadRequestException("El mes final debe ser posterior al inicial")
+        if len(months) > MAX_SUMMARY_MONTHS:
+            raise BadRequestException(f"El rango no puede superar {MAX_SUMMARY_MONTHS} meses")
+
+        prop = await self.property_repo.get_by_id(property_id)
+        if not prop:
+            raise NotFoundException("Propiedad no encontrada")
+
+        snapshots = await self._snapshots([property_id], months[0], months[-1])
+        missing = [ym for ym in months if (property_id, *ym) not in snapshots]
+        if not missing:
+            return [snapshots[(property_id, *ym)] for ym in months]
+
+        # Compute the span from the first to the last month without a snapshot
+        span = months[months.index(missing[0]):months.index(missing[-1]) + 1]
+        range_start = date(*span[0], 1)
+        range_end = date(*span[-1], calendar.monthrange(*span[-1])[1])
+        if any(self._is_closed(*ym) for ym in missing):
+            await self._lock_for_snapshots([prop])
+
+        all_costs = await self.cost_repo.get_costs_overlapping(property_id, range_start, range_end)
+        all_base_prices = await self.base_price_repo.get_overlapping(property_id, range_start, range_end)
+        rules = await self.pricing_repo.get_rules_overlapping(property_id, range_start, range_end)
+        engine = DailyPriceEngine.build(prop, all_costs, all_base_prices, rules, range_start, range_end)
+
+        bookings = await self.booking_repo.get_for_financial_summary(property_id, range_start, range_end)
+        ledger = await self._ledger_totals([property_id], range_start, range_end)
+
+        # Bucket each booking into the months it overlaps in one pass over the bookings
+        by_month: dict[tuple[int, int], list] = {ym: [] for ym in span}
+        for booking in bookings:
+            y, m = max((booking.check_in.year, booking.check_in.month), span[0])
+            while (y, m) <= span[-1] and date(y, m, 1) < booking.check_out:
+                by_month[(y, m)].append(booking)
+                y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+
+        computed = {
+            ym: self._summarize_month(engine, all_costs, by_month[ym], *ym, ledger)
+            for ym in missing
+        }
+        await self._store_snapshots([(property_id, summary) for summary in computed.values()])
+        return [snapshots.get((property_id, *ym)) or computed[ym] for ym in months]
 
-        bookings = await self.booking_repo.get_by_property(property_id, 0, 1000)
+    async def get_financial_summaries(self, props: list, year: int, month: int) -> dict[uuid.UUID, dict]:
+        """
+        Monthly summaries of several properties, identical to get_financial_summary per
+        property: stored snapshots first, the rest loaded with one query per input
+        (costs, base prices, rules, bookings).
+        """
+        summaries = {}
+        if self._is_closed(year, month):
+            snapshots = await self._snapshots([prop.id for prop in props], (year, month), (year, month))
+            summaries = {pid: summary for (pid, _, _), summary in snapshots.items()}
+            props = [prop for prop in props if prop.id not in summaries]
+            if not props:
+                return summaries
+            await self._lock_for_snapshots(props)
+
+        start_date = date(year, month, 1)
+        end_date = date(year, month, calendar.monthrange(year, month)[1])
+        ids = [prop.id for prop in props]
+
+        costs, base_prices, rules, bookings = (defaultdict(list) for _ in range(4))
+        for cost in await self.cost_repo.get_costs_overlapping_for_properties(ids, start_date, end_date):
+            costs[cost.property_id].append(cost)
+        for base_price in await self.base_price_repo.get_overlapping_for_properties(ids, start_date, end_date):
+            base_prices[base_price.property_id].append(base_price)
+        for rule in await self.pricing_repo.get_rules_overlapping_for_properties(ids, start_date, end_date):
+            rules[rule.property_id].append(rule)
+        for booking in await self.booking_repo.get_for_financial_summary_for_properties(ids, start_date, end_date):
+            bookings[booking.property_id].append(booking)
+        ledger = await self._ledger_totals(ids, start_date, end_date)
+
+        for prop in props:
+            engine = DailyPriceEngine.build(
+                prop, costs[prop.id], base_prices[prop.id], rules[prop.id], start_date, end_date
+            )
+            summaries[prop.id] = self._summarize_month(
+                engine, costs[prop.id], bookings[prop.id], year, month, ledger
+            )
+        await self._store_snapshots([(prop.id, summaries[prop.id]) for prop in props])
+        return summaries
+
+    @staticmethod
+    def _is_closed(year: int, month: int) -> bool:
+        """A month is closed once its last day is in the past."""
+        return date(year, month, calendar.monthrange(year, month)[1]) < date.today()
+
+    async def _snapshots(
+        self, property_ids: list[uuid.UUID], first: tuple[int, int], last: tuple[int, int]
+    ) -> dict[tuple[uuid.UUID, int, int], dict]:
+        """Stored summaries keyed by (property_id, year, month) for the months in [first, last]."""
+        rows = await self.snapshot_repo.get_many(property_ids, first, last)
+        return {(row.property_id, row.year, row.month): self.snapshot_repo.to_summary(row) for row in rows}
+
+    async def _lock_for_snapshots(self, props: list) -> None:
+        """
+        Takes the pricing lock of the properties before the inputs of a summary that will be
+        stored are loaded (see FinancialSnapshotRepository.invalidate), and reloads them.
+        """
+        await self.lock_repo.lock([prop.id for prop in props])
+        await self.property_repo.reload(props)
+
+    async def _store_snapshots(self, summaries: list[tuple[uuid.UUID, dict]]) -> None:
+        """Persists the summaries of closed months; open months are always recomputed."""
+        await self.snapshot_repo.upsert_many(
+            [(pid, summary) for pid, summary in summaries if self._is_closed(summary["year"], summary["month"])]
+        )
+
+    async def _ledger_totals(
+        self, property_ids: list[uuid.UUID], range_start: date, range_end: date
+    ) -> dict[tuple[uuid.UUID, int, int], object]:
+        """booking_nights aggregates keyed by (booking_id, year, month) for the summary months in the range."""
+        rows = await self.booking_night_repo.get_monthly_totals(property_ids, range_start, range_end)
+        return {(row.booking_id, int(row.year), int(row.month)): row for row in rows}
+
+    def _summarize_month(
+        self,
+        engine: DailyPriceEngine,
+        all_costs: list,
+        bookings: list,
+        year: int,
+        month: int,
+        ledger: Optional[dict] = None,
+    ):
+        """
+        Builds the summary of one month from pre-fetched data. The engine must cover the
+        month; all_costs and bookings may span a wider range and are narrowed here.
+        Bookings whose nights of the month are all in the ledger (see _ledger_totals) use
+        its sums; any other booking is priced day by day with the engine.
+        """
+        days_in_month = calendar.monthrange(year, month)[1]
+        start_date = date(year, month, 1)
+        end_date = date(year, month, days_in_month)
+
+        month_costs = [
+            c for c in all_costs
+            if (c.start_date is None or c.start_date <= end_date)
+            and (c.end_date is None or c.end_date >= start_date)
+        ]
         month_bookings = [
             b for b in bookings
             if b.check_in < end_date and b.check_out > start_date and b.status != "CANCELLED"
         ]
 
         # Monthly fixed costs: use value at the 1st of the month
-        start_of_month_costs = self._costs_for_date(all_costs, start_date)
+        start_of_month_costs = engine.timeline.segment_for(start_date).costs
         total_fixed_monthly = Decimal(0)
         for cost in start_of_month_costs:
             if (
@@ -240,10 +581,9 @@ class PricingService:
         for booking in month_bookings:
             booking_start = max(booking.check_in, start_date)
             booking_end = min(booking.check_out, end_date)
-            days = (booking_end - booking_start).days
 
             # Per-reservation and commission costs use value at check-in
-            checkin_costs = self._costs_for_date(all_costs, booking.check_in)
+            checkin_costs = self._costs_for_date(month_costs, booking.check_in)
             for cost in checkin_costs:
                 if (
                     cost.calculation_type == CostCalculationType.FIXED_AMOUNT
@@ -256,29 +596,21 @@ class PricingService:
             use_paid_amount = booking.paid_amount is not None
             booking_income = booking.paid_amount if use_paid_amount else Decimal(0)
 
-            for day_offset in range(days):
-                day = booking_start + timedelta(days=day_offset)
-                occupied_days += 1
+            nights = (booking_end - booking_start).days
+            totals = ledger.get((booking.id, year, month)) if ledger else None
+            if totals is not None and totals.nights == nights:
+                occupied_days += nights
+                if not use_paid_amount:
+                    booking_income += totals.price
+                total_fixed_daily += totals.per_day_cost
+            else:
+                for day, piece in engine.iter_days(booking_start, booking_end - timedelta(days=1)):
+                    occupied_days += 1
 
-                day_costs = self._costs_for_date(all_costs, day)
+                    if not use_paid_amount:
+                        booking_income += piece.price
 
-                if not use_paid_amount:
-                    floor_price = self._calculate_floor_price(day_costs, prop.avg_stay_days)
-
-                    rules = await self.pricing_repo.get_active_rules_for_date(property_id, day)
-                    active_rule = rules[0] if rules else None
-                    percent = active_rule.profitability_percent if active_rule else Decimal(100)
-
-                    day_base_price = self._base_price_for_date(all_base_prices, day) or prop.base_price
-                    price = floor_price + (day_base_price - floor_price) * (percent / Decimal(100))
-                    booking_income += price
-
-                for cost in day_costs:
-                    if (
-                        cost.calculation_type == CostCalculationType.FIXED_AMOUNT
-                        and cost.category == CostCategory.PER_DAY_RESERVATION
-                    ):
-                        total_fixed_daily += cost.value
+                    total_fixed_daily += piece.segment.per_day_reservation_cost
 
             total_income += booking_income
 
@@ -0,0 +1,196 @@
+import bisect
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, Iterator, Optional
+
+from core.enums import CostCategory, CostCalculationType
+from models.pricing_rule import PricingRule
+from models.property_base_price import PropertyBasePrice
+from models.property_cost import PropertyCost
+
+
+def is_active_on(record, ref_date: date) -> bool:
+    """True if a temporally versioned record (cost, base price) applies on ref_date."""
+    return (record.start_date is None or record.start_date <= ref_date) \
+        and (record.end_date is None or record.end_date >= ref_date)
+
+
+def calculate_floor_price(costs: list[PropertyCost], avg_stay: int) -> Decimal:
+    """
+    Calculate the 'zero profit' floor price per day from a pre-filtered cost list.
+    Formula:
+      (Monthly Fixed / 30) + (Per Day Reservation) + (Per Reservation Fixed / avg_stay)
+    Percentage costs are treated as markups applied separately.
+    """
+    floor = Decimal(0)
+    for cost in costs:
+        if cost.calculation_type == CostCalculationType.FIXED_AMOUNT:
+            if cost.category == CostCategory.RECURRING_MONTHLY:
+                floor += cost.value / Decimal(30)
+            elif cost.category == CostCategory.PER_DAY_RESERVATION:
+                floor += cost.value
+            elif cost.category == CostCategory.PER_RESERVATION:
+                if avg_stay > 0:
+                    floor += cost.value / Decimal(avg_stay)
+    return floor
+
+
+class RuleTimeline:
+    """
+    In-memory index over the pricing rules of a property, built from a single
+    range query. Answers "which rule covers day D" with a binary search over
+    the rule start dates instead of one query per day.
+
+    Rules of a property never overlap (enforced by PricingService through
+    check_overlap), so the candidate for a day is the last rule that starts
+    on or before it.
+    """
+
+    def __init__(self, rules: Iterable[PricingRule]):
+        self._rules = sorted(rules, key=lambda r: r.start_date)
+        self._starts = [r.start_date for r in self._rules]
+
+    def rule_for(self, day: date) -> Optional[PricingRule]:
+        """Returns the rule active on day, or None if no rule covers it."""
+        idx = bisect.bisect_right(self._starts, day) - 1
+        if idx < 0:
+            return None
+        rule = self._rules[idx]
+        return rule if rule.end_date >= day else None
+
+    def spans(self, start: date, end: date) -> Iterator[tuple[date, date, Optional[PricingRule]]]:
+        """
+        Splits [start, end] into consecutive (span_start, span_end, rule) runs in a single
+        sweep; rule is None for the gaps between rules.
+        """
+        idx = bisect.bisect_right(self._starts, start) - 1
+        if idx < 0 or self._rules[idx].end_date < start:
+            idx += 1
+        current = start
+        while current <= end:
+            rule = self._rules[idx] if idx < len(self._rules) else None
+            if rule is not None and rule.start_date <= current:
+                span_end = min(rule.end_date, end)
+                idx += 1
+            else:
+                span_end = end if rule is None else min(rule.start_date - timedelta(days=1), end)
+                rule = None
+            yield current, span_end, rule
+            current = span_end + timedelta(days=1)
+
+
+@dataclass
+class PriceSegment:
+    """A maximal run of days [start, end] over which costs and base price do not change."""
+    start: date
+    end: date
+    costs: list[PropertyCost]
+    floor_price: Decimal
+    base_price: Decimal
+    per_day_reservation_cost: Decimal
+
+
+class PriceTimeline:
+    """
+    Piecewise-constant view of the cost and base price versions of a property.
+
+    Cost and base price versions only change at their start_date / end_date + 1
+    boundaries, so the range is split at those dates once and the floor price,
+    base price and per-day costs are computed per segment instead of per day.
+    """
+
+    def __init__(self, segments: list[PriceSegment]):
+        self._segments = segments
+        self._starts = [s.start for s in segments]
+
+    @classmethod
+    def compile(
+        cls,
+        costs: list[PropertyCost],
+        base_prices: list[PropertyBasePrice],
+        default_base_price: Decimal,
+        avg_stay: int,
+        range_start: date,
+        range_end: date,
+    ) -> "PriceTimeline":
+        """Builds the segments covering [range_start, range_end] from pre-fetched versions."""
+        if range_end < range_start:
+            return cls([])
+
+        # Sweep over version boundaries: records are added on their start_date and
+        # removed the day after their end_date. Active records are kept by list
+        # position so each segment sees them in the same order as a linear filter.
+        starting: dict[date, list[tuple[int, int]]] = defaultdict(list)
+        ending: dict[date, list[tuple[int, int]]] = defaultdict(list)
+        active: tuple[set[int], set[int]] = (set(), set())
+        for kind, records in enumerate((costs, base_prices)):
+            for i, record in enumerate(records):
+                if record.end_date is not None and record.end_date < range_start:
+                    continue
+                if record.start_date is not None and record.start_date > range_end:
+                    continue
+                if record.start_date is None or record.start_date <= range_start:
+                    active[kind].add(i)
+                else:
+                    starting[record.start_date].append((kind, i))
+                if record.end_date is not None and record.end_date < range_end:
+                    ending[record.end_date + timedelta(days=1)].append((kind, i))
+        starts = sorted({range_start, *starting, *ending})
+
+        segments = []
+        for n, seg_start in enumerate(starts):
+            for kind, i in ending.get(seg_start, ()):
+                active[kind].discard(i)
+            for kind, i in starting.get(seg_start, ()):
+                active[kind].add(i)
+            seg_end = starts[n + 1] - timedelta(days=1) if n + 1 < len(starts) else range_end
+            seg_costs = [costs[i] for i in sorted(active[0])]
+            base_price = base_prices[min(active[1])].value if active[1] else None
+            per_day_reservation_cost = Decimal(0)
+            for cost in seg_costs:
+                if (
+                    cost.calculation_type == CostCalculationType.FIXED_AMOUNT
+                    and cost.category == CostCategory.PER_DAY_RESERVATION
+                ):
+                    per_day_reservation_cost += cost.value
+            segments.append(PriceSegment(
+                start=seg_start,
+                end=seg_end,
+                costs=seg_costs,
+                floor_price=calculate_floor_price(seg_costs, avg_stay),
+                base_price=base_price or default_base_price,
+                per_day_reservation_cost=per_day_reservation_cost,
+            ))
+        return cls(segments)
+
+    @property
+    def segments(self) -> list[PriceSegment]:
+        return self._segments
+
+    def segment_for(self, day: date) -> Optional[PriceSegment]:
+        """Returns the segment containing day, or None if day is outside the compiled range."""
+        idx = bisect.bisect_right(self._starts, day) - 1
+        if idx < 0:
+            return None
+        segment = self._segments[idx]
+        return segment if segment.end >= day else None
+
+    def iter_days(self, start: date, end: date) -> Iterator[tuple[date, PriceSegment]]:
+        """
+        Yields (day, segment) for every day in [start, end] that falls inside the
+        compiled range, walking the segments in order.
+        """
+        idx = max(bisect.bisect_right(self._starts, start) - 1, 0)
+        current = start
+        while current <= end and idx < len(self._segments):
+            segment = self._segments[idx]
+            if current > segment.end:
+                idx += 1
+                continue
+            if current < segment.start:
+                current = segment.start
+                continue
+            yield current, segment
+            current += timedelta(days=1)
@@ -9,6 +9,7 @@ from repositories.booking_repository import BookingRepository
 from repositories.property_base_price_repository import PropertyBasePriceRepository
 from repositories.property_repository import PropertyRepository
 from schemas.property_base_price import PropertyBasePriceModify
+from services.daily_price_service import DailyPriceService
 
 
 class PropertyBasePriceService:
@@ -17,6 +18,7 @@ class PropertyBasePriceService:
         self.repo = PropertyBasePriceRepository(db)
         self.property_repo = PropertyRepository(db)
         self.booking_repo = BookingRepository(db)
+        self.daily_prices = DailyPriceService(db)
 
     async def _get_property_or_404(self, property_id: uuid.UUID):
         prop = await self.property_repo.get_by_id(property_id)
@@ -55,6 +57,7 @@ class PropertyBasePriceService:
         # Keep cached base_price on the property in sync
         await self.repo.update_property_cache(property_id, modify_in.value)
 
+        await self.daily_prices.refresh(property_id, modify_in.start_date)
         return new_version
 
     async def revert_base_price(self, property_id: uuid.UUID) -> PropertyBasePrice:
@@ -75,6 +78,7 @@ class PropertyBasePriceService:
         # Keep cached base_price on the property in sync
         await self.repo.update_property_cache(property_id, restored.value)
 
+        await self.daily_prices.refresh(property_id, restored.start_date)
         return restored
 
     async def get_history(self, property_id: uuid.UUID) -> list[PropertyBasePrice]:
@@ -3,6 +3,7 @@ from models.user import User as UserModel
 from schemas.property import PropertyCreate, PropertyUpdate
 from repositories.property_repository import PropertyRepository
 from repositories.property_base_price_repository import PropertyBasePriceRepository
+from services.daily_price_service import DailyPriceService
 from exceptions.general import NotFoundException, ForbiddenException
 from core.enums import UserRole
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,6 +15,7 @@ class PropertyService:
         self.db = db
         self.property_repo = PropertyRepository(db)
         self.base_price_repo = PropertyBasePriceRepository(db)
+        self.daily_prices = DailyPriceService(db)
 
     def _is_admin(self, user: UserModel) -> bool:
         return user.role == UserRole.ADMIN
@@ -56,6 +58,9 @@ class PropertyService:
         if not self._is_admin(current_user) and property_obj.manager_id != current_user.id:
             raise ForbiddenException("No tienes permiso para modificar esta propiedad")
         updated = await self.property_repo.update(property_id, property_update)
+        # avg_stay_days amortizes per-reservation costs into every nightly floor price
+        if property_update.avg_stay_days is not None:
+            await self.daily_prices.refresh(property_id)
         return updated
 
     async def delete_property(self, property_id: uuid.UUID, current_user: UserModel) -> Property:
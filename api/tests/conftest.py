@@ -20,6 +20,11 @@ from models.pricing_rule import PricingRule  # noqa: F401
 from models.property_cost import PropertyCost  # noqa: F401
 from models.property_base_price import PropertyBasePrice  # noqa: F401
 from models.refresh_token import RefreshToken  # noqa: F401
+from models.property_daily_price import PropertyDailyPrice  # noqa: F401
+from models.booking_night import BookingNight  # noqa: F401
+from models.financial_snapshot import FinancialSnapshot  # noqa: F401
+from models.calendar_feed_version import CalendarFeedVersion  # noqa: F401
+from models.calendar_source import CalendarSource  # noqa: F401
 
 # ---------- Test database ----------
 
@@ -44,6 +49,8 @@ async def override_get_db():
 @pytest.fixture(scope="session", autouse=True)
 async def setup_database():
     async with test_engine.begin() as conn:
+        # excl_bookings_no_overlap needs btree_gist for the UUID equality part
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
         await conn.run_sync(Base.metadata.create_all)
     yield
     async with test_engine.begin() as conn:
@@ -56,10 +63,15 @@ async def clean_tables():
     """Delete all rows after each test (children first to respect FKs)."""
     yield
     async with test_engine.begin() as conn:
+        await conn.execute(text("DELETE FROM calendar_feed_versions"))
+        await conn.execute(text("DELETE FROM calendar_sources"))
+        await conn.execute(text("DELETE FROM financial_snapshots"))
+        await conn.execute(text("DELETE FROM booking_nights"))
         await conn.execute(text("DELETE FROM bookings"))
         await conn.execute(text("DELETE FROM pricing_rules"))
         await conn.execute(text("DELETE FROM property_costs"))
         await conn.execute(text("DELETE FROM property_base_prices"))
+        await conn.execute(text("DELETE FROM property_daily_prices"))
         await conn.execute(text("DELETE FROM properties"))
         await conn.execute(text("DELETE FROM guests"))
         await conn.execute(text("DELETE FROM refresh_tokens"))
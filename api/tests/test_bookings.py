@@ -86,6 +86,26 @@ async def test_create_booking_overlap_conflict(client, admin_headers, test_prope
         headers=admin_headers,
     )
     assert resp2.status_code == 409
+    assert "2026-06-01 a 2026-06-05" in resp2.json()["detail"]
+
+
+async def test_create_booking_after_cancelled_overlap(client, admin_headers, test_property):
+    """Cancelled bookings are outside the exclusion constraint and do not block new ones."""
+    pid = test_property["id"]
+    resp1 = await client.post(
+        BOOKINGS_URL,
+        json=_booking_payload(pid, date(2026, 6, 1), date(2026, 6, 5)),
+        headers=admin_headers,
+    )
+    await client.post(f"{BOOKINGS_URL}{resp1.json()['id']}/cancel", headers=admin_headers)
+
+    resp2 = await client.post(
+        BOOKINGS_URL,
+        json=_booking_payload(pid, date(2026, 6, 3), date(2026, 6, 7)),
+        headers=admin_headers,
+    )
+    assert resp2.status_code == 201
+    assert resp2.json()["ical_uid"].startswith(resp2.json()["id"])
 
 
 # ---------- List ----------
@@ -109,6 +129,52 @@ async def test_list_bookings_by_property(client, admin_headers, test_property):
     assert len(resp.json()) >= 1
 
 
+async def test_list_bookings_keyset_pages(client, admin_headers, test_property):
+    """Pages are ordered by check-in and chained through the X-Next-Cursor header."""
+    pid = test_property["id"]
+    for month in (9, 7, 8, 6, 10):
+        await client.post(
+            BOOKINGS_URL, json=_booking_payload(pid, date(2026, month, 1), date(2026, month, 3)), headers=admin_headers
+        )
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        resp = await client.get(f"/bookings/properties/{pid}/bookings", params=params, headers=admin_headers)
+        assert resp.status_code == 200
+        seen.extend(b["check_in"] for b in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, "cursor": cursor}
+    assert seen == [f"2026-{m:02d}-01" for m in (6, 7, 8, 9, 10)]
+
+
+async def test_list_bookings_filters(client, admin_headers, test_property):
+    pid = test_property["id"]
+    await client.post(BOOKINGS_URL, json=_booking_payload(pid, date(2026, 6, 1), date(2026, 6, 5)), headers=admin_headers)
+    await client.post(
+        BOOKINGS_URL,
+        json=_booking_payload(pid, date(2026, 7, 1), date(2026, 7, 5), status="TENTATIVE"),
+        headers=admin_headers,
+    )
+
+    resp = await client.get(
+        BOOKINGS_URL,
+        params={"property_id": pid, "start_date": "2026-06-04", "end_date": "2026-06-30"},
+        headers=admin_headers,
+    )
+    assert [b["check_in"] for b in resp.json()] == ["2026-06-01"]
+
+    resp = await client.get(BOOKINGS_URL, params={"property_id": pid, "status": "TENTATIVE"}, headers=admin_headers)
+    assert [b["check_in"] for b in resp.json()] == ["2026-07-01"]
+
+
+async def test_list_bookings_invalid_cursor(client, admin_headers):
+    resp = await client.get(BOOKINGS_URL, params={"cursor": "not-a-cursor"}, headers=admin_headers)
+    assert resp.status_code == 400
+
+
 # ---------- Get by ID ----------
 
 async def test_get_booking(client, admin_headers, test_property):
@@ -153,3 +219,238 @@ async def test_delete_booking(client, admin_headers, test_property):
 
     resp = await client.delete(f"{BOOKINGS_URL}{booking_id}", headers=admin_headers)
     assert resp.status_code == 204
+
+
+# ---------- State transitions ----------
+
+async def test_booking_state_transitions(client, admin_headers, test_property):
+    resp = await client.post(
+        BOOKINGS_URL,
+        json=_booking_payload(test_property["id"], status="TENTATIVE"),
+        headers=admin_headers,
+    )
+    booking_id = resp.json()["id"]
+
+    resp = await client.post(f"{BOOKINGS_URL}{booking_id}/accept", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "CONFIRMED"
+    assert resp.json()["updated_at"]
+
+    resp = await client.post(
+        f"{BOOKINGS_URL}{booking_id}/pay",
+        json={"paid_at": "2026-06-05", "payment_method": "CASH", "paid_amount": "350.00"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    assert (resp.json()["status"], resp.json()["payment_method"]) == ("PAID", "CASH")
+    assert float(resp.json()["paid_amount"]) == 350.0
+
+    resp = await client.post(f"{BOOKINGS_URL}{booking_id}/revert-payment", headers=admin_headers)
+    assert resp.status_code == 200
+    assert (resp.json()["status"], resp.json()["paid_at"], resp.json()["paid_amount"]) == ("CONFIRMED", None, None)
+
+    resp = await client.post(f"{BOOKINGS_URL}{booking_id}/cancel", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "CANCELLED"
+
+    resp = await client.delete(f"{BOOKINGS_URL}{booking_id}", headers=admin_headers)
+    assert resp.status_code == 204
+    resp = await client.get(f"{BOOKINGS_URL}{booking_id}", headers=admin_headers)
+    assert resp.status_code == 404
+
+
+async def test_booking_transition_errors(client, admin_headers, manager_headers, test_property):
+    """Missing booking, other manager's property and wrong state are told apart."""
+    resp = await client.post(BOOKINGS_URL, json=_booking_payload(test_property["id"]), headers=admin_headers)
+    booking_id = resp.json()["id"]
+
+    resp = await client.post(f"{BOOKINGS_URL}00000000-0000-0000-0000-000000000000/cancel", headers=admin_headers)
+    assert resp.status_code == 404
+
+    resp = await client.post(f"{BOOKINGS_URL}{booking_id}/cancel", headers=manager_headers)
+    assert resp.status_code == 403
+
+    resp = await client.post(f"{BOOKINGS_URL}{booking_id}/accept", headers=admin_headers)
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Solo se pueden aceptar reservas en estado Tentativo"
+
+    resp = await client.post(f"{BOOKINGS_URL}{booking_id}/revert-payment", headers=admin_headers)
+    assert resp.status_code == 400
+
+
+# ---------- Bulk status operations ----------
+
+async def test_bulk_pay_bookings(client, admin_headers, test_property):
+    pid = test_property["id"]
+    ids = []
+    for day in (1, 5, 9):
+        resp = await client.post(
+            BOOKINGS_URL,
+            json=_booking_payload(pid, date(2026, 6, day), date(2026, 6, day + 2)),
+            headers=admin_headers,
+        )
+        ids.append(resp.json()["id"])
+    await client.post(f"{BOOKINGS_URL}{ids[2]}/cancel", headers=admin_headers)
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    resp = await client.post(
+        f"{BOOKINGS_URL}bulk/pay",
+        json={"booking_ids": ids + [missing], "paid_at": "2026-06-30", "payment_method": "TRANSFER"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["succeeded"], data["failed"]) == (2, 2)
+    assert [r["status_code"] for r in data["results"]] == [200, 200, 400, 404]
+    assert data["results"][0]["status"] == "PAID"
+    assert data["results"][2]["detail"] == "Solo se pueden marcar como pagadas reservas Confirmadas o Tentativas"
+
+    resp = await client.get(f"{BOOKINGS_URL}{ids[0]}", headers=admin_headers)
+    assert (resp.json()["status"], resp.json()["paid_at"]) == ("PAID", "2026-06-30")
+
+
+async def test_bulk_cancel_and_delete_bookings(client, admin_headers, manager_headers, test_property):
+    pid = test_property["id"]
+    ids = []
+    for day in (1, 5):
+        resp = await client.post(
+            BOOKINGS_URL,
+            json=_booking_payload(pid, date(2026, 6, day), date(2026, 6, day + 2)),
+            headers=admin_headers,
+        )
+        ids.append(resp.json()["id"])
+
+    resp = await client.post(f"{BOOKINGS_URL}bulk/cancel", json={"booking_ids": ids}, headers=manager_headers)
+    assert resp.status_code == 200
+    assert [r["status_code"] for r in resp.json()["results"]] == [403, 403]
+
+    resp = await client.post(f"{BOOKINGS_URL}bulk/cancel", json={"booking_ids": ids}, headers=admin_headers)
+    assert resp.json()["succeeded"] == 2
+    assert all(r["status"] == "CANCELLED" for r in resp.json()["results"])
+
+    resp = await client.post(f"{BOOKINGS_URL}bulk/delete", json={"booking_ids": ids}, headers=admin_headers)
+    assert resp.json()["succeeded"] == 2
+    resp = await client.get(f"{BOOKINGS_URL}{ids[0]}", headers=admin_headers)
+    assert resp.status_code == 404
+
+
+async def test_bulk_confirm_bookings(client, admin_headers, test_property):
+    resp = await client.post(
+        BOOKINGS_URL,
+        json=_booking_payload(test_property["id"], status="TENTATIVE"),
+        headers=admin_headers,
+    )
+    booking_id = resp.json()["id"]
+
+    resp = await client.post(f"{BOOKINGS_URL}bulk/confirm", json={"booking_ids": [booking_id]}, headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json()["results"] == [
+        {"id": booking_id, "success": True, "status_code": 200, "detail": None, "status": "CONFIRMED"}
+    ]
+
+
+async def test_bulk_requires_ids(client, admin_headers):
+    resp = await client.post(f"{BOOKINGS_URL}bulk/cancel", json={"booking_ids": []}, headers=admin_headers)
+    assert resp.status_code == 422
+
+
+# ---------- Bulk import ----------
+
+IMPORT_URL = "/bookings/import"
+
+
+async def test_import_bookings_csv(client, admin_headers, test_property):
+    """Valid rows are imported and priced; invalid and overlapping rows are reported by row."""
+    pid = test_property["id"]
+    await client.post(BOOKINGS_URL, json=_booking_payload(pid, date(2026, 7, 1), date(2026, 7, 5)), headers=admin_headers)
+
+    csv_body = "\n".join([
+        "property_id,check_in,check_out,summary,external_id",
+        f"{pid},2026-06-01,2026-06-05,Guest A,ota-1",
+        f"{pid},2026-06-10,2026-06-08,Bad dates,",
+        f"{pid},2026-06-03,2026-06-06,Overlaps row 1,",
+        f"{pid},2026-07-02,2026-07-04,Overlaps existing,",
+        "00000000-0000-0000-0000-000000000000,2026-06-01,2026-06-03,Unknown property,",
+        f'{pid},2026-08-01,2026-08-03,"Guest, B",',
+    ])
+    resp = await client.post(IMPORT_URL, content=csv_body, headers={**admin_headers, "Content-Type": "text/csv"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["received"] == 6
+    assert data["imported"] == 2
+    assert [e["row"] for e in data["errors"]] == [2, 3, 4, 5]
+
+    resp = await client.get(f"/bookings/properties/{pid}/bookings", headers=admin_headers)
+    imported = {b["summary"]: b for b in resp.json()}
+    assert float(imported["Guest A"]["total_amount"]) == 400.0
+    assert float(imported["Guest, B"]["total_amount"]) == 200.0
+    assert imported["Guest A"]["ical_uid"].startswith(imported["Guest A"]["id"])
+
+    # Re-importing the same external_id is rejected as a duplicate
+    resp = await client.post(
+        IMPORT_URL,
+        content=f"property_id,check_in,check_out,summary,external_id\n{pid},2026-09-01,2026-09-03,Again,ota-1\n",
+        headers={**admin_headers, "Content-Type": "text/csv"},
+    )
+    assert resp.json()["imported"] == 0
+    assert resp.json()["errors"] == [{"row": 1, "error": "Reserva ya importada"}]
+
+
+async def test_import_bookings_duplicate_external_id_in_file(client, admin_headers, test_property):
+    """A repeated external_id within the file keeps the first row, even without overlapping dates."""
+    pid = test_property["id"]
+    csv_body = "\n".join([
+        "property_id,check_in,check_out,summary,external_id",
+        f"{pid},2026-06-01,2026-06-05,First,ota-7",
+        f"{pid},2026-06-10,2026-06-12,Repeated,ota-7",
+    ])
+    resp = await client.post(IMPORT_URL, content=csv_body, headers={**admin_headers, "Content-Type": "text/csv"})
+    assert resp.status_code == 200
+    assert resp.json()["imported"] == 1
+    assert resp.json()["errors"] == [{"row": 2, "error": "Reserva duplicada en el archivo"}]
+
+
+async def test_import_bookings_jsonl(client, admin_headers, test_property):
+    pid = test_property["id"]
+    body = "\n".join([
+        f'{{"property_id": "{pid}", "check_in": "2026-06-01", "check_out": "2026-06-03", "summary": "A"}}',
+        "not json",
+        "",
+        f'{{"property_id": "{pid}", "check_in": "2026-06-03", "check_out": "2026-06-05", "summary": "B", "status": "TENTATIVE"}}',
+    ])
+    resp = await client.post(
+        IMPORT_URL, content=body, headers={**admin_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["received"] == 3
+    assert data["imported"] == 2
+    assert [e["row"] for e in data["errors"]] == [2]
+
+
+async def test_import_bookings_csv_missing_columns(client, admin_headers):
+    resp = await client.post(
+        IMPORT_URL, content="property_id,summary\nx,y\n", headers={**admin_headers, "Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 400
+
+
+async def test_import_bookings_invalid_utf8(client, admin_headers, test_property):
+    body = f"property_id,check_in,check_out,summary\n{test_property['id']},2026-06-01,2026-06-05,Guest\xff\xfe\n"
+    resp = await client.post(
+        IMPORT_URL, content=body.encode("latin-1"), headers={**admin_headers, "Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 400
+    assert "UTF-8" in resp.json()["detail"]
+
+
+async def test_import_bookings_other_manager_property(client, manager_headers, test_property):
+    """Managers can only import into the properties they manage."""
+    resp = await client.post(
+        IMPORT_URL,
+        content=f"property_id,check_in,check_out,summary\n{test_property['id']},2026-06-01,2026-06-03,X\n",
+        headers={**manager_headers, "Content-Type": "text/csv"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["imported"] == 0
+    assert resp.json()["errors"] == [{"row": 1, "error": "Propiedad no encontrada"}]
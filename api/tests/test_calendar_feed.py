@@ -0,0 +1,99 @@
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from services.calendar_feed_service import CalendarFeedService
+
+
+def _feed_path(property_id: str) -> str:
+    return f"/properties/{property_id}/calendar.ics"
+
+
+async def _feed_url(client, headers, property_id: str) -> str:
+    resp = await client.get(f"/properties/{property_id}/calendar-feed", headers=headers)
+    assert resp.status_code == 200
+    return resp.json()["url"]
+
+
+async def _create_booking(client, headers, property_id: str, check_in: date, check_out: date) -> dict:
+    resp = await client.post(
+        "/bookings/",
+        json={
+            "property_id": property_id,
+            "check_in": check_in.isoformat(),
+            "check_out": check_out.isoformat(),
+            "summary": "Feed Booking",
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+async def test_calendar_feed_exports_bookings(client, admin_headers, test_property):
+    booking = await _create_booking(client, admin_headers, test_property["id"], date(2026, 6, 1), date(2026, 6, 5))
+    url = await _feed_url(client, admin_headers, test_property["id"])
+
+    resp = await client.get(url)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/calendar")
+    assert resp.headers["etag"]
+    assert resp.headers["last-modified"]
+    body = resp.text
+    assert "BEGIN:VEVENT" in body
+    assert f"UID:{booking['ical_uid']}" in body
+    assert "DTSTART;VALUE=DATE:20260601" in body
+    assert "DTEND;VALUE=DATE:20260605" in body
+
+
+async def test_calendar_feed_conditional_get(client, admin_headers, test_property):
+    await _create_booking(client, admin_headers, test_property["id"], date(2026, 6, 1), date(2026, 6, 5))
+    url = await _feed_url(client, admin_headers, test_property["id"])
+
+    first = await client.get(url)
+    etag = first.headers["etag"]
+
+    not_modified = await client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    since = await client.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+    if since.status_code == 200:
+        # The first poll fell in the second of the change, so it advertised the previous second
+        assert parsedate_to_datetime(since.headers["last-modified"]) > parsedate_to_datetime(first.headers["last-modified"])
+        since = await client.get(url, headers={"If-Modified-Since": since.headers["last-modified"]})
+    assert since.status_code == 304
+
+
+def test_calendar_feed_last_modified_within_the_change_second():
+    changed_at = datetime(2026, 6, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    during = CalendarFeedService._last_modified(changed_at, changed_at + timedelta(milliseconds=300))
+    after = CalendarFeedService._last_modified(changed_at, changed_at + timedelta(seconds=1))
+    assert during == datetime(2026, 6, 1, 11, 59, 59, tzinfo=timezone.utc)
+    assert after == datetime(2026, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+    # A second change in the same second is newer than anything advertised during it
+    assert not CalendarFeedService._not_modified('"2"', after, None, format_datetime(during, usegmt=True))
+
+
+async def test_calendar_feed_etag_changes_with_bookings(client, admin_headers, test_property):
+    booking = await _create_booking(client, admin_headers, test_property["id"], date(2026, 6, 1), date(2026, 6, 5))
+    url = await _feed_url(client, admin_headers, test_property["id"])
+    etag = (await client.get(url)).headers["etag"]
+
+    resp = await client.post(f"/bookings/{booking['id']}/cancel", headers=admin_headers)
+    assert resp.status_code == 200
+
+    resp = await client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert booking["ical_uid"] not in resp.text
+
+
+async def test_calendar_feed_invalid_token(client, admin_headers, test_property):
+    resp = await client.get(_feed_path(test_property["id"]), params={"token": "0" * 32})
+    assert resp.status_code == 404
+
+
+async def test_calendar_feed_url_requires_access(client, manager_headers, test_property):
+    resp = await client.get(f"/properties/{test_property['id']}/calendar-feed", headers=manager_headers)
+    assert resp.status_code == 403
@@ -0,0 +1,248 @@
+import httpcore
+import httpx
+import pytest
+
+from dependencies.http_client import BlockedHostError, PublicHostTransport, get_http_client
+from main import app
+
+
+FEED_URL = "https://www.airbnb.com/calendar/ical/123.ics"
+
+
+def _feed(*events: tuple[str, str, str]) -> str:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Airbnb Inc//Hosting Calendar//EN"]
+    for uid, start, end in events:
+        lines += [
+            "BEGIN:VEVENT",
+            f"DTSTART;VALUE=DATE:{start}",
+            f"DTEND;VALUE=DATE:{end}",
+            f"UID:{uid}",
+            "SUMMARY:Reserved",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
+
+
+class FakeFeed:
+    """Local stand-in for an OTA calendar endpoint, served through httpx.MockTransport."""
+
+    def __init__(self, body: str, status_code: int = 200):
+        self.body = body
+        self.status_code = status_code
+        self.version = 1
+        self.requests: list[httpx.Request] = []
+
+    def set(self, body: str) -> None:
+        self.body = body
+        self.version += 1
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = f'"v{self.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(self.status_code, text=self.body, headers={"ETag": etag})
+
+
+@pytest.fixture
+def fake_feed(client):
+    feed = FakeFeed(_feed())
+
+    async def override_http_client():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(feed.handler)) as http:
+            yield http
+
+    app.dependency_overrides[get_http_client] = override_http_client
+    return feed
+
+
+async def _add_source(client, headers, property_id: str) -> dict:
+    resp = await client.post(
+        f"/properties/{property_id}/calendar-sources",
+        json={"url": FEED_URL, "source": "AIRBNB"},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+async def _sync(client, headers, property_id: str, source_id: str) -> dict:
+    resp = await client.post(f"/properties/{property_id}/calendar-sources/{source_id}/sync", headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+async def _bookings(client, headers, property_id: str) -> list[dict]:
+    resp = await client.get(f"/bookings/properties/{property_id}/bookings", headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+async def test_sync_inserts_feed_events(client, admin_headers, test_property, fake_feed):
+    fake_feed.set(_feed(("a@airbnb.com", "20300101", "20300105"), ("b@airbnb.com", "20300110", "20300112")))
+    source = await _add_source(client, admin_headers, test_property["id"])
+
+    result = await _sync(client, admin_headers, test_property["id"], source["id"])
+    assert result["inserted"] == 2
+    assert result["error"] is None
+
+    bookings = await _bookings(client, admin_headers, test_property["id"])
+    assert {b["external_id"] for b in bookings} == {"a@airbnb.com", "b@airbnb.com"}
+    assert all(b["source"] == "AIRBNB" and b["ical_url"] == FEED_URL for b in bookings)
+    assert all(b["last_synced_at"] for b in bookings)
+
+
+async def test_sync_unchanged_feed_is_not_modified(client, admin_headers, test_property, fake_feed):
+    fake_feed.set(_feed(("a@airbnb.com", "20300101", "20300105")))
+    source = await _add_source(client, admin_headers, test_property["id"])
+    await _sync(client, admin_headers, test_property["id"], source["id"])
+
+    result = await _sync(client, admin_headers, test_property["id"], source["id"])
+    assert result["not_modified"] is True
+    assert fake_feed.requests[-1].headers["if-none-match"] == f'"v{fake_feed.version}"'
+    assert len(await _bookings(client, admin_headers, test_property["id"])) == 1
+
+
+async def test_sync_applies_only_differences(client, admin_headers, test_property, fake_feed):
+    fake_feed.set(_feed(
+        ("a@airbnb.com", "20300101", "20300105"),
+        ("b@airbnb.com", "20300110", "20300112"),
+        ("c@airbnb.com", "20300120", "20300122"),
+    ))
+    source = await _add_source(client, admin_headers, test_property["id"])
+    await _sync(client, admin_headers, test_property["id"], source["id"])
+    before = {b["external_id"]: b for b in await _bookings(client, admin_headers, test_property["id"])}
+
+    # b moves, c disappears (cancelled at the OTA), d is new
+    fake_feed.set(_feed(
+        ("a@airbnb.com", "20300101", "20300105"),
+        ("b@airbnb.com", "20300111", "20300114"),
+        ("d@airbnb.com", "20300201", "20300203"),
+    ))
+    result = await _sync(client, admin_headers, test_property["id"], source["id"])
+    assert (result["inserted"], result["updated"], result["cancelled"], result["unchanged"]) == (1, 1, 1, 1)
+
+    after = {b["external_id"]: b for b in await _bookings(client, admin_headers, test_property["id"])}
+    assert after["a@airbnb.com"]["id"] == before["a@airbnb.com"]["id"]
+    assert after["a@airbnb.com"]["updated_at"] == before["a@airbnb.com"]["updated_at"]
+    assert after["b@airbnb.com"]["id"] == before["b@airbnb.com"]["id"]
+    assert (after["b@airbnb.com"]["check_in"], after["b@airbnb.com"]["check_out"]) == ("2030-01-11", "2030-01-14")
+    assert after["c@airbnb.com"]["status"] == "CANCELLED"
+    assert after["d@airbnb.com"]["status"] == "CONFIRMED"
+
+
+async def test_sync_reports_overlap_with_local_booking(client, admin_headers, test_property, fake_feed):
+    resp = await client.post(
+        "/bookings/",
+        json={
+            "property_id": test_property["id"],
+            "check_in": "2030-01-02",
+            "check_out": "2030-01-04",
+            "summary": "Direct",
+        },
+        headers=admin_headers,
+    )
+    assert resp.status_code == 201
+    fake_feed.set(_feed(("a@airbnb.com", "20300101", "20300105"), ("b@airbnb.com", "20300110", "20300112")))
+    source = await _add_source(client, admin_headers, test_property["id"])
+
+    result = await _sync(client, admin_headers, test_property["id"], source["id"])
+    assert result["inserted"] == 1
+    assert result["conflicts"] == [
+        {"uid": "a@airbnb.com", "error": "Conflicto de fechas con una reserva existente"}
+    ]
+
+
+async def test_sync_ignores_own_export_events(client, admin_headers, test_property, fake_feed):
+    resp = await client.post(
+        "/bookings/",
+        json={
+            "property_id": test_property["id"],
+            "check_in": "2030-01-02",
+            "check_out": "2030-01-04",
+            "summary": "Direct",
+        },
+        headers=admin_headers,
+    )
+    own = resp.json()
+    fake_feed.set(_feed((own["ical_uid"], "20300102", "20300104")))
+    source = await _add_source(client, admin_headers, test_property["id"])
+
+    result = await _sync(client, admin_headers, test_property["id"], source["id"])
+    assert (result["inserted"], result["conflicts"]) == (0, [])
+
+
+async def test_sync_fetch_error_is_recorded(client, admin_headers, test_property, fake_feed):
+    fake_feed.status_code = 500
+    source = await _add_source(client, admin_headers, test_property["id"])
+
+    result = await _sync(client, admin_headers, test_property["id"], source["id"])
+    assert result["error"].startswith("Error al descargar el calendario")
+
+    resp = await client.get(f"/properties/{test_property['id']}/calendar-sources", headers=admin_headers)
+    assert resp.json()[0]["last_error"] == result["error"]
+
+
+async def test_add_calendar_source_duplicate(client, admin_headers, test_property):
+    await _add_source(client, admin_headers, test_property["id"])
+    resp = await client.post(
+        f"/properties/{test_property['id']}/calendar-sources",
+        json={"url": FEED_URL, "source": "AIRBNB"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 409
+
+
+async def test_add_calendar_source_owner_forbidden(client, owner_headers, test_property):
+    resp = await client.post(
+        f"/properties/{test_property['id']}/calendar-sources",
+        json={"url": FEED_URL, "source": "AIRBNB"},
+        headers=owner_headers,
+    )
+    assert resp.status_code == 403
+
+
+@pytest.mark.parametrize("url", [
+    "http://www.airbnb.com/calendar/ical/123.ics",
+    "https://127.0.0.1/calendar.ics",
+    "https://169.254.169.254/latest/meta-data",
+    "https://[::1]/calendar.ics",
+    "https://localhost/calendar.ics",
+])
+async def test_add_calendar_source_rejects_non_public_urls(client, admin_headers, test_property, url):
+    resp = await client.post(
+        f"/properties/{test_property['id']}/calendar-sources",
+        json={"url": url, "source": "AIRBNB"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 422
+
+
+class RecordingBackend(httpcore.AsyncMockBackend):
+    """Canned HTTP responses in place of sockets, recording the address of each connection."""
+
+    def __init__(self, buffer: list[bytes]):
+        super().__init__(buffer)
+        self.connected: list[str] = []
+
+    async def connect_tcp(self, host, port, *args, **kwargs):
+        self.connected.append(host)
+        return await super().connect_tcp(host, port, *args, **kwargs)
+
+
+async def test_feed_transport_blocks_redirects_to_private_hosts():
+    backend = RecordingBackend([
+        b"HTTP/1.1 302 Found\r\n",
+        b"Location: https://169.254.169.254/latest/meta-data\r\n",
+        b"Content-Length: 0\r\n\r\n",
+    ])
+    transport = PublicHostTransport(httpx.Limits(max_connections=2), network_backend=backend)
+    async with httpx.AsyncClient(transport=transport, follow_redirects=True) as http:
+        with pytest.raises(BlockedHostError):
+            await http.get("https://93.184.216.34/calendar.ics")
+        with pytest.raises(BlockedHostError):
+            await http.get("http://93.184.216.34/calendar.ics")
+        with pytest.raises(BlockedHostError):
+            await http.get("https://localhost/calendar.ics")
+    assert backend.connected == ["93.184.216.34"]
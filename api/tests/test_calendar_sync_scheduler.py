@@ -0,0 +1,122 @@
+import asyncio
+import time
+from uuid import UUID
+
+import httpx
+
+from services.calendar_sync_scheduler import CalendarSyncScheduler
+from tests.conftest import TestAsyncSession
+
+
+def _feed(uid: str, start: str, end: str) -> str:
+    return "\r\n".join([
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTART;VALUE=DATE:{start}",
+        f"DTEND;VALUE=DATE:{end}",
+        "SUMMARY:Reserved",
+        "END:VEVENT",
+        "END:VCALENDAR",
+    ]) + "\r\n"
+
+
+async def _add_source(client, headers, property_id: str, url: str) -> dict:
+    resp = await client.post(
+        f"/properties/{property_id}/calendar-sources",
+        json={"url": url, "source": "BOOKING"},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+async def test_scheduler_polls_feeds_with_bounded_workers(client, admin_headers, test_property):
+    for n in range(6):
+        await _add_source(client, admin_headers, test_property["id"], f"https://ota.example/feed/{n}.ics")
+
+    in_flight = max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        n = int(request.url.path.split("/")[-1].split(".")[0])
+        return httpx.Response(200, text=_feed(f"{n}@ota", f"203001{n + 1:02d}", f"203001{n + 2:02d}"))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        scheduler = CalendarSyncScheduler(TestAsyncSession, http, interval=0, workers=3)
+        await scheduler.poll_due()
+
+    assert max_in_flight <= 3
+    metrics = scheduler.metrics()
+    assert len(metrics) == 6
+    assert all(m["polls"] == 1 and m["failures"] == 0 for m in metrics)
+
+    resp = await client.get(f"/bookings/properties/{test_property['id']}/bookings", headers=admin_headers)
+    assert len(resp.json()) == 6
+
+
+async def test_scheduler_sends_conditional_requests(client, admin_headers, test_property):
+    await _add_source(client, admin_headers, test_property["id"], "https://ota.example/feed.ics")
+    seen_etags = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_etags.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, text=_feed("a@ota", "20300101", "20300103"), headers={"ETag": '"v1"'})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        scheduler = CalendarSyncScheduler(TestAsyncSession, http, interval=0)
+        await scheduler.poll_due()
+        await scheduler.poll_due()
+
+    assert seen_etags == [None, '"v1"']
+    assert scheduler.metrics()[0]["failures"] == 0
+
+
+async def test_scheduler_backs_off_failing_feeds(client, admin_headers, test_property):
+    await _add_source(client, admin_headers, test_property["id"], "https://ota.example/down.ics")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(503))) as http:
+        scheduler = CalendarSyncScheduler(TestAsyncSession, http, interval=0, jitter=0, retry=10, max_backoff=15)
+        await scheduler.refresh_sources()
+        state = next(iter(scheduler.feeds.values()))
+
+        await scheduler.poll(state)
+        assert state.failures == 1
+        assert 9 <= state.next_poll - time.monotonic() <= 10
+
+        await scheduler.poll(state)
+        assert state.failures == 2
+        assert 14 <= state.next_poll - time.monotonic() <= 15  # 20s capped by max_backoff
+
+    metrics = scheduler.metrics()[0]
+    assert metrics["failures"] == 2
+    assert metrics["last_error"].startswith("Error al descargar el calendario")
+
+
+async def test_scheduler_records_unexpected_failures(client, admin_headers, test_property):
+    source = await _add_source(client, admin_headers, test_property["id"], "https://ota.example/broken.ics")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise RuntimeError("feed exploded")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        scheduler = CalendarSyncScheduler(TestAsyncSession, http, interval=0)
+        await scheduler.refresh_sources()
+        await scheduler.poll(scheduler.feeds[UUID(source["id"])])
+
+    resp = await client.get(f"/properties/{test_property['id']}/calendar-sources", headers=admin_headers)
+    assert resp.json()[0]["last_error"] == "feed exploded"
+
+
+async def test_sync_status_when_disabled(client, admin_headers):
+    resp = await client.get("/calendar-sources/sync-status", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json()["enabled"] is False
+    assert resp.json()["feeds"] == []
@@ -0,0 +1,196 @@
+import pytest
+
+
+async def _create_property(client, headers, name: str, base_price: str = "100.00") -> dict:
+    resp = await client.post(
+        "/properties/",
+        json={"name": name, "address": "123 Test St", "base_price": base_price, "avg_stay_days": 3},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+# ---------- Calendar grid ----------
+
+async def test_portfolio_calendar_grid(client, admin_headers):
+    first = await _create_property(client, admin_headers, "First", "100.00")
+    second = await _create_property(client, admin_headers, "Second", "200.00")
+    await client.post(
+        "/bookings/",
+        json={"property_id": second["id"], "check_in": "2026-06-02", "check_out": "2026-06-03", "summary": "Guest"},
+        headers=admin_headers,
+    )
+
+    resp = await client.get(
+        "/portfolio/calendar",
+        params={
+            "property_ids": [first["id"], second["id"]],
+            "start_date": "2026-06-01",
+            "end_date": "2026-06-03",
+        },
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    rows = resp.json()
+    assert [r["property_id"] for r in rows] == [first["id"], second["id"]]
+    assert [float(d["price"]) for d in rows[0]["days"]] == [100.0] * 3
+    assert [float(d["price"]) for d in rows[1]["days"]] == [200.0] * 3
+    assert [d["status"] for d in rows[1]["days"]] == ["AVAILABLE", "RESERVED", "AVAILABLE"]
+
+
+async def test_portfolio_calendar_matches_single_calendar(client, admin_headers, test_property):
+    pid = test_property["id"]
+    await client.post(
+        f"/properties/{pid}/pricing-rules",
+        json={"name": "Half", "start_date": "2026-06-02", "end_date": "2026-06-05", "profitability_percent": "50.00"},
+        headers=admin_headers,
+    )
+    params = {"start_date": "2026-06-01", "end_date": "2026-06-07"}
+
+    grid = await client.get("/portfolio/calendar", params={**params, "property_ids": [pid]}, headers=admin_headers)
+    single = await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)
+    assert grid.json()[0]["days"] == single.json()
+
+
+async def test_portfolio_calendar_defaults_to_managed(client, admin_headers, manager_headers):
+    await _create_property(client, admin_headers, "Admin Property")
+    mine = await _create_property(client, manager_headers, "Manager Property")
+
+    resp = await client.get(
+        "/portfolio/calendar",
+        params={"start_date": "2026-06-01", "end_date": "2026-06-02"},
+        headers=manager_headers,
+    )
+    assert resp.status_code == 200
+    assert [r["property_id"] for r in resp.json()] == [mine["id"]]
+
+
+async def test_portfolio_calendar_forbidden_for_other_manager(client, admin_headers, manager_headers):
+    other = await _create_property(client, admin_headers, "Admin Property")
+    resp = await client.get(
+        "/portfolio/calendar",
+        params={"property_ids": [other["id"]], "start_date": "2026-06-01", "end_date": "2026-06-02"},
+        headers=manager_headers,
+    )
+    assert resp.status_code == 403
+
+
+@pytest.mark.parametrize("end_date", ["2026-05-31", "2027-06-02"])
+async def test_portfolio_calendar_invalid_range(client, admin_headers, test_property, end_date):
+    resp = await client.get(
+        "/portfolio/calendar",
+        params={"property_ids": [test_property["id"]], "start_date": "2026-06-01", "end_date": end_date},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 400
+
+
+# ---------- Financial rollup ----------
+
+async def test_portfolio_financial_rollup(client, admin_headers):
+    first = await _create_property(client, admin_headers, "First", "100.00")
+    second = await _create_property(client, admin_headers, "Second", "200.00")
+    for prop in (first, second):
+        await client.post(
+            "/bookings/",
+            json={"property_id": prop["id"], "check_in": "2026-06-10", "check_out": "2026-06-13", "summary": "Guest"},
+            headers=admin_headers,
+        )
+
+    resp = await client.get("/portfolio/financial-summary", params={"year": 2026, "month": 6}, headers=admin_headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    rows = {r["property_id"]: r for r in data["properties"]}
+    assert set(rows) == {first["id"], second["id"]}
+
+    for prop in (first, second):
+        single = await client.get(
+            f"/properties/{prop['id']}/financial-summary",
+            params={"year": 2026, "month": 6},
+            headers=admin_headers,
+        )
+        row = rows[prop["id"]]
+        assert {k: v for k, v in row.items() if k not in ("property_id", "property_name")} == single.json()
+
+    totals = data["totals"]
+    assert totals["properties"] == 2
+    assert totals["occupied_days"] == 6
+    assert totals["available_days"] == 60
+    assert float(totals["occupancy_rate"]) == 10.0
+    assert float(totals["total_income"]) == 900.0
+
+
+async def test_portfolio_financial_rollup_owned(client, manager_headers, owner_user, owner_headers):
+    resp = await client.post(
+        "/properties/",
+        json={"name": "Owned", "address": "123 Test St", "base_price": "100.00", "owner_id": str(owner_user.id)},
+        headers=manager_headers,
+    )
+    owned = resp.json()
+
+    resp = await client.get(
+        "/portfolio/financial-summary",
+        params={"year": 2026, "month": 6, "scope": "owned"},
+        headers=owner_headers,
+    )
+    assert resp.status_code == 200
+    assert [r["property_id"] for r in resp.json()["properties"]] == [owned["id"]]
+
+    resp = await client.get("/portfolio/financial-summary", params={"year": 2026, "month": 6}, headers=owner_headers)
+    assert resp.json()["totals"]["properties"] == 0
+
+
+# ---------- Availability search ----------
+
+async def test_portfolio_availability_search(client, manager_headers):
+    free = await _create_property(client, manager_headers, "Free", "100.00")
+    busy = await _create_property(client, manager_headers, "Busy", "200.00")
+    turnover = await _create_property(client, manager_headers, "Turnover", "150.00")
+    for prop, check_in, check_out in [
+        (busy, "2026-06-09", "2026-06-11"),
+        (turnover, "2026-06-07", "2026-06-10"),  # checks out on the arrival day
+    ]:
+        resp = await client.post(
+            "/bookings/",
+            json={"property_id": prop["id"], "check_in": check_in, "check_out": check_out, "summary": "Guest"},
+            headers=manager_headers,
+        )
+        assert resp.status_code == 201
+
+    resp = await client.get(
+        "/portfolio/availability",
+        params={"check_in": "2026-06-10", "check_out": "2026-06-12"},
+        headers=manager_headers,
+    )
+    assert resp.status_code == 200
+    results = resp.json()
+    assert [r["property_id"] for r in results] == [free["id"], turnover["id"]]
+    assert [float(r["total_amount"]) for r in results] == [200.0, 300.0]
+    assert all(r["nights"] == 2 for r in results)
+
+
+async def test_portfolio_availability_ignores_cancelled(client, admin_headers):
+    prop = await _create_property(client, admin_headers, "Cancelled Stay")
+    resp = await client.post(
+        "/bookings/",
+        json={"property_id": prop["id"], "check_in": "2026-06-10", "check_out": "2026-06-12", "summary": "Guest"},
+        headers=admin_headers,
+    )
+    await client.post(f"/bookings/{resp.json()['id']}/cancel", headers=admin_headers)
+
+    resp = await client.get(
+        "/portfolio/availability",
+        params={"check_in": "2026-06-10", "check_out": "2026-06-12", "property_ids": [prop["id"]]},
+        headers=admin_headers,
+    )
+    assert [r["property_id"] for r in resp.json()] == [prop["id"]]
+
+
+async def test_portfolio_availability_invalid_range(client, admin_headers):
+    resp = await client.get(
+        "/portfolio/availability",
+        params={"check_in": "2026-06-12", "check_out": "2026-06-10"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 400
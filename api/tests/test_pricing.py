@@ -1,5 +1,14 @@
+import json
 import pytest
 from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import update
+
+from core.config import settings
+from models.property_base_price import PropertyBasePrice
+from tests.conftest import TestAsyncSession
 
 
 def _rules_url(property_id: str) -> str:
@@ -131,3 +140,528 @@ async def test_financial_summary(client, admin_headers, test_property):
     assert "total_income" in data
     assert "costs" in data
     assert "net_profit" in data
+
+
+async def test_financial_summary_counts_only_month_bookings(client, admin_headers, test_property):
+    """Bookings outside the month and cancelled bookings are not part of the summary."""
+    pid = test_property["id"]
+    ids = {}
+    for check_in, check_out in [("2026-06-10", "2026-06-12"), ("2026-06-20", "2026-06-22"), ("2026-08-01", "2026-08-03")]:
+        resp = await client.post(
+            "/bookings/",
+            json={"property_id": pid, "check_in": check_in, "check_out": check_out, "summary": "Guest"},
+            headers=admin_headers,
+        )
+        assert resp.status_code == 201
+        ids[check_in] = resp.json()["id"]
+    await client.post(f"/bookings/{ids['2026-06-20']}/cancel", headers=admin_headers)
+
+    resp = await client.get(
+        f"/properties/{pid}/financial-summary",
+        params={"year": 2026, "month": 6},
+        headers=admin_headers,
+    )
+    data = resp.json()
+    assert data["total_bookings"] == 1
+    assert data["occupied_days"] == 2
+    assert float(data["total_income"]) == 200.0
+
+
+async def test_financial_summary_range_matches_monthly(client, admin_headers, test_property):
+    """Each month of the range equals the single-month summary, including bookings crossing months."""
+    pid = test_property["id"]
+    await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+    await client.post(
+        "/bookings/",
+        json={"property_id": pid, "check_in": "2026-05-28", "check_out": "2026-06-04", "summary": "Guest"},
+        headers=admin_headers,
+    )
+
+    resp = await client.get(
+        f"/properties/{pid}/financial-summary/range",
+        params={"start_year": 2026, "start_month": 5, "end_year": 2026, "end_month": 7},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    months = resp.json()
+    assert [(m["year"], m["month"]) for m in months] == [(2026, 5), (2026, 6), (2026, 7)]
+    for summary in months:
+        single = await client.get(
+            f"/properties/{pid}/financial-summary",
+            params={"year": summary["year"], "month": summary["month"]},
+            headers=admin_headers,
+        )
+        assert single.json() == summary
+
+
+async def test_financial_summary_follows_booking_ledger(client, admin_headers, test_property):
+    """The booking_nights ledger is repriced by rule changes and cleared on cancellation."""
+    pid = test_property["id"]
+    params = {"year": 2026, "month": 6}
+    resp = await client.post(
+        "/bookings/",
+        json={"property_id": pid, "check_in": "2026-06-10", "check_out": "2026-06-13", "summary": "Guest"},
+        headers=admin_headers,
+    )
+    booking_id = resp.json()["id"]
+
+    async def summary():
+        resp = await client.get(f"/properties/{pid}/financial-summary", params=params, headers=admin_headers)
+        assert resp.status_code == 200
+        return resp.json()
+
+    data = await summary()
+    assert data["occupied_days"] == 3
+    assert float(data["total_income"]) == 300.0
+
+    await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+    data = await summary()
+    assert data["occupied_days"] == 3
+    assert float(data["total_income"]) == 240.0
+
+    await client.post(f"/bookings/{booking_id}/cancel", headers=admin_headers)
+    data = await summary()
+    assert data["total_bookings"] == 0
+    assert float(data["total_income"]) == 0.0
+
+
+async def test_closed_month_snapshot_invalidated_by_booking_move(client, admin_headers, test_property):
+    """A stored closed-month summary is dropped when a booking moves out of (or into) the month."""
+    pid = test_property["id"]
+    resp = await client.post(
+        "/bookings/",
+        json={"property_id": pid, "check_in": "2024-03-10", "check_out": "2024-03-13", "summary": "Guest"},
+        headers=admin_headers,
+    )
+    booking_id = resp.json()["id"]
+
+    async def summary(month):
+        resp = await client.get(
+            f"/properties/{pid}/financial-summary", params={"year": 2024, "month": month}, headers=admin_headers
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    assert (await summary(3))["occupied_days"] == 3
+    assert (await summary(3))["occupied_days"] == 3  # served from the snapshot
+
+    await client.put(
+        f"/bookings/{booking_id}",
+        json={"check_in": "2024-04-10", "check_out": "2024-04-12"},
+        headers=admin_headers,
+    )
+    assert (await summary(3))["occupied_days"] == 0
+    assert (await summary(4))["occupied_days"] == 2
+
+    resp = await client.get(
+        f"/properties/{pid}/financial-summary/range",
+        params={"start_year": 2024, "start_month": 3, "end_year": 2024, "end_month": 5},
+        headers=admin_headers,
+    )
+    assert [m["occupied_days"] for m in resp.json()] == [0, 2, 0]
+
+
+async def test_financial_summary_range_invalid(client, admin_headers, test_property):
+    resp = await client.get(
+        f"/properties/{test_property['id']}/financial-summary/range",
+        params={"start_year": 2026, "start_month": 6, "end_year": 2026, "end_month": 5},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 400
+
+
+async def test_pricing_calendar_rule_boundaries(client, admin_headers, test_property):
+    """Days outside the rule period fall back to 100%; days inside use the rule percent."""
+    pid = test_property["id"]
+    await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+
+    resp = await client.get(
+        f"/properties/{pid}/calendar",
+        params={"start_date": "2026-05-30", "end_date": "2026-06-02"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    days = {d["date"]: d for d in resp.json()}
+    assert days["2026-05-31"]["rule_name"] is None
+    assert float(days["2026-05-31"]["price"]) == 100.0
+    assert days["2026-06-01"]["rule_name"] == "Summer Rule"
+    assert float(days["2026-06-01"]["price"]) == 80.0
+
+
+async def test_pricing_calendar_follows_cost_versions(client, admin_headers, test_property):
+    """The floor price switches on the day a new cost version starts."""
+    pid = test_property["id"]
+    cost_resp = await client.post(
+        f"/properties/{pid}/costs",
+        json={
+            "name": "Breakfast",
+            "category": "PER_DAY_RESERVATION",
+            "calculation_type": "FIXED_AMOUNT",
+            "value": "10.00",
+        },
+        headers=admin_headers,
+    )
+    cost_id = cost_resp.json()["id"]
+    await client.post(
+        f"/costs/{cost_id}/modify",
+        json={"value": "20.00", "start_date": "2026-06-03"},
+        headers=admin_headers,
+    )
+
+    resp = await client.get(
+        f"/properties/{pid}/calendar",
+        params={"start_date": "2026-06-01", "end_date": "2026-06-04"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    floors = [float(d["floor_price"]) for d in resp.json()]
+    assert floors == [10.0, 10.0, 20.0, 20.0]
+
+
+# ---------- Price quote ----------
+
+async def test_price_quote_spans_rule_boundary(client, admin_headers, test_property):
+    """Nights before the rule are priced at 100%, nights inside it at the rule percent."""
+    pid = test_property["id"]
+    await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+
+    resp = await client.get(
+        f"/properties/{pid}/price-quote",
+        params={"check_in": "2026-05-31", "check_out": "2026-06-03"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["nights"] == 3
+    assert float(data["total_amount"]) == 260.0
+
+
+async def test_batch_price_quotes_match_single_quotes(client, admin_headers, test_property):
+    pid = test_property["id"]
+    await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+    other = await client.post(
+        "/properties/",
+        json={"name": "Other", "address": "456 Test St", "base_price": "250.00", "avg_stay_days": 3},
+        headers=admin_headers,
+    )
+    ranges = [
+        (pid, "2026-05-30", "2026-06-02"),
+        (pid, "2026-06-01", "2026-06-03"),
+        (other.json()["id"], "2026-05-30", "2026-06-02"),
+        (pid, "2026-05-30", "2026-06-02"),
+    ]
+
+    resp = await client.post(
+        "/pricing/price-quotes",
+        json={"quotes": [{"property_id": p, "check_in": ci, "check_out": co} for p, ci, co in ranges]},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    quotes = resp.json()
+    assert [(q["property_id"], q["check_in"], q["check_out"]) for q in quotes] == ranges
+    for (p, ci, co), quote in zip(ranges, quotes):
+        single = await client.get(
+            f"/properties/{p}/price-quote", params={"check_in": ci, "check_out": co}, headers=admin_headers
+        )
+        assert single.json() == {"total_amount": quote["total_amount"], "nights": quote["nights"]}
+    assert float(quotes[0]["total_amount"]) == 280.0
+    assert float(quotes[2]["total_amount"]) == 750.0
+
+
+async def test_batch_price_quotes_unknown_property(client, admin_headers):
+    resp = await client.post(
+        "/pricing/price-quotes",
+        json={"quotes": [{
+            "property_id": "00000000-0000-0000-0000-000000000000",
+            "check_in": "2026-06-01",
+            "check_out": "2026-06-03",
+        }]},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 404
+
+
+async def test_batch_price_quotes_invalid_range(client, admin_headers, test_property):
+    resp = await client.post(
+        "/pricing/price-quotes",
+        json={"quotes": [{"property_id": test_property["id"], "check_in": "2026-06-03", "check_out": "2026-06-01"}]},
+        headers=admin_headers,
+    )
+    assert resp.status_code in (400, 422)
+
+
+async def test_pricing_calendar_refreshes_after_rule_changes(client, admin_headers, test_property):
+    """Materialized nightly prices are rebuilt when a rule is created, updated or deleted."""
+    pid = test_property["id"]
+    params = {"start_date": "2026-06-01", "end_date": "2026-06-03"}
+
+    async def prices():
+        resp = await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)
+        assert resp.status_code == 200
+        return [float(d["price"]) for d in resp.json()]
+
+    assert await prices() == [100.0, 100.0, 100.0]
+
+    create_resp = await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+    rule_id = create_resp.json()["id"]
+    assert await prices() == [80.0, 80.0, 80.0]
+
+    await client.put(f"/pricing-rules/{rule_id}", json={"profitability_percent": "50.00"}, headers=admin_headers)
+    assert await prices() == [50.0, 50.0, 50.0]
+
+    await client.delete(f"/pricing-rules/{rule_id}", headers=admin_headers)
+    assert await prices() == [100.0, 100.0, 100.0]
+
+
+async def test_pricing_calendar_refreshes_after_avg_stay_change(client, admin_headers, test_property):
+    """Changing avg_stay_days re-amortizes per-reservation costs into materialized floor prices."""
+    pid = test_property["id"]
+    await client.post(
+        f"/properties/{pid}/costs",
+        json={
+            "name": "Cleaning",
+            "category": "PER_RESERVATION",
+            "calculation_type": "FIXED_AMOUNT",
+            "value": "30.00",
+        },
+        headers=admin_headers,
+    )
+    params = {"start_date": "2026-06-01", "end_date": "2026-06-01"}
+
+    resp = await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)
+    assert float(resp.json()[0]["floor_price"]) == 10.0
+
+    await client.put(f"/properties/{pid}", json={"avg_stay_days": 6}, headers=admin_headers)
+    resp = await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)
+    assert float(resp.json()[0]["floor_price"]) == 5.0
+
+
+async def test_sql_pricing_backend_matches_python(client, admin_headers, test_property, monkeypatch):
+    """Nights materialized by the generate_series query equal the ones from the Python engine."""
+    pid = test_property["id"]
+    await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+    for name, category, value in [
+        ("Rent", "RECURRING_MONTHLY", "900.00"),
+        ("Cleaning", "PER_RESERVATION", "35.00"),
+        ("Breakfast", "PER_DAY_RESERVATION", "7.50"),
+    ]:
+        await client.post(
+            f"/properties/{pid}/costs",
+            json={"name": name, "category": category, "calculation_type": "FIXED_AMOUNT", "value": value},
+            headers=admin_headers,
+        )
+    params = {"start_date": "2026-05-25", "end_date": "2026-06-05"}
+
+    python_days = (await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)).json()
+
+    # Rebuild the materialized nights with the SQL backend
+    monkeypatch.setattr(settings, "PRICING_BACKEND", "sql")
+    await client.put(f"/properties/{pid}", json={"avg_stay_days": 3}, headers=admin_headers)
+    sql_days = (await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)).json()
+
+    assert sql_days == python_days
+    quote = await client.get(
+        f"/properties/{pid}/price-quote", params={"check_in": "2026-05-30", "check_out": "2026-06-03"}, headers=admin_headers
+    )
+    assert quote.status_code == 200
+
+
+async def test_sql_pricing_backend_matches_python_with_overlapping_base_prices(
+    client, admin_headers, test_property, monkeypatch
+):
+    """Both backends pick the same version where base prices overlap and fall back to the property's price."""
+    pid = UUID(test_property["id"])
+    async with TestAsyncSession() as db:
+        await db.execute(
+            update(PropertyBasePrice).where(PropertyBasePrice.property_id == pid).values(is_active=False)
+        )
+        db.add_all([
+            PropertyBasePrice(
+                property_id=pid, value=Decimal("180.00"), is_active=True,
+                start_date=date(2026, 6, 5), end_date=date(2026, 6, 20),
+            ),
+            PropertyBasePrice(
+                property_id=pid, value=Decimal("140.00"), is_active=True,
+                start_date=date(2026, 6, 1), end_date=date(2026, 6, 10),
+            ),
+        ])
+        await db.commit()
+    params = {"start_date": "2026-05-25", "end_date": "2026-06-25"}
+
+    python_days = (await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)).json()
+    prices = {day["date"]: float(day["price"]) for day in python_days}
+    assert prices["2026-05-31"] == 100.0
+    assert prices["2026-06-07"] == 140.0  # Overlap: the version starting first wins
+    assert prices["2026-06-15"] == 180.0
+
+    monkeypatch.setattr(settings, "PRICING_BACKEND", "sql")
+    await client.put(f"/properties/{pid}", json={"avg_stay_days": 3}, headers=admin_headers)
+    sql_days = (await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)).json()
+
+    assert sql_days == python_days
+
+
+# ---------- Calendar cache ----------
+
+async def test_pricing_calendar_cache_hit_and_booking_invalidation(client, admin_headers, test_property):
+    """A repeated calendar read is served from cache; a new booking bumps the epoch."""
+    pid = test_property["id"]
+    params = {"start_date": "2026-06-01", "end_date": "2026-06-03"}
+
+    await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)
+    before = (await client.get("/pricing/cache-stats", headers=admin_headers)).json()
+
+    resp = await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)
+    assert all(d["status"] == "AVAILABLE" for d in resp.json())
+    after = (await client.get("/pricing/cache-stats", headers=admin_headers)).json()
+    assert after["hits"] == before["hits"] + 1
+
+    await client.post(
+        "/bookings/",
+        json={"property_id": pid, "check_in": "2026-06-02", "check_out": "2026-06-03", "summary": "Guest"},
+        headers=admin_headers,
+    )
+    resp = await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)
+    assert [d["status"] for d in resp.json()] == ["AVAILABLE", "RESERVED", "AVAILABLE"]
+
+
+async def test_pricing_calendar_stream_matches_list(client, admin_headers, test_property):
+    """Streamed NDJSON days equal the JSON list, across chunk and rule boundaries."""
+    pid = test_property["id"]
+    await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+    params = {"start_date": "2026-01-01", "end_date": "2026-12-31"}
+
+    listed = await client.get(f"/properties/{pid}/calendar", params=params, headers=admin_headers)
+    streamed = await client.get(
+        f"/properties/{pid}/calendar", params={**params, "stream": True}, headers=admin_headers
+    )
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in streamed.text.splitlines()] == listed.json()
+
+
+async def test_pricing_calendar_stream_by_accept_header(client, admin_headers, test_property):
+    resp = await client.get(
+        f"/properties/{test_property['id']}/calendar",
+        params={"start_date": "2026-01-01", "end_date": "2028-12-31"},
+        headers={**admin_headers, "Accept": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    days = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(days) == 1096
+    assert days[0]["date"] == "2026-01-01"
+    assert days[-1]["date"] == "2028-12-31"
+
+
+async def test_pricing_calendar_long_range_requires_stream(client, admin_headers, test_property):
+    resp = await client.get(
+        f"/properties/{test_property['id']}/calendar",
+        params={"start_date": "2026-01-01", "end_date": "2028-12-31"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 400
+
+
+async def test_pricing_calendar_stream_range_is_capped(client, admin_headers, test_property):
+    resp = await client.get(
+        f"/properties/{test_property['id']}/calendar",
+        params={"start_date": "2026-01-01", "end_date": "2036-12-31", "stream": True},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 400
+
+
+async def test_pricing_calendar_stream_unknown_property(client, admin_headers):
+    resp = await client.get(
+        "/properties/00000000-0000-0000-0000-000000000000/calendar",
+        params={"start_date": "2026-01-01", "end_date": "2026-01-31", "stream": True},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 404
+
+
+async def test_pricing_calendar_exposes_booking_per_day(client, admin_headers, test_property):
+    """Reserved days carry the occupying booking; back-to-back stays switch on the turnover day."""
+    pid = test_property["id"]
+    ids = []
+    for check_in, check_out in [("2026-06-02", "2026-06-04"), ("2026-06-04", "2026-06-05")]:
+        resp = await client.post(
+            "/bookings/",
+            json={"property_id": pid, "check_in": check_in, "check_out": check_out, "summary": "Guest"},
+            headers=admin_headers,
+        )
+        ids.append(resp.json()["id"])
+
+    resp = await client.get(
+        f"/properties/{pid}/calendar",
+        params={"start_date": "2026-06-01", "end_date": "2026-06-05"},
+        headers=admin_headers,
+    )
+    days = resp.json()
+    assert [d["status"] for d in days] == ["AVAILABLE", "RESERVED", "RESERVED", "RESERVED", "AVAILABLE"]
+    assert [d["booking_id"] for d in days] == [None, ids[0], ids[0], ids[1], None]
+    assert days[1]["booking_status"] == "CONFIRMED"
+    assert days[0]["booking_status"] is None
+
+
+async def test_pricing_simulation_scenarios(client, admin_headers, test_property):
+    """Scenarios are priced next to the current rules and no rule is created."""
+    pid = test_property["id"]
+    await client.post(_rules_url(pid), json=_rule_payload(), headers=admin_headers)
+
+    resp = await client.post(
+        f"/properties/{pid}/pricing-simulation",
+        json={
+            "start_date": "2026-05-30",
+            "end_date": "2026-06-02",
+            "percents": ["50"],
+            "rule_sets": [{
+                "name": "Long weekend",
+                "rules": [{"name": "Peak", "start_date": "2026-06-01", "end_date": "2026-06-02", "profitability_percent": "120"}],
+            }],
+        },
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    scenarios = {s["name"]: s for s in resp.json()["scenarios"]}
+    assert [s["kind"] for s in resp.json()["scenarios"]] == ["current", "percent", "rules"]
+
+    current = scenarios["Actual"]
+    calendar = await client.get(
+        f"/properties/{pid}/calendar",
+        params={"start_date": "2026-05-30", "end_date": "2026-06-02"},
+        headers=admin_headers,
+    )
+    assert [d["price"] for d in current["days"]] == [d["price"] for d in calendar.json()]
+    assert float(current["total_revenue"]) == 360.0
+    assert [(m["month"], m["nights"], float(m["revenue"])) for m in current["months"]] == [(5, 2, 200.0), (6, 2, 160.0)]
+
+    assert float(scenarios["50%"]["total_revenue"]) == 200.0
+    assert [float(d["price"]) for d in scenarios["Long weekend"]["days"]] == [100.0, 100.0, 120.0, 120.0]
+
+    rules = await client.get(_rules_url(pid), headers=admin_headers)
+    assert len(rules.json()) == 1
+
+
+async def test_pricing_simulation_overlapping_rule_set(client, admin_headers, test_property):
+    resp = await client.post(
+        f"/properties/{test_property['id']}/pricing-simulation",
+        json={
+            "start_date": "2026-06-01",
+            "end_date": "2026-06-30",
+            "rule_sets": [{
+                "name": "Overlap",
+                "rules": [
+                    {"name": "A", "start_date": "2026-06-01", "end_date": "2026-06-10", "profitability_percent": "80"},
+                    {"name": "B", "start_date": "2026-06-10", "end_date": "2026-06-20", "profitability_percent": "90"},
+                ],
+            }],
+        },
+        headers=admin_headers,
+    )
+    assert resp.status_code == 400
+
+
+async def test_pricing_cache_stats_requires_admin(client, manager_headers):
+    resp = await client.get("/pricing/cache-stats", headers=manager_headers)
+    assert resp.status_code == 403
@@ -1,7 +1,7 @@
 "use server";
 
 import { serverApi } from "@/lib/server-api";
-import { FinancialSummary } from "@/types/api";
+import { FinancialSummary, PortfolioFinancialSummary } from "@/types/api";
 
 /**
  * Fetches the financial summary for a specific property and month/year.
@@ -32,3 +32,67 @@ export async function getFinancialSummary(
         return null;
     }
 }
+
+/**
+ * Fetches the monthly financial summaries of a month range (e.g. a whole year) in one request.
+ *
+ * @param propertyId The UUID of the property
+ * @param startYear First year (YYYY)
+ * @param startMonth First month (1-12)
+ * @param endYear Last year (YYYY)
+ * @param endMonth Last month (1-12)
+ * @returns One FinancialSummary per month, or null if failed
+ */
+export async function getFinancialSummaryRange(
+    propertyId: string,
+    startYear: number,
+    startMonth: number,
+    endYear: number,
+    endMonth: number
+): Promise<FinancialSummary[] | null> {
+    try {
+        const res = await serverApi(
+            `/properties/${propertyId}/financial-summary/range?start_year=${startYear}&start_month=${startMonth}&end_year=${endYear}&end_month=${endMonth}`
+        );
+
+        if (!res.ok) {
+            console.error(`Failed to fetch financial summary range for property ${propertyId}:`, res.statusText);
+            return null;
+        }
+
+        return await res.json();
+    } catch (error) {
+        console.error("Get Financial Summary Range Error:", error);
+        return null;
+    }
+}
+
+/**
+ * Fetches the monthly financial summary of every managed (or owned) property, with totals.
+ *
+ * @param year The year (YYYY)
+ * @param month The month (1-12)
+ * @param scope "managed" (default) or "owned"
+ * @returns PortfolioFinancialSummary object or null if failed
+ */
+export async function getPortfolioFinancialSummary(
+    year: number,
+    month: number,
+    scope: "managed" | "owned" = "managed"
+): Promise<PortfolioFinancialSummary | null> {
+    try {
+        const res = await serverApi(
+            `/portfolio/financial-summary?year=${year}&month=${month}&scope=${scope}`
+        );
+
+        if (!res.ok) {
+            console.error("Failed to fetch portfolio financial summary:", res.statusText);
+            return null;
+        }
+
+        return await res.json();
+    } catch (error) {
+        console.error("Get Portfolio Financial Summary Error:", error);
+        return null;
+    }
+}
@@ -1,8 +1,8 @@
 import { serverApi } from "@/lib/server-api";
 import { getMyProperties } from "@/actions/properties";
-import { getFinancialSummary } from "@/actions/reports";
+import { getPortfolioFinancialSummary } from "@/actions/reports";
 import { getBookings } from "@/actions/bookings";
-import { User, Property, Booking, FinancialSummary } from "@/types/api";
+import { User, Property, Booking, FinancialSummary, PortfolioFinancialSummary } from "@/types/api";
 import { getTranslations, getLocale } from "next-intl/server";
 import { Link } from "@/i18n/routing";
 import {
@@ -27,17 +27,16 @@ export default async function DashboardHome() {
     const year = now.getFullYear();
     const month = now.getMonth() + 1;
 
-    // Fetch user, properties and bookings in parallel
-    const [user, properties, bookings]: [User | null, Property[], Booking[]] = await Promise.all([
+    // Fetch user, properties, bookings and the portfolio financial summary in parallel
+    const [user, properties, bookings, portfolio]: [User | null, Property[], Booking[], PortfolioFinancialSummary | null] = await Promise.all([
         serverApi("/auth/perfil").then(r => r.ok ? r.json() : null).catch(() => null),
         getMyProperties(),
         getBookings(),
+        getPortfolioFinancialSummary(year, month),
     ]);
 
-    // Fetch financial summaries for all properties in parallel
-    const summaries: (FinancialSummary | null)[] = await Promise.all(
-        properties.map(p => getFinancialSummary(p.id, year, month))
-    );
+    const summaryByProperty = Object.fromEntries((portfolio?.properties ?? []).map(s => [s.property_id, s]));
+    const summaries: (FinancialSummary | null)[] = properties.map(p => summaryByProperty[p.id] ?? null);
 
     // Aggregate KPIs
     const validSummaries = summaries.filter(Boolean) as FinancialSummary[];
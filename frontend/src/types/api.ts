@@ -74,6 +74,8 @@ export interface CalendarDay {
     rule_name?: string;
     floor_price: number;
     profitability_percent: number;
+    booking_id: string | null; // uuid of the booking occupying the night
+    booking_status: BookingStatus | null;
 }
 
 export interface FinancialSummary {
@@ -95,6 +97,24 @@ export interface FinancialSummary {
     profit_margin_percent: number;
 }
 
+export interface PortfolioFinancialSummary {
+    year: number;
+    month: number;
+    scope: "managed" | "owned";
+    totals: {
+        properties: number;
+        available_days: number;
+        occupied_days: number;
+        occupancy_rate: number;
+        total_bookings: number;
+        total_income: number;
+        costs: FinancialSummary["costs"];
+        net_profit: number;
+        profit_margin_percent: number;
+    };
+    properties: (FinancialSummary & { property_id: string; property_name: string })[];
+}
+
 export interface User {
     id: string; // uuid
     username: string;